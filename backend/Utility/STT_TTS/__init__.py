@@ -5,8 +5,10 @@
 # 팩토리 함수: 각 모듈(STT, TTS, VAD)의 인스턴스를 생성하고 설정을 로드합니다.
 from .factory import create_stt, create_tts, create_vad, load_config, setup_logging
 # 인터페이스 정의: 각 모듈이 따라야 할 설계도(추상 클래스)입니다.
-from .def_interface import ISTT, ITTS, IVAD
+from .def_interface import ISTT, ITTS, IVAD, IAudioSource
+# 오디오 입력 소스: 마이크 대신 WAV 파일/합성 신호로 VAD를 구동합니다.
+from .audio_source import MicrophoneSource, WavFileSource, SyntheticSource
 # 사용자 정의 예외: 이 패키지에서 발생할 수 있는 특정 오류들을 정의합니다.
-from .def_exceptions import KioskException, TranscriptionError, TTSError, VADStreamError
+from .def_exceptions import KioskException, TranscriptionError, TTSError, VADStreamError, AudioConversionError, TranscoderBusyError
 # 타입 정의: 설정 파일(config.yaml)의 구조를 미리 정의하여 코드 안정성을 높입니다.
 from .def_types import AppConfig
\ No newline at end of file
@@ -0,0 +1,193 @@
+# Backend/Utility/STT_TTS/audio_source.py
+import os
+import threading
+import time
+import wave
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .def_interface import IAudioSource
+
+# ---- 기본값 ----
+DEFAULT_TAIL_SILENCE_MS = 1500  # 재생 끝에 덧붙일 무음 (마지막 발화의 endpoint가 나오도록)
+DEFAULT_SYNTH_RATE = 16000
+
+Segment = Tuple[float, float]  # (시작 초, 끝 초) 음성 구간
+
+
+class MicrophoneSource(IAudioSource):
+    """sounddevice 마이크 입력 (기본 소스). PortAudio는 마이크를 실제로 쓸 때만 import합니다."""
+    def __init__(self, device_index: Optional[int] = None) -> None:
+        self.device_index = device_index
+
+    def open(self, sample_rate: int, block_size: int, callback: Callable):
+        import sounddevice as sd
+        return sd.InputStream(
+            samplerate=sample_rate, channels=1, dtype='int16',
+            blocksize=block_size, device=self.device_index, callback=callback
+        )
+
+
+class _PlaybackStream:
+    """PCMSource의 블록을 별도 스레드에서 callback으로 밀어 넣는 sounddevice 호환 스트림."""
+    def __init__(self, blocks: Iterator[np.ndarray], block_seconds: float, speed: float, callback: Callable) -> None:
+        self._blocks = blocks
+        self._interval = block_seconds / speed if speed > 0 else 0.0
+        self._callback = callback
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.finished = threading.Event()
+
+    def _run(self) -> None:
+        next_at = time.monotonic()
+        for block in self._blocks:
+            if self._stop.is_set():
+                break
+            self._callback(block.reshape(-1, 1), len(block), None, None)
+            if self._interval:
+                # 실제 마이크처럼 블록 길이만큼 간격을 두고 전달 (누적 오차 없이)
+                next_at += self._interval
+                self._stop.wait(max(0.0, next_at - time.monotonic()))
+        self.finished.set()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audio-playback", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self) -> None:
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PCMSource(IAudioSource):
+    """
+    메모리에 있는 int16 mono PCM을 재생하는 소스. (WavFileSource, SyntheticSource의 공통 부모)
+    - open(): 마이크 대신 VAD.listen()에 연결 (speed=1.0이면 실시간 속도, 0이면 최대 속도)
+    - blocks(): 스레드 없이 블록을 직접 순회 (벤치마크/프레임 API용)
+    - frame_labels(): 구간 라벨을 프레임 단위 음성 여부(bool 배열)로 변환
+    요청한 샘플링 레이트가 원본과 다르면 선형 보간으로 변환합니다. (테스트용, 음질보다 재현성 우선)
+    """
+    def __init__(self, samples: np.ndarray, sample_rate: int,
+                 speech_segments: Optional[Sequence[Segment]] = None,
+                 speed: float = 1.0, tail_silence_ms: int = DEFAULT_TAIL_SILENCE_MS) -> None:
+        self.samples = np.ascontiguousarray(samples, dtype=np.int16)
+        self.sample_rate = int(sample_rate)
+        self.speech_segments: List[Segment] = list(speech_segments or [])
+        self.speed = float(speed)
+        self.tail_silence_ms = int(tail_silence_ms)
+        self._resampled: Dict[int, np.ndarray] = {self.sample_rate: self.samples}
+
+    @property
+    def duration_sec(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def resampled(self, sample_rate: int) -> np.ndarray:
+        """요청한 샘플링 레이트의 int16 PCM (레이트별로 한 번만 변환)."""
+        out = self._resampled.get(sample_rate)
+        if out is None:
+            n = int(round(len(self.samples) * sample_rate / self.sample_rate))
+            src_t = np.arange(len(self.samples)) / self.sample_rate
+            dst_t = np.arange(n) / sample_rate
+            out = np.interp(dst_t, src_t, self.samples.astype(np.float32)).astype(np.int16)
+            self._resampled[sample_rate] = out
+        return out
+
+    def blocks(self, sample_rate: int, block_size: int) -> Iterator[np.ndarray]:
+        """block_size 샘플씩 순회합니다. 마지막 블록은 0으로 채우고, 끝에 tail 무음 블록을 덧붙입니다."""
+        pcm = self.resampled(sample_rate)
+        tail = int(sample_rate * self.tail_silence_ms / 1000)
+        total = -(-(len(pcm) + tail) // block_size) * block_size
+        padded = np.zeros(total, dtype=np.int16)
+        padded[:len(pcm)] = pcm
+        for start in range(0, total, block_size):
+            yield padded[start:start + block_size]
+
+    def frame_labels(self, sample_rate: int, frame_length: int, num_frames: int) -> np.ndarray:
+        """프레임 중앙이 음성 구간 안에 있으면 True."""
+        centers = (np.arange(num_frames) + 0.5) * frame_length / sample_rate
+        labels = np.zeros(num_frames, dtype=bool)
+        for start, end in self.speech_segments:
+            labels |= (centers >= start) & (centers < end)
+        return labels
+
+    def open(self, sample_rate: int, block_size: int, callback: Callable) -> _PlaybackStream:
+        return _PlaybackStream(self.blocks(sample_rate, block_size), block_size / sample_rate, self.speed, callback)
+
+
+def load_labels(path: str) -> List[Segment]:
+    """
+    음성 구간 라벨 파일을 읽습니다. Audacity 라벨 내보내기 형식: 줄마다 "시작초<TAB>끝초[<TAB>이름]"
+    (공백 구분도 허용, '#'으로 시작하는 줄은 무시)
+    """
+    segments: List[Segment] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            segments.append((float(parts[0]), float(parts[1])))
+    return sorted(segments)
+
+
+class WavFileSource(PCMSource):
+    """
+    16bit PCM WAV 파일 소스. 스테레오는 평균하여 mono로 씁니다.
+    같은 이름의 .txt 라벨 파일(예: hello.wav → hello.txt)이 있으면 음성 구간으로 읽습니다.
+    """
+    def __init__(self, path: str, label_path: Optional[str] = None, **kwargs) -> None:
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"16bit PCM WAV만 지원합니다: {path}")
+            channels, rate = wf.getnchannels(), wf.getframerate()
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        if channels > 1:
+            pcm = pcm[:len(pcm) // channels * channels].reshape(-1, channels).mean(axis=1).astype(np.int16)
+        if label_path is None:
+            candidate = os.path.splitext(path)[0] + ".txt"
+            label_path = candidate if os.path.exists(candidate) else None
+        segments = load_labels(label_path) if label_path else None
+        super().__init__(pcm, rate, segments, **kwargs)
+        self.path = path
+
+
+class SyntheticSource(PCMSource):
+    """
+    (음성 여부, 길이 초) 패턴으로 만든 합성 신호 소스. 라벨이 정확히 알려져 있어 회귀 테스트에 씁니다.
+    음성 구간은 기본 주파수가 흔들리는 배음 + 음절 단위(약 4Hz) 진폭 변조, 무음 구간은 약한 백색 잡음입니다.
+    (학습 기반 VAD는 합성 음성을 실제 음성만큼 확신하지 않을 수 있으므로, 엔진 비교에는 실제 녹음 코퍼스를 권장)
+    """
+    def __init__(self, pattern: Sequence[Tuple[bool, float]], sample_rate: int = DEFAULT_SYNTH_RATE,
+                 seed: int = 0, speech_dbfs: float = -20.0, noise_dbfs: float = -60.0, **kwargs) -> None:
+        rng = np.random.default_rng(seed)
+        noise_amp = 32768 * 10 ** (noise_dbfs / 20)
+        speech_amp = 32768 * 10 ** (speech_dbfs / 20)
+        pieces, segments, t0 = [], [], 0.0
+        for is_speech, seconds in pattern:
+            n = int(seconds * sample_rate)
+            piece = noise_amp * rng.standard_normal(n)
+            if is_speech:
+                t = np.arange(n) / sample_rate
+                f0 = rng.uniform(110, 220) * (1 + 0.08 * np.sin(2 * np.pi * 1.5 * t))
+                phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+                voice = sum(np.sin(k * phase) / k for k in range(1, 9))
+                envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t + rng.uniform(0, 2 * np.pi))
+                voice *= envelope / (np.sqrt(np.mean((voice * envelope) ** 2)) + 1e-9)
+                piece += speech_amp * voice
+                segments.append((t0, t0 + n / sample_rate))
+            pieces.append(piece)
+            t0 += n / sample_rate
+        samples = np.clip(np.concatenate(pieces) if pieces else np.zeros(0), -32768, 32767).astype(np.int16)
+        super().__init__(samples, sample_rate, segments, **kwargs)
@@ -0,0 +1,177 @@
+# Backend/Utility/STT_TTS/correction.py
+import os
+import threading
+import time
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+import yaml
+from loguru import logger
+
+# 기본 보정 사전 파일 (패키지와 함께 배포)
+DEFAULT_CORRECTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corrections.yaml")
+# 파일 변경 여부(mtime)를 확인하는 최소 간격 (초)
+DEFAULT_RELOAD_CHECK_SEC = 2.0
+
+# 치환 결과가 다시 다른 표현을 만드는 경우(예: '등뽄 좀' → '등본 좀' → '등본')를 위한 최대 반복 횟수
+MAX_PASSES = 3
+
+# 트라이 노드에서 "여기서 끝나는 표현의 치환값"을 담는 키 (빈 문자열은 글자 키와 겹치지 않음)
+_TERMINAL = ""
+
+
+def load_corrections(path: str) -> Dict[str, str]:
+    """YAML 보정 사전('틀린 표현: 바른 표현')을 읽습니다. 형식이 잘못되면 ValueError."""
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"보정 사전 YAML 형식 오류: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"보정 사전은 '틀린 표현: 바른 표현' 형식의 매핑이어야 합니다: {path}")
+    return {str(k): "" if v is None else str(v) for k, v in data.items() if k is not None and str(k)}
+
+
+class CorrectionTrie:
+    """
+    보정 사전을 한 번만 컴파일한 문자 트라이.
+    입력을 한 번만 훑으며 leftmost-longest 규칙으로 치환합니다.
+    (가장 왼쪽에서 시작하는 표현 우선, 같은 위치라면 가장 긴 표현 우선 → 사전 순서와 무관)
+    """
+    def __init__(self, corrections: Mapping[str, str]) -> None:
+        self._root: Dict[str, Any] = {}
+        self.size = 0
+        for wrong, right in corrections.items():
+            key = wrong.lower()
+            if not key:
+                continue
+            node = self._root
+            for ch in key:
+                node = node.setdefault(ch, {})
+            if _TERMINAL not in node:
+                self.size += 1
+            node[_TERMINAL] = right
+
+    @staticmethod
+    def _fold(text: str) -> str:
+        """대소문자 무시 비교용 문자열. (원문과 글자 위치가 어긋나지 않도록 길이를 유지)"""
+        low = text.lower()
+        if len(low) == len(text):
+            return low
+        return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+    def apply(self, text: str) -> str:
+        """더 이상 바뀌지 않을 때까지(최대 MAX_PASSES번) 한 번 훑기 치환을 반복합니다."""
+        for _ in range(MAX_PASSES):
+            out = self._apply_once(text)
+            if out is text:
+                break
+            text = out
+        return text
+
+    def _apply_once(self, text: str) -> str:
+        if not text or not self._root:
+            return text
+        root = self._root
+        low = self._fold(text)
+        n = len(text)
+        parts = []
+        start = 0  # 아직 출력하지 않은 원문 구간의 시작
+        i = 0
+        while i < n:
+            node = root.get(low[i])
+            if node is None:
+                i += 1
+                continue
+            best: Optional[Tuple[int, str]] = None
+            j = i + 1
+            if _TERMINAL in node:
+                best = (j, node[_TERMINAL])
+            while j < n:
+                node = node.get(low[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERMINAL in node:
+                    best = (j, node[_TERMINAL])
+            if best is None:
+                i += 1
+                continue
+            parts.append(text[start:i])
+            parts.append(best[1])
+            i = start = best[0]
+        if not parts:
+            return text
+        parts.append(text[start:])
+        return "".join(parts)
+
+
+class CorrectionEngine:
+    """
+    외부 파일 기반 보정 엔진.
+    - 사전을 CorrectionTrie로 컴파일해 두고 apply()마다 재사용합니다.
+    - 파일이 수정되면(mtime 변경) 다음 apply() 때 다시 읽어 트라이를 통째로 교체합니다. (hot reload)
+    - 새 사전을 읽지 못하면 경고만 남기고 이전 사전을 계속 사용합니다.
+    """
+    def __init__(self, path: Optional[str] = DEFAULT_CORRECTIONS_PATH,
+                 check_interval: float = DEFAULT_RELOAD_CHECK_SEC,
+                 corrections: Optional[Mapping[str, str]] = None) -> None:
+        self.path = path
+        self.check_interval = float(check_interval)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._corrections: Dict[str, str] = dict(corrections or {})
+        self._trie = CorrectionTrie(self._corrections)
+        if self.path:
+            self.reload()
+
+    @classmethod
+    def from_mapping(cls, corrections: Mapping[str, str]) -> "CorrectionEngine":
+        """파일 없이 고정 사전으로 엔진을 만듭니다. (hot reload 없음)"""
+        return cls(path=None, corrections=corrections)
+
+    @property
+    def corrections(self) -> Dict[str, str]:
+        return dict(self._corrections)
+
+    def reload(self) -> bool:
+        """사전 파일을 다시 읽습니다. 교체에 성공하면 True."""
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            logger.warning(f"STT 보정 사전 파일이 없어 이전 사전을 유지합니다: {self.path}, 오류: {e}")
+            return False
+        try:
+            corrections = load_corrections(self.path)
+        except (OSError, ValueError) as e:
+            # 같은 파일을 매번 다시 시도하지 않도록 mtime은 기록 (다음 수정 때 재시도)
+            self._mtime = mtime
+            logger.warning(f"STT 보정 사전을 읽지 못해 이전 사전을 유지합니다: {self.path}, 오류: {e}")
+            return False
+        trie = CorrectionTrie(corrections)
+        with self._lock:
+            self._corrections, self._trie, self._mtime = corrections, trie, mtime
+        logger.info(f"STT 보정 사전 로드: {trie.size}개 ({self.path})")
+        return True
+
+    def maybe_reload(self) -> None:
+        if not self.path:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def apply(self, text: str) -> str:
+        self.maybe_reload()
+        return self._trie.apply(text)
+
+    __call__ = apply
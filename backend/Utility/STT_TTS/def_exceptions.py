@@ -12,4 +12,19 @@ class TTSError(KioskException):
 
 class VADStreamError(KioskException):
     """VAD 마이크 스트림(입력)에서 오류 발생 시 던져지는 전용 예외"""
-    pass
\ No newline at end of file
+    pass
+
+class AudioConversionError(KioskException):
+    """업로드 오디오를 STT 입력 형식(WAV)으로 변환하지 못했을 때 발생하는 전용 예외"""
+    pass
+
+class TranscoderBusyError(AudioConversionError):
+    """변환 대기열이 가득 차 새 작업을 받을 수 없을 때 발생하는 전용 예외"""
+    pass
+
+class AudioQualityError(KioskException):
+    """업로드 오디오가 무음/너무 작음/포화 등으로 STT에 보낼 가치가 없을 때 발생하는 전용 예외"""
+    def __init__(self, message: str, reason: str = "", info: dict = None) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.info = info or {}
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generator, Optional, Coroutine
+from typing import Any, Callable, Generator, List, Optional, Coroutine, Sequence
 
 # --- 기본 모델 인터페이스 ---
 class IModel(ABC):
@@ -32,6 +32,13 @@ class ISTT(IModel):
         """오디오 바이트를 텍스트로 변환하는 메서드."""
         pass
 
+    def transcribe_batch(self, audio_list: Sequence[bytes]) -> List[str]:
+        """
+        여러 발화를 한 번에 변환하는 메서드. (결과 순서 = 입력 순서)
+        배치 추론을 지원하지 않는 구현은 하나씩 transcribe()를 호출합니다.
+        """
+        return [self.transcribe(audio) for audio in audio_list]
+
 # --- TTS 인터페이스 ---
 # 웹 환경에 맞게, 음성을 직접 재생하는 'speak' 대신
 # 음성 데이터(bytes)를 생성하여 반환하는 'synthesize'로 메서드를 변경합니다.
@@ -44,6 +51,28 @@ class ITTS(IModel):
         """텍스트를 음성 데이터(bytes)로 변환하여 반환하는 메서드."""
         pass
 
+    def synthesize_stream(self, text: str) -> Generator[bytes, None, None]:
+        """
+        음성 데이터를 만들어지는 대로 조각(bytes) 단위로 내보내는 메서드.
+        스트리밍을 지원하지 않는 구현은 synthesize() 결과를 한 조각으로 내보냅니다.
+        """
+        yield self.synthesize(text)
+
+# --- 오디오 입력 소스 인터페이스 ---
+class IAudioSource(ABC):
+    """
+    VAD에 오디오 블록을 공급하는 입력 소스 (마이크, WAV 파일, 합성 신호 등).
+    VAD 구현은 sounddevice를 직접 열지 않고 소스가 돌려주는 스트림을 사용하므로,
+    마이크 없이 파일/합성 신호로 같은 코드 경로를 테스트하고 비교할 수 있습니다.
+    """
+    @abstractmethod
+    def open(self, sample_rate: int, block_size: int, callback: Callable) -> Any:
+        """
+        sounddevice.InputStream처럼 start()/stop()/close()와 with 문을 지원하는 스트림을 반환합니다.
+        callback(indata, frames, time, status)의 indata는 (block_size, 1) 모양의 int16 배열입니다.
+        """
+        pass
+
 # --- VAD 인터페이스 ---
 class IVAD(IModel):
     """
@@ -52,4 +81,23 @@ class IVAD(IModel):
     @abstractmethod
     async def listen(self) -> Optional[bytes]:
         """음성이 감지될 때까지 비동기 대기하고, 감지된 오디오 데이터를 반환합니다."""
+        pass
+
+    # --- 외부 오디오 스트림(WebSocket, 파일 등)용 프레임 단위 API ---
+    # 마이크 없이 서버 쪽에서 엔드포인트를 판정할 때 사용합니다. (/api/stt/stream)
+    @property
+    @abstractmethod
+    def frame_sample_rate(self) -> int:
+        """process_frame()이 기대하는 샘플링 레이트(Hz)."""
+        pass
+
+    @property
+    @abstractmethod
+    def frame_length(self) -> int:
+        """process_frame()에 전달할 프레임 하나의 샘플 수."""
+        pass
+
+    @abstractmethod
+    def process_frame(self, frame: Sequence[int]) -> float:
+        """16bit mono PCM 프레임 하나의 음성 확률(0.0~1.0)을 반환합니다."""
         pass
\ No newline at end of file
@@ -11,16 +11,21 @@ from typing import TypedDict, Optional
 #     device: str
 
 # STT 설정 타입을 OpenAI Whisper 모델에 맞게 수정합니다.
-class STTConfig(TypedDict):
+class STTConfig(TypedDict, total=False):
+    provider: str          # "openai" | "local"
     model: str
     language_code: str
+    compute_type: str      # local: "int8" 등 CTranslate2 양자화 타입
+    cpu_threads: int
+    beam_size: int
 
 # TTS 설정 타입을 OpenAI TTS 모델에 맞게 수정합니다.
 class TTSConfig(TypedDict):
     model: str
     voice: str
     
-class VADConfig(TypedDict):
+class VADConfig(TypedDict, total=False):
+    provider: str          # "cobra"(기본) | "silero" | "webrtc"
     threshold: float
     min_silence_duration_ms: int
     hardware_rate: int
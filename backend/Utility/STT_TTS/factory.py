@@ -1,15 +1,14 @@
 import yaml
 import sys
 from loguru import logger
-from typing import Optional
+from typing import Any, Dict, Optional
 
 # 각 모듈의 실제 구현 클래스를 가져옵니다.
 from .imp_stt_openai import SpeechToText as OpenAiSTT
 # 아래 줄의 클래스 이름을 TextToSpeech로 수정했습니다.
 from .imp_tts_openai import TextToSpeech as OpenAiTTS
-from .imp_vad_cobra import VoiceActivityDetector as CobraVAD
 
-from .def_interface import ISTT, ITTS, IVAD
+from .def_interface import ISTT, ITTS, IVAD, IAudioSource
 from .def_types import AppConfig
 
 _stt_instance: Optional[ISTT] = None
@@ -21,29 +20,80 @@ def load_config(config_path: str) -> AppConfig:
         config = yaml.safe_load(f)
     return config
 
-def create_stt(config: AppConfig) -> ISTT:
-    """STT 모듈 인스턴스를 생성합니다. (싱글턴)"""
+def create_stt(config: AppConfig, client: Optional[Any] = None) -> ISTT:
+    """
+    STT 모듈 인스턴스를 생성합니다. (싱글턴, client: 공유 OpenAI 클라이언트)
+    config['stt']['provider']: "openai"(기본) 또는 "local"(CPU int8 faster-whisper)
+    """
     global _stt_instance
     if _stt_instance is None:
-        _stt_instance = OpenAiSTT(config['stt'])
+        provider = (config['stt'].get('provider') or 'openai').lower()
+        if provider == 'local':
+            # faster-whisper는 로컬 STT를 쓸 때만 필요하므로 지연 import
+            from .imp_stt_whisper_local import SpeechToText as LocalWhisperSTT
+            # stt.local 하위 설정이 공통 설정(language_code, domain_terms 등)을 덮어씀
+            _stt_instance = LocalWhisperSTT({**config['stt'], **(config['stt'].get('local') or {})})
+        elif provider == 'openai':
+            _stt_instance = OpenAiSTT(config['stt'], client)
+        else:
+            raise ValueError(f"알 수 없는 STT provider입니다: {provider}")
     return _stt_instance
 
-def create_tts(config: AppConfig) -> ITTS:
-    """TTS 모듈 인스턴스를 생성합니다. (싱글턴)"""
+def _create_tts_provider(provider: str, tts_config: Dict[str, Any], client: Optional[Any]) -> ITTS:
+    provider = (provider or 'openai').lower()
+    if provider == 'local':
+        # MeloTTS(torch)는 로컬 TTS를 쓸 때만 워커 프로세스에서 로드
+        from .imp_tts_melotts import TextToSpeech as MeloTTS
+        # tts.local 하위 설정이 공통 설정(language, speaker_id 등)을 덮어씀
+        return MeloTTS({**tts_config, **(tts_config.get('local') or {})})
+    if provider == 'openai':
+        return OpenAiTTS(tts_config, client)
+    raise ValueError(f"알 수 없는 TTS provider입니다: {provider}")
+
+def create_tts(config: AppConfig, client: Optional[Any] = None) -> ITTS:
+    """
+    TTS 모듈 인스턴스를 생성합니다. (싱글턴, client: 공유 OpenAI 클라이언트)
+    config['tts']['provider']: "openai"(기본) 또는 "local"(MeloTTS 프로세스 풀)
+    config['tts']['fallback']: 기본 provider 실패 시 사용할 provider (예: "local")
+    """
     global _tts_instance
     if _tts_instance is None:
-        _tts_instance = OpenAiTTS(config['tts'])
+        tts_config = config['tts']
+        provider = tts_config.get('provider') or 'openai'
+        _tts_instance = _create_tts_provider(provider, tts_config, client)
+        fallback = tts_config.get('fallback')
+        if fallback and fallback.lower() != provider.lower():
+            from .imp_tts_fallback import TextToSpeech as FallbackTTS
+            _tts_instance = FallbackTTS(_tts_instance, _create_tts_provider(fallback, tts_config, client))
     return _tts_instance
 
-def create_vad(config: AppConfig, device_index: Optional[int] = None) -> IVAD:
-    """VAD 모듈 인스턴스를 생성합니다."""
-    return CobraVAD(config['vad'], device_index)
+def create_vad(config: AppConfig, device_index: Optional[int] = None, source: Optional[IAudioSource] = None) -> IVAD:
+    """
+    VAD 모듈 인스턴스를 생성합니다.
+    config['vad']['provider']: "cobra"(기본), "silero", "webrtc"
+    source: 오디오 입력 소스 (기본: 마이크, 테스트에서는 WavFileSource/SyntheticSource)
+    """
+    provider = (config['vad'].get('provider') or 'cobra').lower()
+    # vad.<provider> 하위 설정이 공통 설정(threshold 등)을 덮어씀
+    vad_config = {**config['vad'], **(config['vad'].get(provider) or {})}
+    # pvcobra / torch / webrtcvad는 해당 엔진을 쓸 때만 필요하므로 지연 import
+    if provider == 'cobra':
+        from .imp_vad_cobra import VoiceActivityDetector as CobraVAD
+        return CobraVAD(vad_config, device_index, source)
+    if provider == 'silero':
+        from .imp_vad_silero import VoiceActivityDetector as SileroVAD
+        return SileroVAD(vad_config, device_index, source)
+    if provider == 'webrtc':
+        from .imp_vad_webrtc import VoiceActivityDetector as WebRtcVAD
+        return WebRtcVAD(vad_config, device_index, source)
+    raise ValueError(f"알 수 없는 VAD provider입니다: {provider}")
 
 def setup_logging() -> None:
-    """loguru 로거를 설정합니다."""
+    """loguru 로거를 설정합니다. (extra["request_id"]: 요청 ID, 요청 밖에서는 "-")"""
     logger.remove()
+    logger.configure(extra={"request_id": "-"})
     logger.add(
         sys.stderr,
         level="INFO",
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}:{function}:{line}</cyan> - <level>{message}</level>"
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <magenta>{extra[request_id]}</magenta> | <cyan>{name}:{function}:{line}</cyan> - <level>{message}</level>"
     )
\ No newline at end of file
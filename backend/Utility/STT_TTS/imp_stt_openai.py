@@ -1,11 +1,20 @@
 # Backend/Utility/STT_TTS/imp_stt_openai.py
 import os, io, re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from openai import OpenAI
 from loguru import logger
 
 from .def_interface import ISTT
 from .def_exceptions import TranscriptionError
+from .correction import CorrectionEngine, load_corrections, DEFAULT_CORRECTIONS_PATH, DEFAULT_RELOAD_CHECK_SEC
+
+
+# ✅ 자주 틀리는 표현 후처리 사전 (corrections.yaml, 의도 캐시 키 정규화에서도 함께 사용)
+try:
+    DEFAULT_CORRECTIONS: Dict[str, str] = load_corrections(DEFAULT_CORRECTIONS_PATH)
+except (OSError, ValueError) as e:
+    logger.error(f"기본 STT 보정 사전을 읽을 수 없습니다: {DEFAULT_CORRECTIONS_PATH}, 오류: {e}")
+    DEFAULT_CORRECTIONS = {}
 
 
 class SpeechToText(ISTT):
@@ -20,13 +29,23 @@ class SpeechToText(ISTT):
         l = SpeechToText._LANG_MAP.get(lang.strip().lower(), lang.strip().lower())
         return l if re.fullmatch(r"[a-z]{2}", l) else default
 
-    def __init__(self, config: Dict[str, Any]) -> None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("환경 변수 OPENAI_API_KEY가 설정되지 않았습니다.")
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, config: Dict[str, Any], client: Optional[OpenAI] = None) -> None:
+        """client를 넘기면 공유 커넥션 풀을 사용하고, 없으면 자체 클라이언트를 만듭니다."""
+        if client is not None:
+            self.client = client
+        else:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("환경 변수 OPENAI_API_KEY가 설정되지 않았습니다.")
+            self.client = OpenAI(api_key=api_key)
 
         self.model = config.get("model", "whisper-1")
+        self._init_text_processing(config)
+
+        self._is_initialized = False
+
+    def _init_text_processing(self, config: Dict[str, Any]) -> None:
+        """언어/도메인 힌트/보정 사전 설정 (로컬 Whisper 구현과 공유)"""
         self.language = self._normalize_lang(config.get("language_code", "ko"), "ko")
 
         # ✅ 도메인 키워드(가중치 대용) - 필요시 config로 외부 주입
@@ -34,83 +53,12 @@ class SpeechToText(ISTT):
             "주민등록등본", "주민등록초본", "가족관계증명서", "건강보험자격득실확인서",
             "주민등록번호", "서울시", "날씨", "예보", "인쇄", "키오스크"
         ])
-        # ✅ 자주 틀리는 표현 후처리 사전
-        self.corrections: Dict[str, str] = {
-            # ===== 등본 관련 =====
-            "등군": "등본",
-            "등뽄": "등본",
-            "등번": "등본",
-            "등본서": "등본",
-            "등본 좀": "등본",
-
-            # ===== 초본 관련 =====
-            "초뽄": "초본",
-            "초번": "초본",
-            "촌번": "초본",
-            "초본서": "초본",
-            "초본 좀": "초본",
-
-            # ===== 가족관계증명서 =====
-            "가족 관계 증명서": "가족관계증명서",
-            "가족증명서": "가족관계증명서",
-            "가족관계 증명": "가족관계증명서",
-            "가족관계서": "가족관계증명서",
-            "가족 증명": "가족관계증명서",
-
-            # ===== 건강보험자격득실확인서 =====
-            "건강 보험 자격 득실 확인서": "건강보험자격득실확인서",
-            "건강보험 자격 확인서": "건강보험자격득실확인서",
-            "건강보험 득실 확인서": "건강보험자격득실확인서",
-            "건강보험 확인서": "건강보험자격득실확인서",
-            "자격득실 확인서": "건강보험자격득실확인서",
-
-            # ===== 인쇄 관련 =====
-            "인쇄 해줘": "인쇄해줘",
-            "출력 해줘": "인쇄해줘",
-            "프린트 해줘": "인쇄해줘",
-
-            # ===== 날씨 관련 (광범위) =====
-            "날씨 알려 줘": "날씨",
-            "날씨 좀": "날씨",
-            "오늘 날씨": "날씨",
-            "지금 날씨": "날씨",
-            "주간 날씨": "날씨",
-            "주말 날씨": "날씨",
-            "내일 날씨": "날씨",
-            "모레 날씨": "날씨",
-            "일기 예보": "날씨",
-            "주간 예보": "날씨",
-            "날씨 예보": "날씨",
-
-            # 자연어형 질문들
-            "오늘 덥다": "날씨",
-            "오늘 더워": "날씨",
-            "더워?": "날씨",
-            "추워?": "날씨",
-            "오늘 추워": "날씨",
-            "춥다": "날씨",
-            "더운지": "날씨",
-            "추운지": "날씨",
-
-            "비 와": "날씨",
-            "비와": "날씨",
-            "비 올까": "날씨",
-            "오늘 비": "날씨",
-            "비 예보": "날씨",
-            "눈 와": "날씨",
-            "눈와": "날씨",
-            "눈 올까": "날씨",
-
-            # 기온 질문
-            "기온": "날씨",
-            "온도": "날씨",
-            "몇 도야": "날씨",
-            "몇도야": "날씨",
-            "지금 몇도": "날씨",
-            "오늘 몇도": "날씨",
-        }
-
-        self._is_initialized = False
+        # ✅ 자주 틀리는 표현 후처리 사전 (파일 수정 시 자동 재로드)
+        self.correction_engine = CorrectionEngine(
+            config.get("corrections_path") or DEFAULT_CORRECTIONS_PATH,
+            check_interval=config.get("corrections_reload_sec", DEFAULT_RELOAD_CHECK_SEC),
+            corrections=DEFAULT_CORRECTIONS,
+        )
 
     def initialize(self) -> None:
         self._is_initialized = True
@@ -124,11 +72,13 @@ class SpeechToText(ISTT):
         terms = ", ".join(self.domain_terms)
         return f"다음 한국어 키오스크 도메인 용어가 자주 등장합니다: {terms}"
 
+    @property
+    def corrections(self) -> Dict[str, str]:
+        return self.correction_engine.corrections
+
     def _post_correction(self, text: str) -> str:
-        out = text
-        # 단순 치환 (띄어쓰기/대소문자 관대하게)
-        for wrong, right in self.corrections.items():
-            out = re.sub(re.escape(wrong), right, out, flags=re.IGNORECASE)
+        # 컴파일된 트라이로 한 번에 치환 (대소문자 무시, leftmost-longest)
+        out = self.correction_engine.apply(text)
         # 불필요한 공백 정리
         out = re.sub(r"\s+", " ", out).strip()
         return out
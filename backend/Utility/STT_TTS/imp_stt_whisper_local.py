@@ -0,0 +1,195 @@
+# Backend/Utility/STT_TTS/imp_stt_whisper_local.py
+import io
+import threading
+import wave
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from faster_whisper import WhisperModel
+from faster_whisper.tokenizer import Tokenizer
+from loguru import logger
+
+from .def_exceptions import TranscriptionError
+from .imp_stt_openai import SpeechToText as OpenAiSpeechToText
+
+SAMPLE_RATE = 16000
+WARMUP_SEC = 1.0
+MAX_BATCH_SEC = 30.0      # Whisper 입력 창(30초)을 넘는 발화는 배치에서 제외하고 단건 처리
+MAX_PROMPT_TOKENS = 223   # Whisper 프롬프트 토큰 상한 (n_text_ctx // 2 - 1)
+MAX_NEW_TOKENS = 224
+
+# 같은 모델 파일을 여러 인스턴스가 다시 올리지 않도록 프로세스 단위로 공유
+_model_cache: Dict[Tuple[str, str, int, int], WhisperModel] = {}
+_model_lock = threading.Lock()
+
+
+def _load_model(model: str, compute_type: str, cpu_threads: int, num_workers: int,
+                download_root: Optional[str], local_files_only: bool) -> WhisperModel:
+    key = (model, compute_type, cpu_threads, num_workers)
+    with _model_lock:
+        if key not in _model_cache:
+            _model_cache[key] = WhisperModel(
+                model,
+                device="cpu",
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+                download_root=download_root,
+                local_files_only=local_files_only,
+            )
+        return _model_cache[key]
+
+
+def wav_to_float32(audio_bytes: bytes) -> np.ndarray:
+    """WAV(16bit) 또는 헤더 없는 16kHz s16le PCM을 16kHz mono float32 배열로 변환합니다."""
+    if audio_bytes[:4] == b"RIFF":
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"16bit PCM WAV만 지원합니다. (sampwidth={wf.getsampwidth()})")
+            channels, rate = wf.getnchannels(), wf.getframerate()
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    else:
+        channels, rate = 1, SAMPLE_RATE
+        pcm = np.frombuffer(audio_bytes[: len(audio_bytes) // 2 * 2], dtype=np.int16)
+    audio = pcm.astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE and len(audio):
+        # 변환 경로(_ensure_wav)는 항상 16kHz를 주므로 예외적인 입력에만 선형 보간
+        n_out = int(round(len(audio) * SAMPLE_RATE / rate))
+        audio = np.interp(np.linspace(0, len(audio) - 1, n_out), np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+class SpeechToText(OpenAiSpeechToText):
+    """
+    faster-whisper(CTranslate2) int8 양자화 모델을 CPU에서 프로세스 내로 실행하는 STT 클래스.
+    언어/도메인 프롬프트/보정 사전 처리는 OpenAI STT 구현과 동일하게 공유합니다.
+    """
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self.model_name = config.get("model", "small")
+        self.compute_type = config.get("compute_type", "int8")
+        self.cpu_threads = int(config.get("cpu_threads", 0))   # 0이면 CTranslate2 기본값
+        self.num_workers = int(config.get("num_workers", 1))
+        self.beam_size = int(config.get("beam_size", 1))        # 키오스크 짧은 발화는 greedy로 충분
+        self.download_root: Optional[str] = config.get("download_root")
+        self.local_files_only = bool(config.get("local_files_only", False))
+        self._init_text_processing(config)
+        self.model: Optional[WhisperModel] = None
+
+    def initialize(self) -> None:
+        """모델을 로드하고 무음 1초로 warmup 하여 첫 요청의 지연을 없앱니다."""
+        if self.model is not None:
+            return
+        logger.info(f"로컬 Whisper 모델 로딩 시작 (model={self.model_name}, compute_type={self.compute_type})")
+        self.model = _load_model(self.model_name, self.compute_type, self.cpu_threads,
+                                 self.num_workers, self.download_root, self.local_files_only)
+        segments, _ = self.model.transcribe(
+            np.zeros(int(SAMPLE_RATE * WARMUP_SEC), dtype=np.float32),
+            language=self.language, beam_size=self.beam_size,
+        )
+        list(segments)  # 제너레이터를 소비해야 실제 디코딩이 실행됨
+        logger.info(f"✅ 로컬 Whisper STT 초기화 (model={self.model_name}, language={self.language})")
+
+    def is_initialized(self) -> bool:
+        return self.model is not None
+
+    def _decode(self, audio: np.ndarray, prompt: Optional[str]) -> str:
+        segments, _ = self.model.transcribe(
+            audio,
+            language=self.language,
+            beam_size=self.beam_size,
+            temperature=0,
+            initial_prompt=prompt,
+            condition_on_previous_text=False,
+        )
+        return "".join(seg.text for seg in segments).strip()
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        if not self.is_initialized():
+            raise RuntimeError("STT 모듈이 초기화되지 않았습니다.")
+        try:
+            audio = wav_to_float32(audio_bytes)
+            logger.info(f"로컬 STT 시작... ({len(audio) / SAMPLE_RATE:.2f}s, model={self.model_name})")
+
+            # ✅ 1차 시도: 도메인 프롬프트 / 너무 짧으면 프롬프트 없이 재시도
+            recognized_text = self._decode(audio, self._build_prompt())
+            if len(recognized_text) < 2:
+                logger.warning("1차 인식 결과가 너무 짧습니다. 보강 재시도를 수행합니다.")
+                recognized_text = self._decode(audio, None)
+
+            if not recognized_text:
+                logger.warning("로컬 STT 결과가 비어있습니다. (무음/잡음 가능)")
+                return ""
+
+            corrected = self._post_correction(recognized_text)
+            logger.info(f"로컬 STT 완료 → '{recognized_text}'  => 보정 → '{corrected}'")
+            return corrected
+        except Exception as e:
+            logger.error(f"로컬 Whisper STT 오류: {e}")
+            raise TranscriptionError("로컬 음성 변환에 실패했습니다.") from e
+
+    def transcribe_batch(self, audio_list: Sequence[bytes]) -> List[str]:
+        """
+        여러 발화를 30초 창으로 패딩해 인코더/디코더를 한 번에 실행합니다.
+        배치 경로가 실패하거나 너무 긴 발화는 transcribe()로 하나씩 처리합니다.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("STT 모듈이 초기화되지 않았습니다.")
+        if len(audio_list) <= 1:
+            return [self.transcribe(audio) for audio in audio_list]
+
+        results: List[Optional[str]] = [None] * len(audio_list)
+        arrays = []
+        for i, audio_bytes in enumerate(audio_list):
+            try:
+                audio = wav_to_float32(audio_bytes)
+            except Exception:
+                continue  # 잘못된 입력은 단건 처리에서 해당 요청에만 오류를 돌려줌
+            if 0 < len(audio) <= SAMPLE_RATE * MAX_BATCH_SEC:
+                arrays.append((i, audio))
+        try:
+            texts = self._decode_batch([a for _, a in arrays], self._build_prompt()) if arrays else []
+            for (i, audio), text in zip(arrays, texts):
+                if len(text) < 2:
+                    text = self._decode(audio, None)  # 단건과 동일하게 프롬프트 없이 재시도
+                results[i] = self._post_correction(text) if text else ""
+        except Exception as e:
+            logger.warning(f"로컬 STT 배치 추론 실패, 단건으로 처리합니다: {e}")
+            results = [None] * len(audio_list)
+        logger.info(f"로컬 STT 배치 완료 ({len(arrays)}/{len(audio_list)}건 배치 처리)")
+        return [r if r is not None else self.transcribe(audio_list[i]) for i, r in enumerate(results)]
+
+    def _decode_batch(self, audios: List[np.ndarray], prompt: Optional[str]) -> List[str]:
+        fe = self.model.feature_extractor
+        features = []
+        for audio in audios:
+            mel = fe(audio)[:, : fe.nb_max_frames]
+            if mel.shape[-1] < fe.nb_max_frames:
+                mel = np.pad(mel, ((0, 0), (0, fe.nb_max_frames - mel.shape[-1])))
+            features.append(mel)
+        encoder_output = self.model.encode(np.stack(features).astype(np.float32))
+
+        tokenizer = Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                              task="transcribe", language=self.language)
+        prompt_tokens: List[int] = []
+        if prompt:
+            prompt_tokens = [tokenizer.sot_prev] + tokenizer.encode(" " + prompt.strip())[-MAX_PROMPT_TOKENS:]
+        prompt_tokens += list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+
+        outputs = self.model.model.generate(
+            encoder_output,
+            [prompt_tokens] * len(audios),
+            beam_size=self.beam_size,
+            max_length=MAX_NEW_TOKENS,
+            suppress_blank=True,
+        )
+        return [
+            tokenizer.decode([t for t in out.sequences_ids[0] if t < tokenizer.eot]).strip()
+            for out in outputs
+        ]
+
+    def close(self) -> None:
+        # 모델은 프로세스 단위로 공유되므로 참조만 끊음
+        self.model = None
@@ -0,0 +1,69 @@
+# Backend/Utility/STT_TTS/imp_tts_fallback.py
+from typing import Generator
+
+from loguru import logger
+
+from .def_interface import ITTS
+from .def_exceptions import TTSError
+
+
+class TextToSpeech(ITTS):
+    """
+    기본 TTS(예: OpenAI)가 실패하거나 시간 초과/요청 제한에 걸리면 보조 TTS(예: 로컬 MeloTTS)로 합성하는 클래스.
+    model/voice/audio_format은 기본 TTS를 따르므로, 보조 TTS 결과는 형식이 다를 수 있습니다. (호출 측에서 확인)
+    """
+    def __init__(self, primary: ITTS, fallback: ITTS) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.model = getattr(primary, "model", "")
+        self.voice = getattr(primary, "voice", "")
+        self.audio_format = getattr(primary, "audio_format", "mp3")
+        self.media_type = getattr(primary, "media_type", "audio/mpeg")
+        self.fallback_count = 0
+
+    def initialize(self) -> None:
+        self.primary.initialize()
+        try:
+            self.fallback.initialize()
+        except Exception as e:
+            # 보조 TTS가 없어도 기본 TTS만으로 동작
+            logger.error(f"보조 TTS 초기화 실패, 기본 TTS만 사용합니다: {e}")
+
+    def is_initialized(self) -> bool:
+        return self.primary.is_initialized() or self.fallback.is_initialized()
+
+    def _use_fallback(self, e: Exception) -> bool:
+        if not self.fallback.is_initialized():
+            return False
+        self.fallback_count += 1
+        logger.warning(f"기본 TTS 실패, 보조 TTS로 전환합니다: {e}")
+        return True
+
+    def synthesize(self, text: str) -> bytes:
+        if self.primary.is_initialized():
+            try:
+                return self.primary.synthesize(text)
+            except TTSError as e:
+                if not self._use_fallback(e):
+                    raise
+        return self.fallback.synthesize(text)
+
+    def synthesize_stream(self, text: str) -> Generator[bytes, None, None]:
+        if self.primary.is_initialized():
+            chunks = self.primary.synthesize_stream(text)
+            try:
+                # 첫 조각까지 받아 보고 실패하면 보조 TTS로 (이미 보낸 조각이 없으므로 안전)
+                first = next(chunks, b"")
+            except TTSError as e:
+                if not self._use_fallback(e):
+                    raise
+            else:
+                if first:
+                    yield first
+                yield from chunks
+                return
+        yield from self.fallback.synthesize_stream(text)
+
+    def close(self) -> None:
+        self.primary.close()
+        self.fallback.close()
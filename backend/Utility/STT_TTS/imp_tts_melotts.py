@@ -0,0 +1,231 @@
+# Backend/Utility/STT_TTS/imp_tts_melotts.py
+import io
+import multiprocessing
+import re
+import threading
+import wave
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .def_interface import ITTS
+from .def_exceptions import TTSError
+
+# ---- Config 기본값 ----
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT_SEC = 30.0
+DEFAULT_SENTENCE_CACHE_SIZE = 512
+DEFAULT_SENTENCE_GAP_MS = 120
+WARMUP_TEXT = "안녕하세요."
+
+# MeloTTS 언어 코드 (config의 ISO 코드 → MeloTTS 코드)
+_LANG_MAP = {"ko": "KR", "kr": "KR", "korean": "KR", "en": "EN", "english": "EN", "ja": "JP", "zh": "ZH"}
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+# ---------------- 워커 프로세스 ----------------
+# 모델은 워커 프로세스마다 한 번만 로드되어 계속 재사용됩니다. (메인 프로세스는 torch/melo를 import하지 않음)
+_worker_model = None
+
+
+def _worker_init(language: str, device: str) -> None:
+    global _worker_model
+    from melo.api import TTS
+    _worker_model = TTS(language=language, device=device)
+    _worker_model.tts_to_file(WARMUP_TEXT, 0, output_path=None, quiet=True)
+
+
+def _worker_synthesize(text: str, speaker_id: int, speed: float) -> Tuple[int, bytes]:
+    """한 문장을 합성해 (sample_rate, s16le PCM)을 반환합니다."""
+    audio = _worker_model.tts_to_file(text, speaker_id, output_path=None, speed=speed, quiet=True)
+    pcm = (np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0) * 32767).astype(np.int16)
+    return int(_worker_model.hps.data.sampling_rate), pcm.tobytes()
+
+
+def _worker_ping() -> bool:
+    return _worker_model is not None
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s and s.strip()]
+
+
+class TextToSpeech(ITTS):
+    """
+    MeloTTS를 미리 띄워둔 워커 프로세스 풀에서 실행하는 로컬 TTS 클래스.
+    - 합성은 별도 프로세스에서 실행되어 GIL을 잡거나 이벤트 루프를 막지 않습니다.
+    - 문장 단위로 나눠 병렬 합성하고, 렌더링된 문장 PCM은 LRU 캐시에 보관합니다.
+    - 결과는 메모리에서 만든 WAV bytes입니다. (임시 파일/aplay 없음)
+    """
+    media_type = "audio/wav"
+    audio_format = "wav"
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        language = str(config.get("language", "ko"))
+        self.language = _LANG_MAP.get(language.lower(), language.upper())
+        device = config.get("device", "cpu")
+        self.device = "cpu" if device in (None, "auto") else device
+        self.speaker_id = int(config.get("speaker_id", 0))
+        self.speed = float(config.get("speed", 1.0))
+        self.num_workers = int(config.get("workers", DEFAULT_WORKERS))
+        self.timeout = float(config.get("timeout_sec", DEFAULT_TIMEOUT_SEC))
+        self.cache_size = int(config.get("sentence_cache_size", DEFAULT_SENTENCE_CACHE_SIZE))
+        self.gap_ms = int(config.get("sentence_gap_ms", DEFAULT_SENTENCE_GAP_MS))
+        # tts_cache 키 구성용 (model, voice)
+        self.model = f"melotts-{self.language}"
+        self.voice = str(self.speaker_id)
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, int, float], Tuple[int, bytes]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ---------------- 수명 관리 ----------------
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # torch는 fork 이후 스레드 상태가 꼬일 수 있으므로 spawn 사용
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+            initargs=(self.language, self.device),
+        )
+
+    def initialize(self) -> None:
+        """워커 프로세스를 모두 띄우고 모델 로드 + warmup이 끝날 때까지 기다립니다."""
+        if self._pool is not None:
+            return
+        logger.info(f"MeloTTS 워커 {self.num_workers}개 시작 (language={self.language}, device={self.device})")
+        self._pool = self._new_pool()
+        try:
+            self._warm(self._pool)
+        except Exception as e:
+            self.close()
+            raise TTSError("MeloTTS 워커를 시작하지 못했습니다.") from e
+        logger.info("✅ MeloTTS 모듈이 초기화되었습니다.")
+
+    def _warm(self, pool: ProcessPoolExecutor) -> None:
+        # 동시에 작업을 넣어야 워커가 모두 생성됨 (각 워커의 initializer에서 모델 로드)
+        futures = [pool.submit(_worker_ping) for _ in range(self.num_workers)]
+        for fut in futures:
+            fut.result()
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor) -> None:
+        """
+        워커가 죽은 풀을 새 풀로 교체하고 백그라운드에서 모델을 미리 로드합니다.
+        동시에 실패한 요청이 여러 개여도 교체는 한 번만 하며, close() 이후에는 다시 만들지 않습니다.
+        """
+        with self._pool_lock:
+            if self._pool is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = pool = self._new_pool()
+        logger.warning("MeloTTS 워커가 비정상 종료되어 워커 풀을 다시 시작합니다.")
+
+        def warm() -> None:
+            try:
+                self._warm(pool)
+                logger.info("MeloTTS 워커 풀 재시작 완료.")
+            except Exception as e:
+                logger.error(f"MeloTTS 워커 풀 재시작 후 warmup 실패: {e}")
+
+        threading.Thread(target=warm, name="melotts-rewarm", daemon=True).start()
+
+    def is_initialized(self) -> bool:
+        return self._pool is not None
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+        logger.info("MeloTTS 리소스가 정리되었습니다.")
+
+    # ---------------- 문장 캐시 ----------------
+    def _cache_get(self, key: Tuple[str, int, float]) -> Optional[Tuple[int, bytes]]:
+        with self._cache_lock:
+            item = self._cache.get(key)
+            if item is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return item
+
+    def _cache_put(self, key: Tuple[str, int, float], item: Tuple[int, bytes]) -> None:
+        with self._cache_lock:
+            self._cache[key] = item
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ---------------- 합성 ----------------
+    def _render(self, sentences: List[str]) -> List[Tuple[int, bytes]]:
+        """캐시에 없는 문장만 워커 풀에 나눠 병렬로 합성합니다."""
+        results: List[Optional[Tuple[int, bytes]]] = []
+        pending = {}
+        pool = self._pool
+        if pool is None:
+            raise TTSError("MeloTTS 워커 풀이 종료되었습니다.")
+        try:
+            # 유휴 중에 워커가 죽었으면(OOM 등) submit에서 바로 BrokenProcessPool이 발생
+            for i, sentence in enumerate(sentences):
+                key = (sentence, self.speaker_id, self.speed)
+                item = self._cache_get(key)
+                results.append(item)
+                if item is None:
+                    pending[i] = (key, pool.submit(_worker_synthesize, sentence, self.speaker_id, self.speed))
+            for i, (key, fut) in pending.items():
+                item = fut.result(timeout=self.timeout)
+                self._cache_put(key, item)
+                results[i] = item
+        except FutureTimeoutError as e:
+            for _, fut in pending.values():
+                fut.cancel()
+            raise TTSError(f"MeloTTS 합성 시간이 초과되었습니다. ({self.timeout}s)") from e
+        except BrokenProcessPool as e:
+            # 워커가 죽었으면 풀을 새로 만들어 다음 요청부터 복구 (이번 요청은 TTSError → 보조 TTS로 전환)
+            self._replace_broken_pool(pool)
+            raise TTSError("MeloTTS 워커가 비정상 종료되었습니다.") from e
+        except RuntimeError as e:
+            # 다른 스레드의 close()로 풀이 종료된 직후 submit한 경우
+            raise TTSError("MeloTTS 워커 풀이 종료되었습니다.") from e
+        return results
+
+    def synthesize(self, text: str) -> bytes:
+        """텍스트를 WAV 형식의 음성 데이터(bytes)로 변환하여 반환합니다."""
+        if not self.is_initialized():
+            raise RuntimeError("TTS 모듈이 초기화되지 않았습니다.")
+        sentences = split_sentences(text)
+        if not sentences:
+            raise TTSError("합성할 텍스트가 비어있습니다.")
+
+        logger.info(f"MeloTTS 변환 시작: \"{text}\" ({len(sentences)}문장)")
+        try:
+            rendered = self._render(sentences)
+        except TTSError:
+            raise
+        except Exception as e:
+            logger.error(f"MeloTTS 음성 합성 중 오류 발생: {e}")
+            raise TTSError("MeloTTS 음성 합성에 실패했습니다.") from e
+
+        rate = rendered[0][0]
+        gap = b"\x00\x00" * int(rate * self.gap_ms / 1000)
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            wf.writeframes(gap.join(pcm for _, pcm in rendered))
+        audio_bytes = buf.getvalue()
+        logger.info(f"MeloTTS 변환 완료: {len(audio_bytes)} bytes 생성됨.")
+        return audio_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            return {"sentence_cache": len(self._cache), "hits": self.cache_hits, "misses": self.cache_misses}
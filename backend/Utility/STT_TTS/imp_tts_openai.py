@@ -3,19 +3,36 @@
 import os
 from openai import OpenAI
 from loguru import logger
-from typing import Dict, Any
+from typing import Dict, Any, Generator, Optional
 
 from .def_interface import ITTS
 from .def_exceptions import TTSError
 
+# 스트리밍 응답에서 한 번에 전달할 오디오 조각 크기 (bytes)
+STREAM_CHUNK_SIZE = 4096
+
 class TextToSpeech(ITTS):
     """OpenAI TTS API를 사용하여 텍스트를 음성으로 변환하는 클래스."""
-    def __init__(self, config: Dict[str, Any]) -> None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("환경 변수 OPENAI_API_KEY가 설정되지 않았습니다.")
-            
-        self.client = OpenAI(api_key=api_key)
+    media_type = "audio/mpeg"
+    audio_format = "mp3"
+
+    def __init__(self, config: Dict[str, Any], client: Optional[OpenAI] = None) -> None:
+        """client를 넘기면 공유 커넥션 풀을 사용하고, 없으면 자체 클라이언트를 만듭니다."""
+        if client is not None:
+            self.client = client
+        else:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("환경 변수 OPENAI_API_KEY가 설정되지 않았습니다.")
+            self.client = OpenAI(api_key=api_key)
+        # 보조 TTS가 있을 때는 짧은 타임아웃/재시도 없음으로 빨리 전환하도록 설정 가능
+        options: Dict[str, Any] = {}
+        if config.get('timeout_sec') is not None:
+            options['timeout'] = float(config['timeout_sec'])
+        if config.get('max_retries') is not None:
+            options['max_retries'] = int(config['max_retries'])
+        if options:
+            self.client = self.client.with_options(**options)
         self.model = config.get('model', 'tts-1')
         self.voice = config.get('voice', 'fable')
         self._is_initialized = False
@@ -53,6 +70,29 @@ class TextToSpeech(ITTS):
             logger.error(f"OpenAI TTS 음성 합성 중 오류 발생: {e}")
             raise TTSError("OpenAI 음성 합성에 실패했습니다.") from e
 
+    def synthesize_stream(self, text: str) -> Generator[bytes, None, None]:
+        """
+        MP3 음성 데이터를 API가 내보내는 대로 조각 단위로 전달합니다.
+        전체 클립을 기다리지 않으므로 첫 조각 도착 시점에 재생을 시작할 수 있습니다.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("TTS 모듈이 초기화되지 않았습니다.")
+
+        logger.info(f"OpenAI TTS 스트리밍 시작: \"{text}\"")
+        try:
+            with self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=self.voice,
+                input=text,
+                response_format="mp3"
+            ) as response:
+                for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                    if chunk:
+                        yield chunk
+        except Exception as e:
+            logger.error(f"OpenAI TTS 스트리밍 중 오류 발생: {e}")
+            raise TTSError("OpenAI 음성 합성에 실패했습니다.") from e
+
     def close(self) -> None:
         """API 방식이므로 특별히 해제할 리소스가 없습니다."""
         pass
\ No newline at end of file
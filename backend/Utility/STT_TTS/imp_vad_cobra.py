@@ -6,20 +6,28 @@ from typing import Dict, Any, Optional
 
 import numpy as np
 import pvcobra
-import resampy
-import sounddevice as sd
 from loguru import logger
 
-from .def_interface import IVAD
+from .def_interface import IVAD, IAudioSource
+from .audio_source import MicrophoneSource
 from .def_exceptions import VADStreamError
+from .resampler import StreamingResampler
+from .utterance_buffer import (UtteranceRingBuffer, DEFAULT_PRE_ROLL_MS, DEFAULT_POST_ROLL_MS,
+                               DEFAULT_MAX_UTTERANCE_MS, DEFAULT_HANDOFF_SLOTS)
+
+# 처리 스레드가 밀릴 때 보관할 최대 입력 블록 수 (블록당 약 32ms)
+DEFAULT_INPUT_QUEUE_BLOCKS = 64
 
 class VoiceActivityDetector(IVAD):
     """
     Picovoice Cobra VAD를 사용하여 음성 활동을 감지하는 클래스.
     라즈베리파이 같은 저전력 장치에서의 성능 문제를 해결하기 위해,
     오디오 입력과 VAD 처리를 별도의 스레드로 분리한 구조를 가집니다.
+    마이크 스트림과 처리 스레드는 계속 살아 있고, 발화는 call_soon_threadsafe로
+    asyncio.Queue에 전달되므로 연속된 listen()이 스트림 재시작 없이 바로 대기합니다.
     """
-    def __init__(self, config: Dict[str, Any], device_index: Optional[int] = None) -> None:
+    def __init__(self, config: Dict[str, Any], device_index: Optional[int] = None,
+                 source: Optional[IAudioSource] = None) -> None:
         try:
             # 환경변수에서 Picovoice AccessKey를 가져옵니다.
             access_key = os.environ["PICOVOICE_ACCESS_KEY"]
@@ -30,6 +38,8 @@ class VoiceActivityDetector(IVAD):
 
         # 하드웨어 및 VAD 설정 초기화
         self.device_index = device_index
+        # 오디오 입력 소스 (기본: 마이크, 테스트/벤치마크에서는 WAV 파일이나 합성 신호)
+        self.source = source or MicrophoneSource(device_index)
         self.HARDWARE_RATE = config.get('hardware_rate', 48000)
         self.VAD_RATE = self.cobra.sample_rate  # Cobra는 16000Hz를 사용
         self.CHUNK_SAMPLES = self.cobra.frame_length  # Cobra는 512 샘플 단위를 사용
@@ -37,28 +47,63 @@ class VoiceActivityDetector(IVAD):
         # 실제 마이크에서 읽어올 블록 크기를 리샘플링 비율에 맞춰 계산합니다.
         self.block_size = int(self.CHUNK_SAMPLES * self.HARDWARE_RATE / self.VAD_RATE)
 
+        # 48000 → 16000 처럼 정수 비율이면 필터 상태를 유지하는 스트리밍 리샘플러를 사용합니다.
+        # (정수 비율이 아니면 기존 resampy 경로 사용)
+        try:
+            self._resampler: Optional[StreamingResampler] = StreamingResampler(
+                self.HARDWARE_RATE, self.VAD_RATE, max_block=self.block_size)
+        except ValueError:
+            self._resampler = None
+
         self.threshold = config.get('threshold', 0.6)
         self.min_silence_duration_ms = config.get('min_silence_duration_ms', 1000)
 
-        # 스레드 간 데이터 통신을 위한 큐(Queue)
-        self.input_queue = queue.Queue()  # 오디오 입력 스레드 -> 처리 스레드
-        self.output_queue = queue.Queue() # 처리 스레드 -> 메인 스레드
+        # 발화 수집 버퍼: 미리 할당된 int16 링 버퍼 (pre-roll/post-roll, 최대 길이 제한)
+        self.utterance_buffer = UtteranceRingBuffer(
+            self.CHUNK_SAMPLES, self.VAD_RATE,
+            pre_roll_ms=config.get('pre_roll_ms', DEFAULT_PRE_ROLL_MS),
+            post_roll_ms=config.get('post_roll_ms', DEFAULT_POST_ROLL_MS),
+            max_utterance_ms=config.get('max_utterance_ms', DEFAULT_MAX_UTTERANCE_MS),
+            slots=config.get('handoff_slots', DEFAULT_HANDOFF_SLOTS),
+        )
 
-        # 처리 스레드를 제어하기 위한 이벤트 객체와 스레드 객체
+        # 오디오 입력 스레드 -> 처리 스레드 (크기 제한, 가득 차면 가장 오래된 블록을 버림)
+        self.input_queue = queue.Queue(maxsize=config.get('input_queue_blocks', DEFAULT_INPUT_QUEUE_BLOCKS))
+        # 처리 스레드 -> 이벤트 루프 (asyncio.Queue, 첫 listen() 때 해당 루프에서 생성)
+        # 전달된 memoryview가 덮어써지지 않도록 (기록 중 슬롯 + 소비자가 쥔 슬롯)을 뺀 만큼만 보관
+        self.output_maxsize = max(1, len(self.utterance_buffer._slots) - 2)
+        self.output_queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.dropped_blocks = 0
+        self.dropped_utterances = 0
+
+        # 마이크 스트림과 처리 스레드는 첫 listen() 때 한 번만 시작되어 close()까지 유지됩니다.
         self.stop_event = threading.Event()
-        self.processing_thread = threading.Thread(target=self._processing_loop)
+        self.processing_thread = threading.Thread(target=self._processing_loop, name="cobra-vad", daemon=True)
+        self.stream: Optional[Any] = None
+        self._start_lock = threading.Lock()
 
     def _resample(self, audio_data: np.ndarray) -> np.ndarray:
-        """오디오 샘플링 레이트를 변환합니다. (예: 48000Hz -> 16000Hz)"""
+        """오디오 샘플링 레이트를 변환합니다. (정수 비율이 아닌 경우에만 사용, 예: 44100Hz -> 16000Hz)"""
+        import resampy
         return resampy.resample(audio_data, self.HARDWARE_RATE, self.VAD_RATE)
 
+    def _to_vad_rate(self, indata: np.ndarray) -> np.ndarray:
+        """마이크 블록(int16)을 VAD 샘플링 레이트의 int16 배열로 변환합니다."""
+        if self._resampler is not None:
+            # 내부 버퍼의 view가 반환되므로 다음 블록 전에 사용 (발화 링 버퍼에는 값이 복사됨)
+            return self._resampler.process(indata.reshape(-1))
+        audio_float32 = indata.flatten().astype(np.float32) / 32768.0
+        audio_resampled = self._resample(audio_float32)
+        return (audio_resampled * 32767).astype(np.int16)
+
     def _processing_loop(self):
         """
         별도의 스레드에서 실행되는 VAD 처리 루프.
         메인 스레드의 부담을 줄여 'input overflow'를 방지합니다.
         """
-        is_speaking = False
-        speech_buffer = []
+        ring = self.utterance_buffer
+        ring.reset()
         silence_frames = 0
         min_silence_frames = self.min_silence_duration_ms // (1000 * self.CHUNK_SAMPLES / self.VAD_RATE)
 
@@ -67,10 +112,8 @@ class VoiceActivityDetector(IVAD):
                 # 입력 큐에서 오디오 데이터를 가져옵니다. 데이터가 없으면 잠시 대기.
                 indata = self.input_queue.get(timeout=0.1)
 
-                # VAD 처리를 위한 데이터 형식 변환
-                audio_float32 = indata.flatten().astype(np.float32) / 32768.0
-                audio_resampled = self._resample(audio_float32)
-                audio_int16 = (audio_resampled * 32767).astype(np.int16)
+                # VAD 처리를 위한 데이터 형식 변환 (16kHz int16)
+                audio_int16 = self._to_vad_rate(indata)
 
                 # Cobra는 512 샘플 단위로만 처리 가능하므로, 받은 데이터를 잘라서 처리합니다.
                 num_frames = len(audio_int16) // self.CHUNK_SAMPLES
@@ -79,72 +122,135 @@ class VoiceActivityDetector(IVAD):
                     voice_probability = self.cobra.process(frame)
 
                     # 음성 감지 로직
-                    if voice_probability > self.threshold:
-                        if not is_speaking: is_speaking = True
-                        speech_buffer.append(frame.tobytes())
+                    voiced = voice_probability > self.threshold
+                    if not ring.active:
+                        if not voiced:
+                            # 트리거 전 프레임은 pre-roll로 보관 (첫 음절 잘림 방지)
+                            ring.push_idle(frame)
+                            continue
+                        ring.start()
+                    full = ring.push(frame, voiced)
+                    silence_frames = 0 if voiced else silence_frames + 1
+                    if silence_frames > min_silence_frames or full:
+                        if full:
+                            logger.warning(f"최대 발화 길이({ring.duration_ms:.0f}ms)에 도달하여 발화를 마감합니다.")
+                        # 음성 구간이 끝나면, 감지된 음성(+pre/post-roll)을 복사 없이 memoryview로 넘깁니다.
+                        self._publish(ring.finish())
                         silence_frames = 0
-                    elif is_speaking:
-                        silence_frames += 1
-                        if silence_frames > min_silence_frames:
-                            # 음성 구간이 끝나면, 감지된 전체 음성 데이터를 출력 큐에 넣습니다.
-                            utterance = b''.join(speech_buffer)
-                            self.output_queue.put(utterance)
-                            is_speaking = False
-                            speech_buffer = []
-                            silence_frames = 0
             except queue.Empty:
                 # 큐가 비어있으면 루프를 계속 진행합니다.
                 continue
 
+    # ---------------- 캡처 엔진 ----------------
+    def _audio_callback(self, indata, frames, time, status):
+        """마이크에서 오디오 데이터가 들어올 때마다 호출되는 함수. (오디오 스레드, 블로킹 금지)"""
+        if status: logger.warning(status)
+        block = indata.copy()
+        try:
+            self.input_queue.put_nowait(block)
+        except queue.Full:
+            # 처리 스레드가 밀리면 가장 오래된 블록을 버리고 최신 오디오를 유지
+            try:
+                self.input_queue.get_nowait()
+                self.dropped_blocks += 1
+            except queue.Empty:
+                pass
+            try:
+                self.input_queue.put_nowait(block)
+            except queue.Full:
+                self.dropped_blocks += 1
+
+    def _publish(self, utterance: memoryview) -> None:
+        """처리 스레드 → 이벤트 루프로 발화를 넘깁니다."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, utterance)
+        except RuntimeError:
+            pass  # 루프가 종료되는 중
+
+    def _deliver(self, utterance: memoryview) -> None:
+        """이벤트 루프 스레드에서 실행: 큐가 가득 차면 가장 오래된 발화를 버립니다."""
+        if self.output_queue is None:
+            return
+        if self.output_queue.full():
+            self.output_queue.get_nowait()
+            self.dropped_utterances += 1
+            logger.warning("처리되지 않은 이전 발화를 버립니다. (출력 큐 가득 참)")
+        self.output_queue.put_nowait(utterance)
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 큐는 생성한 루프에 묶이므로 루프가 바뀌면 새로 만듦
+            self._loop = loop
+            self.output_queue = asyncio.Queue(maxsize=self.output_maxsize)
+        with self._start_lock:
+            if self.stream is not None:
+                return
+            if self._resampler is not None:
+                self._resampler.reset()
+            self.stop_event.clear()
+            if not self.processing_thread.is_alive():
+                self.processing_thread = threading.Thread(target=self._processing_loop, name="cobra-vad", daemon=True)
+                self.processing_thread.start()
+            # 마이크 입력 스트림 시작 (close()까지 열어 둠)
+            try:
+                stream = self.source.open(self.HARDWARE_RATE, self.block_size, self._audio_callback)
+                stream.start()
+            except Exception as e:
+                self.stop_event.set()
+                raise VADStreamError(f"마이크 입력 스트림을 열 수 없습니다: {e}") from e
+            self.stream = stream
+            logger.info("🎤 마이크 캡처 엔진 시작 (Cobra VAD)")
+
     async def listen(self) -> Optional[bytes]:
         """
         메인 스레드에서 호출하는 비동기 메서드.
-        오디오 스트림을 시작하고, 처리 스레드가 결과를 내놓을 때까지 기다립니다.
+        캡처 엔진이 발화를 내놓을 때까지 기다립니다. (취소하면 즉시 CancelledError, 남는 스레드 없음)
+        결과는 16kHz int16 PCM의 memoryview(bytes-like)입니다. 이후 발화 수집에 버퍼가 재사용되므로
+        STT 단계 이후까지 보관하려면 bytes()로 복사하세요.
         """
-        logger.info("🎤 음성 입력을 기다립니다 (Cobra VAD - Threaded)...")
-
-        # 이전 작업의 스레드가 살아있으면 안전하게 종료시킵니다.
-        if self.processing_thread.is_alive():
-            self.stop_event.set()
-            self.processing_thread.join()
-
-        # 새 리스닝을 위해 큐와 이벤트를 초기화하고 처리 스레드를 시작합니다.
-        self._clear_queues()
-        self.stop_event.clear()
-        self.processing_thread = threading.Thread(target=self._processing_loop)
-        self.processing_thread.start()
-
-        def audio_callback(indata, frames, time, status):
-            """마이크에서 오디오 데이터가 들어올 때마다 호출되는 함수."""
-            if status: logger.warning(status)
-            self.input_queue.put(indata.copy())
-
-        # 마이크 입력 스트림 시작
-        stream = sd.InputStream(
-            samplerate=self.HARDWARE_RATE, channels=1, dtype='int16',
-            blocksize=self.block_size, device=self.device_index,
-            callback=audio_callback
-        )
-        with stream:
-            try:
-                loop = asyncio.get_running_loop()
-                # 처리 스레드가 결과를 output_queue에 넣을 때까지 비동기적으로 대기합니다.
-                # 'run_in_executor'는 동기 함수(output_queue.get)를 비동기 루프에서 안전하게 실행시켜줍니다.
-                detected_audio = await loop.run_in_executor(None, self.output_queue.get)
-                return detected_audio
-            except asyncio.CancelledError:
-                logger.info("리스닝 작업이 취소되었습니다.")
-                return None
-
-    def _clear_queues(self):
-        """큐에 남아있는 이전 데이터를 모두 비웁니다."""
-        while not self.input_queue.empty():
-            self.input_queue.get_nowait()
+        self._ensure_started()
+        # 지난 턴 사이(예: 안내 음성 재생 중)에 쌓인 발화는 버리고 새로 대기
         while not self.output_queue.empty():
             self.output_queue.get_nowait()
+        logger.info("🎤 음성 입력을 기다립니다 (Cobra VAD)...")
+        try:
+            return await self.output_queue.get()
+        except asyncio.CancelledError:
+            logger.info("리스닝 작업이 취소되었습니다.")
+            raise
+
+    @property
+    def frame_sample_rate(self) -> int:
+        return self.VAD_RATE
+
+    @property
+    def frame_length(self) -> int:
+        return self.CHUNK_SAMPLES
+
+    def process_frame(self, frame) -> float:
+        """외부에서 공급한 16kHz int16 프레임(512 샘플)의 음성 확률을 반환합니다."""
+        return self.cobra.process(frame)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.stream is not None,
+            "input_queue": self.input_queue.qsize(),
+            "output_queue": self.output_queue.qsize() if self.output_queue else 0,
+            "dropped_blocks": self.dropped_blocks,
+            "dropped_utterances": self.dropped_utterances,
+        }
 
     def close(self) -> None:
-        """애플리케이션 종료 시 처리 스레드와 Cobra 인스턴스를 안전하게 해제합니다."""
+        """애플리케이션 종료 시 마이크 스트림, 처리 스레드와 Cobra 인스턴스를 안전하게 해제합니다."""
+        with self._start_lock:
+            if self.stream is not None:
+                self.stream.stop()
+                self.stream.close()
+                self.stream = None
         self.stop_event.set()
         if self.processing_thread.is_alive():
             self.processing_thread.join()
@@ -0,0 +1,107 @@
+# Backend/Utility/STT_TTS/imp_vad_silero.py
+import asyncio
+from typing import Dict, Any, Optional
+
+import numpy as np
+import torch
+from loguru import logger
+
+from .def_interface import IVAD, IAudioSource
+from .def_exceptions import VADStreamError
+from .audio_source import MicrophoneSource
+from .resampler import StreamingResampler
+
+
+class VoiceActivityDetector(IVAD):
+    """
+    Silero VAD(torch) 구현. backup/imp_vad_silero_prev.py를 오디오 소스/프레임 API에 맞게 옮긴 버전입니다.
+    마이크 대신 WAV 파일이나 합성 신호 소스를 넣어 Cobra 등 다른 엔진과 같은 조건으로 비교할 수 있습니다.
+    """
+    CHUNK_SAMPLES = 512  # 16kHz 기준 Silero 입력 프레임 길이
+
+    def __init__(self, config: Dict[str, Any], device_index: Optional[int] = None,
+                 source: Optional[IAudioSource] = None) -> None:
+        try:
+            self.model, _ = torch.hub.load(repo_or_dir='snakers4/silero-vad', model='silero_vad', force_reload=False)
+        except Exception as e:
+            raise VADStreamError(f"Silero VAD 초기화 실패: {e}")
+        self.model.eval()
+        self.source = source or MicrophoneSource(device_index)
+        self.VAD_RATE = config.get('rate', 16000)
+        self.HARDWARE_RATE = config.get('hardware_rate', 48000)
+        self.threshold = config.get('threshold', 0.5)
+        self.min_silence_duration_ms = config.get('min_silence_duration_ms', 1000)
+        self.block_size = int(self.CHUNK_SAMPLES * self.HARDWARE_RATE / self.VAD_RATE)
+        # 정수 비율이면 스트리밍 리샘플러, 아니면(예: 44100Hz) Cobra와 같은 resampy 경로 사용
+        try:
+            self._resampler: Optional[StreamingResampler] = StreamingResampler(
+                self.HARDWARE_RATE, self.VAD_RATE, max_block=self.block_size)
+        except ValueError:
+            self._resampler = None
+
+    def _to_vad_rate(self, block: np.ndarray) -> np.ndarray:
+        """마이크 블록(int16)을 VAD 샘플링 레이트의 int16 배열로 변환합니다."""
+        if self._resampler is not None:
+            return self._resampler.process(block)
+        import resampy
+        resampled = resampy.resample(block.astype(np.float32) / 32768.0, self.HARDWARE_RATE, self.VAD_RATE)
+        return (resampled * 32767).astype(np.int16)
+
+    @property
+    def frame_sample_rate(self) -> int:
+        return self.VAD_RATE
+
+    @property
+    def frame_length(self) -> int:
+        return self.CHUNK_SAMPLES
+
+    def process_frame(self, frame) -> float:
+        """16kHz int16 프레임(512 샘플)의 음성 확률을 반환합니다."""
+        audio = torch.from_numpy(np.asarray(frame, dtype=np.float32) / 32768.0)
+        with torch.no_grad():
+            return float(self.model(audio, self.VAD_RATE).item())
+
+    async def listen(self) -> Optional[bytes]:
+        loop = asyncio.get_running_loop()
+        audio_queue: asyncio.Queue = asyncio.Queue()
+
+        def audio_callback(indata, frames, time, status):
+            if status: logger.warning(status)
+            loop.call_soon_threadsafe(audio_queue.put_nowait, indata.copy())
+
+        speech_buffer = []
+        silence_chunks = 0
+        min_silence_chunks = self.min_silence_duration_ms / (1000 * self.CHUNK_SAMPLES / self.VAD_RATE)
+        pending = np.empty(0, dtype=np.int16)
+        if self._resampler is not None:
+            self._resampler.reset()
+
+        logger.info("🎤 음성 입력을 기다립니다 (Silero VAD)...")
+        try:
+            with self.source.open(self.HARDWARE_RATE, self.block_size, audio_callback):
+                while True:
+                    block = (await audio_queue.get()).reshape(-1)
+                    # 비정수 비율 리샘플링은 블록마다 출력 길이가 달라지므로 남은 샘플을 이어 붙여 프레임 단위로 자름
+                    pending = np.concatenate([pending, self._to_vad_rate(block)])
+                    while len(pending) >= self.CHUNK_SAMPLES:
+                        frame, pending = pending[:self.CHUNK_SAMPLES], pending[self.CHUNK_SAMPLES:]
+                        if self.process_frame(frame) > self.threshold:
+                            speech_buffer.append(frame.tobytes())
+                            silence_chunks = 0
+                        elif speech_buffer:
+                            speech_buffer.append(frame.tobytes())
+                            silence_chunks += 1
+                            if silence_chunks > min_silence_chunks:
+                                return b''.join(speech_buffer)
+        except asyncio.CancelledError:
+            logger.info("리스닝 작업이 취소되었습니다.")
+            raise
+        except Exception as e:
+            logger.error(f"오디오 스트림 내부에서 실제 오류 발생: {e}", exc_info=True)
+            raise VADStreamError("마이크 입력 처리 중 문제가 발생했습니다.") from e
+
+    def close(self) -> None:
+        logger.info("Silero VAD 모듈이 정리되었습니다.")
+
+    def initialize(self) -> None: pass
+    def is_initialized(self) -> bool: return True
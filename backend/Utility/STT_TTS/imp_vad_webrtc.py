@@ -0,0 +1,117 @@
+# Backend/Utility/STT_TTS/imp_vad_webrtc.py
+import asyncio
+import collections
+from typing import Dict, Any, Optional
+
+import numpy as np
+import webrtcvad
+from loguru import logger
+
+from .def_interface import IVAD, IAudioSource
+from .def_exceptions import VADStreamError
+from .audio_source import MicrophoneSource
+from .resampler import StreamingResampler
+
+
+class VoiceActivityDetector(IVAD):
+    """
+    WebRTC VAD 구현. backup/imp_vad_webrtc.py를 오디오 소스/프레임 API에 맞게 옮긴 버전입니다.
+    WebRTC VAD는 확률 대신 음성 여부만 주므로 process_frame()은 0.0 또는 1.0을 반환합니다.
+    """
+    VAD_RATE = 16000  # WebRTC VAD 지원 레이트(8/16/32/48kHz) 중 다른 엔진과 같은 16kHz 사용
+
+    def __init__(self, config: Dict[str, Any], device_index: Optional[int] = None,
+                 source: Optional[IAudioSource] = None) -> None:
+        self.source = source or MicrophoneSource(device_index)
+        self.HARDWARE_RATE = config.get('hardware_rate', 48000)
+        # WebRTC VAD는 10, 20, 30ms 길이의 프레임만 지원합니다.
+        self.frame_duration_ms = config.get('frame_duration_ms', 30)
+        self.CHUNK_SAMPLES = int(self.VAD_RATE * self.frame_duration_ms / 1000)
+        self.block_size = int(self.CHUNK_SAMPLES * self.HARDWARE_RATE / self.VAD_RATE)
+        self.threshold = 0.5
+
+        # VAD 민감도 설정 (0=느슨함, 3=가장 민감함)
+        self.vad = webrtcvad.Vad(config.get('aggressiveness', 3))
+
+        # 음성 앞에 추가할 여백(padding) 프레임 수
+        self.padding_duration_ms = config.get('padding_duration_ms', 300)
+        self.num_padding_frames = max(1, self.padding_duration_ms // self.frame_duration_ms)
+        self.min_silence_duration_ms = config.get('min_silence_duration_ms', 1000)
+        # 정수 비율이면 스트리밍 리샘플러, 아니면(예: 44100Hz) Cobra와 같은 resampy 경로 사용
+        try:
+            self._resampler: Optional[StreamingResampler] = StreamingResampler(
+                self.HARDWARE_RATE, self.VAD_RATE, max_block=self.block_size)
+        except ValueError:
+            self._resampler = None
+
+    def _to_vad_rate(self, block: np.ndarray) -> np.ndarray:
+        """마이크 블록(int16)을 VAD 샘플링 레이트의 int16 배열로 변환합니다."""
+        if self._resampler is not None:
+            return self._resampler.process(block)
+        import resampy
+        resampled = resampy.resample(block.astype(np.float32) / 32768.0, self.HARDWARE_RATE, self.VAD_RATE)
+        return (resampled * 32767).astype(np.int16)
+
+    @property
+    def frame_sample_rate(self) -> int:
+        return self.VAD_RATE
+
+    @property
+    def frame_length(self) -> int:
+        return self.CHUNK_SAMPLES
+
+    def process_frame(self, frame) -> float:
+        """16kHz int16 프레임(frame_duration_ms 길이)의 음성 여부를 0.0/1.0으로 반환합니다."""
+        return 1.0 if self.vad.is_speech(np.asarray(frame, dtype=np.int16).tobytes(), self.VAD_RATE) else 0.0
+
+    async def listen(self) -> Optional[bytes]:
+        loop = asyncio.get_running_loop()
+        audio_queue: asyncio.Queue = asyncio.Queue()
+
+        def audio_callback(indata, frames, time, status):
+            if status: logger.warning(status)
+            loop.call_soon_threadsafe(audio_queue.put_nowait, indata.copy())
+
+        ring_buffer = collections.deque(maxlen=self.num_padding_frames)
+        triggered = False
+        speech_buffer = []
+        num_silence_frames = 0
+        min_silence_frames = self.min_silence_duration_ms // self.frame_duration_ms
+        pending = np.empty(0, dtype=np.int16)
+        if self._resampler is not None:
+            self._resampler.reset()
+
+        logger.info("🎤 음성 입력을 기다립니다 (WebRTC VAD)...")
+        try:
+            with self.source.open(self.HARDWARE_RATE, self.block_size, audio_callback):
+                while True:
+                    block = (await audio_queue.get()).reshape(-1)
+                    # 비정수 비율 리샘플링은 블록마다 출력 길이가 달라지므로 남은 샘플을 이어 붙여 프레임 단위로 자름
+                    pending = np.concatenate([pending, self._to_vad_rate(block)])
+                    while len(pending) >= self.CHUNK_SAMPLES:
+                        frame, pending = pending[:self.CHUNK_SAMPLES].tobytes(), pending[self.CHUNK_SAMPLES:]
+                        is_speech = self.vad.is_speech(frame, self.VAD_RATE)
+
+                        if not triggered:
+                            ring_buffer.append(frame)
+                            if is_speech:
+                                triggered = True
+                                # 버퍼에 있던 패딩용 오디오를 실제 음성 버퍼에 추가
+                                speech_buffer.extend(ring_buffer)
+                                ring_buffer.clear()
+                                num_silence_frames = 0
+                        else:
+                            speech_buffer.append(frame)
+                            num_silence_frames = 0 if is_speech else num_silence_frames + 1
+                            if num_silence_frames > min_silence_frames:
+                                return b''.join(speech_buffer)
+        except asyncio.CancelledError:
+            logger.info("리스닝 작업이 취소되었습니다.")
+            raise
+        except Exception as e:
+            logger.error(f"오디오 스트림 내부에서 실제 오류 발생: {e}", exc_info=True)
+            raise VADStreamError("마이크 입력 처리 중 문제가 발생했습니다.") from e
+
+    def initialize(self) -> None: pass
+    def is_initialized(self) -> bool: return True
+    def close(self) -> None: logger.info("WebRTC VAD 모듈이 정리되었습니다.")
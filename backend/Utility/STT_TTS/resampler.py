@@ -0,0 +1,87 @@
+# Backend/Utility/STT_TTS/resampler.py
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+# 위상(출력 샘플)당 FIR 탭 수: 클수록 차단 특성이 좋고 CPU를 더 씀
+DEFAULT_TAPS_PER_PHASE = 16
+# 출력 나이퀴스트 대비 통과 대역 비율 (음성 대역 8kHz 중 약 7.4kHz까지 유지)
+DEFAULT_CUTOFF = 0.92
+KAISER_BETA = 8.0
+
+
+def design_lowpass(factor: int, taps_per_phase: int = DEFAULT_TAPS_PER_PHASE,
+                   cutoff: float = DEFAULT_CUTOFF) -> np.ndarray:
+    """1/factor 데시메이션용 Kaiser 윈도우 sinc 저역 통과 필터 (DC 이득 1)."""
+    num_taps = taps_per_phase * factor + 1
+    fc = cutoff * 0.5 / factor  # cycles/sample (입력 샘플 기준)
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    h = 2 * fc * np.sinc(2 * fc * n) * np.kaiser(num_taps, KAISER_BETA)
+    return (h / h.sum()).astype(np.float32)
+
+
+class StreamingResampler:
+    """
+    정수 비율 다운샘플러 (예: 48000Hz → 16000Hz) - 블록 사이 필터 상태를 유지하는 polyphase FIR.
+    - 이전 블록의 마지막 (탭 수 - 1) 샘플과 남은 위상을 이어 받아 블록 경계에 잡음이 생기지 않습니다.
+    - 입력 int16 → float32 변환, 필터링, float32 → int16 변환을 모두 미리 잡아 둔 버퍼에서 수행합니다.
+    - 필요한 출력 샘플만 계산합니다. (strided view @ 필터 = 출력 하나당 taps_per_phase * factor 곱셈)
+    """
+    def __init__(self, in_rate: int, out_rate: int, max_block: int,
+                 taps_per_phase: int = DEFAULT_TAPS_PER_PHASE, cutoff: float = DEFAULT_CUTOFF) -> None:
+        if in_rate < out_rate or in_rate % out_rate:
+            raise ValueError(f"정수 비율 다운샘플링만 지원합니다: {in_rate} → {out_rate}")
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.factor = in_rate // out_rate
+        self.max_block = int(max_block)
+
+        # 상관(correlation) 연산이 되도록 필터를 뒤집어 저장 (대칭 필터라 값은 같음)
+        self._taps = np.ascontiguousarray(design_lowpass(self.factor, taps_per_phase, cutoff)[::-1])
+        self._num_taps = len(self._taps)
+        self._history = self._num_taps - 1
+
+        # 히스토리 + 이번 블록 + 이전 블록에서 남은 위상 샘플(< factor)
+        self._buf = np.zeros(self._history + self.max_block + self.factor, dtype=np.float32)
+        max_out = (self.max_block + self.factor) // self.factor + 1
+        self._out = np.empty(max_out, dtype=np.float32)
+        self._out16 = np.empty(max_out, dtype=np.int16)
+        self._fill = self._history
+
+    def reset(self) -> None:
+        """새 스트림을 시작할 때 필터 상태를 지웁니다."""
+        self._buf[:] = 0
+        self._fill = self._history
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        int16 입력 블록을 받아 다운샘플된 int16 배열을 반환합니다.
+        반환값은 내부 버퍼의 view이므로 다음 process() 호출 전에 사용하거나 복사해야 합니다.
+        """
+        n = len(block)
+        if n > self.max_block:
+            raise ValueError(f"블록 크기({n})가 최대 블록 크기({self.max_block})보다 큽니다.")
+        buf = self._buf
+        start = self._fill
+        # int16 → float32 를 버퍼 위치에 직접 기록 (중간 배열 없음)
+        np.multiply(block, np.float32(1 / 32768), out=buf[start:start + n], casting="unsafe")
+        fill = start + n
+
+        count = (fill - self._num_taps) // self.factor + 1 if fill >= self._num_taps else 0
+        if count > 0:
+            stride = buf.strides[0]
+            windows = as_strided(buf, shape=(count, self._num_taps), strides=(self.factor * stride, stride),
+                                 writeable=False)
+            out = self._out[:count]
+            np.dot(windows, self._taps, out=out)
+            np.multiply(out, np.float32(32768), out=out)
+            np.clip(out, -32768, 32767, out=out)
+            out16 = self._out16[:count]
+            np.copyto(out16, out, casting="unsafe")
+            # 다음 블록에 필요한 히스토리 + 남은 위상 샘플만 앞으로 당김
+            consumed = count * self.factor
+            remain = fill - consumed
+            buf[:remain] = buf[consumed:fill]
+            self._fill = remain
+            return out16
+        self._fill = fill
+        return self._out16[:0]
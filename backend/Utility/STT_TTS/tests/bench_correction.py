@@ -0,0 +1,61 @@
+# STT 보정 엔진 마이크로 벤치마크
+# 사용법: python bench_correction.py [반복 횟수]
+# 기존 방식(사전 항목마다 re.sub) 과 컴파일된 트라이(한 번 훑기)의 transcript당 비용을 비교합니다.
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from correction import CorrectionTrie, load_corrections, DEFAULT_CORRECTIONS_PATH  # noqa: E402
+
+TRANSCRIPTS = [
+    "등뽄 좀 뽑아 주세요",
+    "오늘 날씨 좀 알려줘",
+    "가족 관계 증명서 출력 해줘",
+    "건강 보험 자격 득실 확인서 필요해요",
+    "내일 비 올까요? 지금 몇도야",
+    "키오스크 사용법을 알려주세요 어디서 시작하면 되나요",
+    "초번이랑 등번 둘 다 프린트 해줘",
+    "주말 날씨 예보랑 기온 알려줘",
+]
+
+
+def legacy(corrections, text):
+    out = text
+    for wrong, right in corrections.items():
+        out = re.sub(re.escape(wrong), right, out, flags=re.IGNORECASE)
+    return re.sub(r"\s+", " ", out).strip()
+
+
+def compiled(trie, text):
+    return re.sub(r"\s+", " ", trie.apply(text)).strip()
+
+
+def bench(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for t in TRANSCRIPTS:
+            fn(t)
+    return (time.perf_counter() - start) / (rounds * len(TRANSCRIPTS)) * 1e6
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corrections = load_corrections(DEFAULT_CORRECTIONS_PATH)
+
+    start = time.perf_counter()
+    trie = CorrectionTrie(corrections)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"사전 {trie.size}개, 트라이 컴파일 {build_ms:.2f}ms")
+
+    legacy_us = bench(lambda t: legacy(corrections, t), rounds)
+    trie_us = bench(lambda t: compiled(trie, t), rounds)
+    print(f"기존 re.sub 반복 : {legacy_us:8.2f} µs / transcript")
+    print(f"컴파일된 트라이  : {trie_us:8.2f} µs / transcript  (x{legacy_us / trie_us:.1f})")
+
+    print("\n결과 비교 (사전 순서 의존 → leftmost-longest):")
+    for t in TRANSCRIPTS:
+        a, b = legacy(corrections, t), compiled(trie, t)
+        mark = " " if a == b else "*"
+        print(f" {mark} {t!r}\n     기존: {a!r}\n     트라이: {b!r}")
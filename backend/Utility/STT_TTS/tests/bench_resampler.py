@@ -0,0 +1,70 @@
+# Cobra VAD 리샘플링 경로 벤치마크 (frames per second)
+# 사용법: python bench_resampler.py [초 단위 오디오 길이]
+# 기존 경로(블록마다 float 변환 + resampy.resample + int16 변환) 와 스트리밍 polyphase 리샘플러를 비교합니다.
+# 1 frame = Cobra 입력 프레임 512 샘플(16kHz, 32ms). 실시간 처리에는 31.25 fps가 필요합니다.
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from resampler import StreamingResampler  # noqa: E402
+
+HARDWARE_RATE = 48000
+VAD_RATE = 16000
+CHUNK_SAMPLES = 512
+BLOCK = CHUNK_SAMPLES * HARDWARE_RATE // VAD_RATE
+
+
+def make_blocks(seconds: float):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(HARDWARE_RATE * seconds)) / HARDWARE_RATE
+    audio = 8000 * np.sin(2 * np.pi * 220 * t) + 2000 * rng.standard_normal(len(t))
+    audio = audio.astype(np.int16)
+    n = len(audio) // BLOCK
+    # sounddevice 콜백과 같은 (frames, 1) 모양
+    return [audio[i * BLOCK:(i + 1) * BLOCK].reshape(-1, 1).copy() for i in range(n)]
+
+
+def legacy_path(blocks):
+    import resampy
+    frames = 0
+    for indata in blocks:
+        audio_float32 = indata.flatten().astype(np.float32) / 32768.0
+        audio_resampled = resampy.resample(audio_float32, HARDWARE_RATE, VAD_RATE)
+        audio_int16 = (audio_resampled * 32767).astype(np.int16)
+        frames += len(audio_int16) // CHUNK_SAMPLES
+    return frames
+
+
+def streaming_path(blocks):
+    resampler = StreamingResampler(HARDWARE_RATE, VAD_RATE, max_block=BLOCK)
+    frames = 0
+    for indata in blocks:
+        audio_int16 = resampler.process(indata.reshape(-1))
+        frames += len(audio_int16) // CHUNK_SAMPLES
+    return frames
+
+
+def bench(name, fn, blocks):
+    start = time.perf_counter()
+    frames = fn(blocks)
+    elapsed = time.perf_counter() - start
+    fps = frames / elapsed
+    print(f"{name:<22}: {fps:10.1f} frames/s  (실시간 대비 x{fps / (VAD_RATE / CHUNK_SAMPLES):.0f}, "
+          f"블록당 {elapsed / len(blocks) * 1e6:.1f} µs)")
+    return fps
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    blocks = make_blocks(seconds)
+    print(f"{seconds:.0f}초 오디오, {len(blocks)}블록 ({BLOCK} 샘플 @ {HARDWARE_RATE}Hz)")
+
+    stream_fps = bench("streaming polyphase", streaming_path, blocks)
+    try:
+        legacy_fps = bench("resampy (기존)", legacy_path, blocks)
+        print(f"속도 향상: x{stream_fps / legacy_fps:.1f}")
+    except ImportError:
+        print("resampy가 설치되어 있지 않아 기존 경로는 건너뜁니다. (pip install resampy)")
@@ -0,0 +1,145 @@
+# VAD 엔진 비교 벤치마크 (Cobra / Silero / WebRTC)
+# 사용법: python bench_vad.py [코퍼스 디렉토리] [--engines cobra,silero,webrtc] [--min-silence-ms 800]
+# 코퍼스: 16bit WAV + 같은 이름의 Audacity 라벨 파일(.txt, 줄마다 "시작초<TAB>끝초")
+#        디렉토리를 주지 않으면 라벨이 정확히 알려진 합성 신호를 사용합니다. (학습 기반 엔진 비교에는 실제 녹음 권장)
+# 측정 항목:
+#   - CPU ms / 오디오 1초 : process_frame() 호출에 쓴 CPU 시간 (process_time 기준, 라즈베리파이에서 비교)
+#   - 프레임 정확도        : 음성/비음성 프레임 판정 정확도, 음성 재현율(recall), 비음성 오탐률(false alarm)
+#   - 시작/종료 지연       : 라벨 구간 대비 발화 시작 감지, endpoint(무음 min-silence 포함) 감지까지 걸린 시간
+# 예) Cobra 사용 시 PICOVOICE_ACCESS_KEY 환경변수가 필요합니다.
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from Utility.STT_TTS.factory import load_config, create_vad  # noqa: E402
+from Utility.STT_TTS.audio_source import WavFileSource, SyntheticSource  # noqa: E402
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+ENGINES = ("cobra", "silero", "webrtc")
+
+
+def load_corpus(corpus_dir):
+    if not corpus_dir:
+        pattern = [(False, 1.2), (True, 1.5), (False, 0.8), (True, 0.6), (False, 2.0), (True, 2.4), (False, 1.0)]
+        return [("synthetic", SyntheticSource(pattern, seed=seed, speed=0)) for seed in range(3)]
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.wav"))):
+        source = WavFileSource(path, speed=0)
+        if not source.speech_segments:
+            print(f"라벨 파일이 없어 건너뜁니다: {path}")
+            continue
+        corpus.append((os.path.basename(path), source))
+    return corpus
+
+
+def detect_segments(voiced, frame_sec, min_silence_frames):
+    """프레임 판정을 엔드포인터처럼 처리해 (시작초, 종료 감지초) 목록을 만듭니다."""
+    segments, start, silence = [], None, 0
+    for i, v in enumerate(voiced):
+        if start is None:
+            if v:
+                start, silence = i, 0
+            continue
+        silence = 0 if v else silence + 1
+        if silence > min_silence_frames:
+            segments.append((start * frame_sec, (i + 1) * frame_sec))
+            start = None
+    if start is not None:
+        segments.append((start * frame_sec, len(voiced) * frame_sec))
+    return segments
+
+
+def run_engine(vad, corpus, min_silence_ms):
+    rate, frame_len = vad.frame_sample_rate, vad.frame_length
+    frame_sec = frame_len / rate
+    min_silence_frames = int(min_silence_ms / 1000 / frame_sec)
+    threshold = getattr(vad, "threshold", 0.5)
+    cpu = audio_sec = 0.0
+    correct = total = tp = speech = fp = nonspeech = 0
+    onset, endpoint, missed, merged = [], [], 0, 0
+
+    for _, source in corpus:
+        frames = list(source.blocks(rate, frame_len))
+        probs = np.empty(len(frames), dtype=np.float32)
+        start = time.process_time()
+        for i, frame in enumerate(frames):
+            probs[i] = vad.process_frame(frame)
+        cpu += time.process_time() - start
+        audio_sec += len(frames) * frame_sec
+
+        voiced = probs > threshold
+        labels = source.frame_labels(rate, frame_len, len(frames))
+        correct += int(np.count_nonzero(voiced == labels))
+        total += len(frames)
+        tp += int(np.count_nonzero(voiced & labels))
+        speech += int(np.count_nonzero(labels))
+        fp += int(np.count_nonzero(voiced & ~labels))
+        nonspeech += int(np.count_nonzero(~labels))
+
+        detected = detect_segments(voiced, frame_sec, min_silence_frames)
+        used = set()
+        for label_start, label_end in source.speech_segments:
+            idx = next((j for j, d in enumerate(detected) if d[0] < label_end and d[1] > label_start), None)
+            if idx is None:
+                missed += 1
+                continue
+            if idx in used:
+                # 무음이 min-silence보다 짧아 앞 발화와 하나로 합쳐진 구간 (지연 통계에서 제외)
+                merged += 1
+                continue
+            used.add(idx)
+            onset.append(detected[idx][0] - label_start)
+            endpoint.append(detected[idx][1] - label_end)
+
+    def ms(values, q):
+        return f"{1000 * np.percentile(values, q):7.0f}" if values else "      -"
+
+    return {
+        "cpu_ms_per_sec": 1000 * cpu / audio_sec,
+        "rtf": cpu / audio_sec,
+        "accuracy": correct / total,
+        "recall": tp / speech if speech else float("nan"),
+        "false_alarm": fp / nonspeech if nonspeech else float("nan"),
+        "onset_p50": ms(onset, 50), "endpoint_p50": ms(endpoint, 50), "endpoint_p90": ms(endpoint, 90),
+        "missed": missed, "merged": merged, "segments": sum(len(s.speech_segments) for _, s in corpus),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAD 엔진 비교 벤치마크")
+    parser.add_argument("corpus", nargs="?", help="WAV + .txt 라벨 디렉토리 (없으면 합성 신호)")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--min-silence-ms", type=int, default=800, help="endpoint 판정 무음 길이 (모든 엔진 공통)")
+    args = parser.parse_args()
+
+    config = load_config(os.path.join(ROOT_DIR, "config.yaml"))
+    corpus = load_corpus(args.corpus)
+    seconds = sum(s.duration_sec for _, s in corpus)
+    print(f"코퍼스: {len(corpus)}개 파일, {seconds:.1f}초, endpoint 무음 기준 {args.min_silence_ms}ms\n")
+    print(f"{'engine':<8} {'CPU ms/s':>9} {'RTF':>7} {'acc':>6} {'recall':>7} {'FA':>6} "
+          f"{'onset p50':>10} {'end p50':>8} {'end p90':>8} {'missed':>7} {'merged':>7}")
+
+    for name in args.engines.split(","):
+        name = name.strip()
+        try:
+            vad = create_vad({"vad": {**config["vad"], "provider": name}})
+        except Exception as e:
+            print(f"{name:<8} 건너뜀: {e}")
+            continue
+        try:
+            r = run_engine(vad, corpus, args.min_silence_ms)
+        finally:
+            vad.close()
+        print(f"{name:<8} {r['cpu_ms_per_sec']:9.2f} {r['rtf']:7.4f} {r['accuracy']:6.3f} {r['recall']:7.3f} "
+              f"{r['false_alarm']:6.3f} {r['onset_p50']:>10} {r['endpoint_p50']:>8} {r['endpoint_p90']:>8} "
+              f"{r['missed']:>3}/{r['segments']:<3} {r['merged']:>7}")
+    print("\n지연은 ms (endpoint 지연에는 --min-silence-ms 대기 시간이 포함됩니다, merged = 앞 발화와 합쳐진 구간)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Backend/Utility/STT_TTS/utterance_buffer.py
+from typing import List
+
+import numpy as np
+
+# ---- 기본값 ----
+DEFAULT_PRE_ROLL_MS = 300        # 트리거 이전 오디오 (첫 음절 잘림 방지)
+DEFAULT_POST_ROLL_MS = 300       # 마지막 음성 이후 남길 무음 (끝음절 잘림 방지)
+DEFAULT_MAX_UTTERANCE_MS = 15000 # 안전장치: 최대 발화 길이
+DEFAULT_HANDOFF_SLOTS = 3        # 동시에 살아 있을 수 있는 전달 버퍼 수
+
+
+class UtteranceRingBuffer:
+    """
+    VAD 발화 수집용 고정 크기 int16 버퍼.
+    - 트리거 전: pre-roll 길이의 링 버퍼에 계속 덮어씁니다.
+    - 트리거 후: pre-roll을 앞에 붙이고, 무음 프레임까지 포함해 이어서 기록합니다.
+    - 종료 시: 마지막 음성 프레임 뒤 post-roll만 남기고 나머지 무음은 잘라냅니다.
+    - 최대 길이에 도달하면 push()가 True를 반환하며 더 이상 늘어나지 않습니다.
+    - finish()는 복사 없이 memoryview를 넘기고, 다음 발화는 다른 슬롯에 기록합니다.
+      (슬롯이 한 바퀴 돌면 재사용되므로, 그보다 오래 보관하려면 소비자가 bytes()로 복사해야 합니다)
+    모든 배열은 생성 시 한 번만 할당됩니다.
+    """
+    def __init__(self, frame_length: int, sample_rate: int,
+                 pre_roll_ms: int = DEFAULT_PRE_ROLL_MS,
+                 post_roll_ms: int = DEFAULT_POST_ROLL_MS,
+                 max_utterance_ms: int = DEFAULT_MAX_UTTERANCE_MS,
+                 slots: int = DEFAULT_HANDOFF_SLOTS) -> None:
+        self.frame_length = frame_length
+        self.sample_rate = sample_rate
+        # pre-roll은 프레임 단위로 맞춰 링 버퍼 경계에서 프레임이 쪼개지지 않게 함
+        pre_frames = int(pre_roll_ms * sample_rate / 1000) // frame_length
+        self.pre_roll_samples = pre_frames * frame_length
+        self.post_roll_samples = int(post_roll_ms * sample_rate / 1000)
+        self.max_samples = max(frame_length, int(max_utterance_ms * sample_rate / 1000))
+        self.capacity = self.pre_roll_samples + self.max_samples
+
+        self._pre = np.zeros(max(self.pre_roll_samples, frame_length), dtype=np.int16)
+        self._pre_pos = 0
+        self._pre_len = 0
+        self._slots: List[np.ndarray] = [np.zeros(self.capacity, dtype=np.int16) for _ in range(max(1, slots))]
+        self._slot = 0
+        self._len = 0
+        self._voiced_end = 0
+        self.active = False
+
+    @property
+    def duration_ms(self) -> float:
+        return 1000 * self._len / self.sample_rate
+
+    def reset(self) -> None:
+        self._pre_pos = self._pre_len = 0
+        self._len = self._voiced_end = 0
+        self.active = False
+
+    def push_idle(self, frame: np.ndarray) -> None:
+        """트리거 전 프레임을 pre-roll 링 버퍼에 기록합니다."""
+        if not self.pre_roll_samples:
+            return
+        n = len(frame)
+        if n >= self.pre_roll_samples:
+            self._pre[:self.pre_roll_samples] = frame[n - self.pre_roll_samples:]
+            self._pre_pos, self._pre_len = 0, self.pre_roll_samples
+            return
+        end = self._pre_pos + n
+        if end <= self.pre_roll_samples:
+            self._pre[self._pre_pos:end] = frame
+        else:  # 프레임 길이가 다를 때만 발생 (경계에서 나눠 기록)
+            first = self.pre_roll_samples - self._pre_pos
+            self._pre[self._pre_pos:] = frame[:first]
+            self._pre[:n - first] = frame[first:]
+        self._pre_pos = end % self.pre_roll_samples
+        self._pre_len = min(self._pre_len + n, self.pre_roll_samples)
+
+    def start(self) -> None:
+        """발화 시작: pre-roll을 시간 순서대로 현재 슬롯 앞부분에 복사합니다."""
+        buf = self._slots[self._slot]
+        if self._pre_len < self.pre_roll_samples:
+            self._len = self._pre_len
+            buf[:self._len] = self._pre[:self._pre_len]
+        else:
+            tail = self.pre_roll_samples - self._pre_pos
+            buf[:tail] = self._pre[self._pre_pos:self.pre_roll_samples]
+            buf[tail:self.pre_roll_samples] = self._pre[:self._pre_pos]
+            self._len = self.pre_roll_samples
+        self._voiced_end = self._len
+        self._pre_pos = self._pre_len = 0
+        self.active = True
+
+    def push(self, frame: np.ndarray, voiced: bool) -> bool:
+        """발화 중 프레임을 기록합니다. 최대 길이에 도달하면 True."""
+        buf = self._slots[self._slot]
+        n = min(len(frame), self.capacity - self._len)
+        buf[self._len:self._len + n] = frame[:n]
+        self._len += n
+        if voiced:
+            self._voiced_end = self._len
+        return self._len >= self.capacity
+
+    def finish(self) -> memoryview:
+        """발화를 마감하고 (마지막 음성 + post-roll)까지의 PCM을 복사 없이 반환합니다."""
+        end = min(self._len, self._voiced_end + self.post_roll_samples)
+        view = memoryview(self._slots[self._slot][:end]).cast("B")
+        self._slot = (self._slot + 1) % len(self._slots)
+        self._len = self._voiced_end = 0
+        self.active = False
+        return view
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import io
+import wave
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from Utility.STT_TTS.def_exceptions import AudioQualityError
+
+# ---- Config 기본값 ----
+DEFAULT_FRAME_MS = 20
+DEFAULT_PAD_MS = 200             # 잘라낸 음성 구간 앞뒤에 남길 여유 (첫/끝 음절 보호)
+DEFAULT_NOISE_MARGIN_DB = 12.0   # 배경 소음 추정치보다 이만큼 크면 음성 프레임
+DEFAULT_SPEECH_FLOOR_DBFS = -50.0  # 소음이 아주 작아도 이보다 작은 프레임은 음성으로 보지 않음
+DEFAULT_SPEECH_CEIL_DBFS = -30.0   # 녹음 전체가 큰 소리여서 소음 추정이 높아도 이보다 큰 프레임은 음성
+DEFAULT_MIN_SPEECH_MS = 200      # 음성 프레임 합계가 이보다 짧으면 거절
+DEFAULT_MIN_RMS_DBFS = -45.0     # 잘라낸 구간의 RMS가 이보다 작으면 (거의 무음) 거절
+DEFAULT_MAX_CLIP_RATIO = 0.05    # 포화(클리핑) 샘플 비율이 이보다 크면 거절
+CLIP_LEVEL = 32767 * 0.99
+EPS = 1e-10
+
+
+def _dbfs(power: np.ndarray) -> np.ndarray:
+    return 10 * np.log10(power + EPS)
+
+
+class AudioQualityGate:
+    """
+    STT 호출 전에 업로드 WAV(16bit PCM)를 검사하고 앞뒤 무음을 잘라냅니다.
+    - 프레임(기본 20ms) 에너지를 한 번의 reshape/행렬 연산으로 구하고, 하위 10% 분위수를 배경 소음으로 추정합니다.
+    - 소음 + margin 을 넘는 첫/마지막 프레임 사이(+ 앞뒤 pad)만 남겨 upstream 업로드 크기를 줄입니다.
+    - 음성이 거의 없거나, 너무 작거나, 포화가 심하면 AudioQualityError를 던져 STT 호출 자체를 생략합니다.
+    16bit PCM이 아닌 WAV는 검사 없이 그대로 통과시킵니다.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.enabled = bool(config.get("enabled", True))
+        self.frame_ms = int(config.get("frame_ms", DEFAULT_FRAME_MS))
+        self.pad_ms = int(config.get("pad_ms", DEFAULT_PAD_MS))
+        self.noise_margin_db = float(config.get("noise_margin_db", DEFAULT_NOISE_MARGIN_DB))
+        self.speech_floor_dbfs = float(config.get("speech_floor_dbfs", DEFAULT_SPEECH_FLOOR_DBFS))
+        self.speech_ceil_dbfs = float(config.get("speech_ceil_dbfs", DEFAULT_SPEECH_CEIL_DBFS))
+        self.min_speech_ms = int(config.get("min_speech_ms", DEFAULT_MIN_SPEECH_MS))
+        self.min_rms_dbfs = float(config.get("min_rms_dbfs", DEFAULT_MIN_RMS_DBFS))
+        self.max_clip_ratio = float(config.get("max_clip_ratio", DEFAULT_MAX_CLIP_RATIO))
+
+        self.passed = 0
+        self.rejected: Dict[str, int] = {}
+        self.trimmed_ms = 0.0
+
+    @staticmethod
+    def _read(wav_bytes: bytes) -> Optional[Tuple[Any, bytes]]:
+        try:
+            with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+                params = wf.getparams()
+                if params.sampwidth != 2:
+                    return None
+                return params, wf.readframes(params.nframes)
+        except (wave.Error, EOFError):
+            return None
+
+    def _reject(self, reason: str, message: str, info: Dict[str, Any]) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        logger.info(f"STT 전 오디오 거절 ({reason}): {info}")
+        raise AudioQualityError(message, reason=reason, info=info)
+
+    def process(self, wav_bytes: bytes) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        (STT에 보낼 WAV, 측정값)을 반환합니다. 쓸 수 없는 오디오면 AudioQualityError.
+        측정값: duration_ms, trimmed_ms(잘라낸 뒤 길이), speech_ms, rms_dbfs, clip_ratio
+        """
+        if not self.enabled:
+            return wav_bytes, {}
+        parsed = self._read(wav_bytes)
+        if parsed is None:
+            return wav_bytes, {}
+        params, pcm = parsed
+        channels, rate = params.nchannels, params.framerate
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        total = len(samples) // channels
+        duration_ms = 1000 * total / rate
+        info: Dict[str, Any] = {"duration_ms": round(duration_ms)}
+
+        # 채널 평균(mono) float32, 프레임 단위 [n_frames, frame_len]로 묶어 에너지 계산
+        mono = samples[:total * channels].reshape(total, channels).astype(np.float32)
+        if channels > 1:
+            mono = mono.mean(axis=1)
+        else:
+            mono = mono.reshape(-1)
+        frame_len = max(1, rate * self.frame_ms // 1000)
+        n_frames = total // frame_len
+        if n_frames == 0:
+            self._reject("too_short", "녹음이 너무 짧습니다.", info)
+        frames = mono[:n_frames * frame_len].reshape(n_frames, frame_len) / 32768.0
+        energy_db = _dbfs(np.einsum("ij,ij->i", frames, frames) / frame_len)
+
+        noise_db = float(np.percentile(energy_db, 10))
+        threshold = max(min(noise_db + self.noise_margin_db, self.speech_ceil_dbfs), self.speech_floor_dbfs)
+        voiced = np.flatnonzero(energy_db > threshold)
+        speech_ms = len(voiced) * self.frame_ms
+        info["speech_ms"] = speech_ms
+        if speech_ms < self.min_speech_ms:
+            self._reject("no_speech", "음성이 감지되지 않았습니다.", info)
+
+        # 첫/마지막 음성 프레임 + pad 범위만 남김 (샘플 단위)
+        pad = rate * self.pad_ms // 1000
+        start = max(0, int(voiced[0]) * frame_len - pad)
+        end = min(total, (int(voiced[-1]) + 1) * frame_len + pad)
+        segment = mono[start:end]
+        rms_dbfs = float(_dbfs(np.dot(segment, segment) / (len(segment) * 32768.0 ** 2)))
+        clip_ratio = float(np.count_nonzero(np.abs(segment) >= CLIP_LEVEL)) / len(segment)
+        info.update(trimmed_ms=round(1000 * (end - start) / rate),
+                    rms_dbfs=round(rms_dbfs, 1), clip_ratio=round(clip_ratio, 4))
+        if rms_dbfs < self.min_rms_dbfs:
+            self._reject("too_quiet", "목소리가 너무 작습니다. 조금 더 크게 말씀해 주세요.", info)
+        if clip_ratio > self.max_clip_ratio:
+            self._reject("clipped", "입력 소리가 너무 커서 찌그러졌습니다. 마이크에서 조금 떨어져 말씀해 주세요.", info)
+
+        self.passed += 1
+        self.trimmed_ms += duration_ms - info["trimmed_ms"]
+        if start == 0 and end == total:
+            return wav_bytes, info
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            wf.writeframes(samples[start * channels:end * channels].tobytes())
+        return buf.getvalue(), info
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "passed": self.passed,
+            "rejected": dict(self.rejected),
+            "trimmed_sec_total": round(self.trimmed_ms / 1000, 1),
+        }
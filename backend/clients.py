@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+from loguru import logger
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+
+from metrics import upstream_hooks, async_upstream_hooks
+
+# HTTP/2는 h2 패키지가 설치된 경우에만 사용 (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# ---- Config 기본값 ----
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_MAX_KEEPALIVE = 16
+DEFAULT_KEEPALIVE_EXPIRY = 120.0   # 유휴 커넥션 유지 시간 (초)
+DEFAULT_TIMEOUT_SEC = 30.0
+DEFAULT_PING_INTERVAL_SEC = 50.0   # 0이면 keep-alive ping 비활성화
+# 부하 테스트 시 가짜 upstream(loadtest/fake_upstream.py)으로 바꿀 수 있음 (OpenAI는 SDK가 OPENAI_BASE_URL을 사용)
+OWM_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org")
+
+
+class UpstreamClients:
+    """
+    외부 API 클라이언트 레지스트리.
+    - OpenAI(sync/async)와 OpenWeather HTTP 클라이언트를 프로세스당 하나씩만 만들어 커넥션 풀을 공유합니다.
+    - keep-alive 한도를 조정하고, 가능하면 HTTP/2를 사용합니다.
+    - 주기적인 keep-alive ping으로 유휴 키오스크의 다음 첫 요청이 TLS 재협상을 하지 않도록 합니다.
+    - FastAPI lifespan에서 start()/aclose()로 수명을 관리합니다.
+    - 모든 upstream 호출은 event hook으로 지연 시간 히스토그램에 기록되고 X-Request-ID가 전달됩니다.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        self.configure(config)
+        self._openai: Optional[OpenAI] = None
+        self._async_openai: Optional[AsyncOpenAI] = None
+        # OpenAI SDK에 넘긴 httpx 클라이언트 (keep-alive ping은 SDK 내부 속성 대신 이것으로 보냄)
+        self._openai_http: Optional[httpx.Client] = None
+        self._async_openai_http: Optional[httpx.AsyncClient] = None
+        self._weather_http: Optional[httpx.AsyncClient] = None
+        self._ping_task: Optional[asyncio.Task] = None
+
+    def configure(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """클라이언트가 만들어지기 전에 설정을 반영합니다."""
+        config = config or {}
+        self.timeout = float(config.get("timeout_sec", DEFAULT_TIMEOUT_SEC))
+        self.http2 = bool(config.get("http2", True)) and HTTP2_AVAILABLE
+        self.ping_interval = float(config.get("ping_interval_sec", DEFAULT_PING_INTERVAL_SEC))
+        self.limits = httpx.Limits(
+            max_connections=int(config.get("max_connections", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive_connections=int(config.get("max_keepalive", DEFAULT_MAX_KEEPALIVE)),
+            keepalive_expiry=float(config.get("keepalive_expiry_sec", DEFAULT_KEEPALIVE_EXPIRY)),
+        )
+
+    # ---------------- 클라이언트 ----------------
+    def openai(self) -> Optional[OpenAI]:
+        """스레드에서 호출하는 STT/TTS용 동기 OpenAI 클라이언트 (키가 없으면 None)."""
+        if self._openai is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                return None
+            self._openai_http = DefaultHttpxClient(limits=self.limits, http2=self.http2, timeout=self.timeout,
+                                                   event_hooks=upstream_hooks("openai"))
+            self._openai = OpenAI(api_key=api_key, http_client=self._openai_http)
+        return self._openai
+
+    def async_openai(self) -> Optional[AsyncOpenAI]:
+        """이벤트 루프에서 사용하는 비동기 OpenAI 클라이언트 (키가 없으면 None)."""
+        if self._async_openai is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                return None
+            self._async_openai_http = DefaultAsyncHttpxClient(limits=self.limits, http2=self.http2,
+                                                              timeout=self.timeout,
+                                                              event_hooks=async_upstream_hooks("openai"))
+            self._async_openai = AsyncOpenAI(api_key=api_key, http_client=self._async_openai_http)
+        return self._async_openai
+
+    def weather_http(self) -> httpx.AsyncClient:
+        """OpenWeather 조회용 HTTP 클라이언트."""
+        if self._weather_http is None or self._weather_http.is_closed:
+            self._weather_http = httpx.AsyncClient(
+                base_url=OWM_BASE_URL, limits=self.limits, http2=self.http2, timeout=self.timeout,
+                event_hooks=async_upstream_hooks("openweather"),
+            )
+        return self._weather_http
+
+    # ---------------- 수명 관리 ----------------
+    async def start(self) -> None:
+        if self.ping_interval > 0 and self._ping_task is None:
+            self._ping_task = asyncio.create_task(self._ping_loop())
+        logger.info(f"upstream 클라이언트 준비 (http2={self.http2}, ping={self.ping_interval}s)")
+
+    async def _ping_once(self) -> None:
+        targets: List = []
+        if self._async_openai is not None and not self._async_openai_http.is_closed:
+            targets.append(self._async_openai_http.head(str(self._async_openai.base_url)))
+        if self._weather_http is not None and not self._weather_http.is_closed:
+            targets.append(self._weather_http.head("/"))
+        if self._openai is not None and not self._openai_http.is_closed:
+            targets.append(asyncio.to_thread(self._openai_http.head, str(self._openai.base_url)))
+        # 응답 코드는 중요하지 않음: 커넥션을 살려두는 것이 목적
+        results = await asyncio.gather(*targets, return_exceptions=True)
+        for r in results:
+            if isinstance(r, Exception):
+                logger.debug(f"keep-alive ping 실패(무시): {type(r).__name__}: {r}")
+
+    async def _ping_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await self._ping_once()
+
+    async def aclose(self) -> None:
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            await asyncio.gather(self._ping_task, return_exceptions=True)
+            self._ping_task = None
+        if self._async_openai is not None:
+            await self._async_openai.close()
+            self._async_openai = self._async_openai_http = None
+        if self._openai is not None:
+            self._openai.close()
+            self._openai = self._openai_http = None
+        if self._weather_http is not None:
+            await self._weather_http.aclose()
+            self._weather_http = None
+        logger.info("upstream 클라이언트가 정리되었습니다.")
+
+
+# ---- 프로세스 전역 레지스트리 (싱글턴) ----
+_clients: Optional[UpstreamClients] = None
+
+def get_clients() -> UpstreamClients:
+    global _clients
+    if _clients is None:
+        _clients = UpstreamClients()
+    return _clients
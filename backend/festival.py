@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import csv
+import hashlib
+import os
+import re
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import JSONResponse
+from loguru import logger
+
+router = APIRouter()
+
+# ---- Config 기본값 ----
+DEFAULT_CSV_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "frontend", "public", "festival.csv"))
+DEFAULT_PAGE_SIZE = 3           # 키오스크 화면 한 장에 들어가는 카드 수
+MAX_PAGE_SIZE = 50
+DEFAULT_CHECK_INTERVAL_SEC = 30.0  # CSV 파일 변경(stat) 확인 주기
+DEFAULT_MAX_AGE_SEC = 60        # 응답 Cache-Control max-age (이후에는 ETag로 재검증)
+
+OPEN_END = 99991231             # 종료일 미정 → 계속 진행 중으로 취급
+# 응답에 싣는 열 (축제명 등 화면에 필요한 것만)
+TEXT_COLUMNS = {
+    "name": "축제명",
+    "place": "개최장소",
+    "address": "소재지도로명주소",
+    "homepage": "홈페이지주소",
+    "phone": "전화번호",
+}
+# "서울특별시 성동구 ..." → "서울": 시/도 이름의 행정구역 접미사 제거
+_REGION_SUFFIX_RE = re.compile(r"(특별자치시|특별자치도|특별시|광역시)$")
+
+
+def normalize_region(value: str) -> str:
+    """'서울', '서울특별시', '서울특별시 성동구 ...' 를 모두 '서울'로 맞춥니다."""
+    head = (value or "").strip().split(" ")[0]
+    return _REGION_SUFFIX_RE.sub("", head)
+
+
+def parse_ymd(*values: str) -> Optional[int]:
+    """'20250101', '20250101.0', '2025-01-01' 중 처음 해석되는 값을 yyyymmdd 정수로 반환합니다."""
+    for value in values:
+        digits = re.sub(r"\D", "", re.sub(r"\.0+$", "", (value or "").strip()))
+        if len(digits) == 8:
+            try:
+                datetime.strptime(digits, "%Y%m%d")
+                return int(digits)
+            except ValueError:
+                continue
+    return None
+
+
+def _iso(ymd: int) -> Optional[str]:
+    if ymd <= 0 or ymd >= OPEN_END:
+        return None
+    s = str(ymd)
+    return f"{s[:4]}-{s[4:6]}-{s[6:]}"
+
+
+class FestivalTable:
+    """
+    축제 목록의 열 지향(columnar) 메모리 표현 + 시작/종료일 구간 색인.
+    - 행은 (시작일, 축제명) 순으로 정렬되어 있고, 날짜/지역은 numpy 배열, 표시용 문자열은 열별 리스트로 둡니다.
+    - 구간 색인: 시작일 오름차순 배열 + 종료일 누적 최댓값(prefix max).
+      [from, to]와 겹치는 행은 start <= to 인 앞부분 중, prefix max가 처음 from 이상이 되는 지점부터만 보면 됩니다.
+      (두 경계 모두 이진 탐색, 남은 구간만 종료일을 벡터 비교)
+    - 시작일을 모르는 행은 색인에서 빼고 결과 맨 뒤에 붙입니다. (프론트엔드의 기존 정렬과 동일)
+    """
+    def __init__(self, rows: List[Dict[str, str]], version: str) -> None:
+        self.version = version
+        parsed = []
+        for row in rows:
+            start = parse_ymd(row.get("시작일_정리", ""), row.get("축제시작일자", ""))
+            end = parse_ymd(row.get("종료일_정리", ""), row.get("축제종료일자", ""))
+            region = normalize_region(row.get("위치", "")) or normalize_region(
+                row.get("소재지도로명주소", "") or row.get("소재지지번주소", ""))
+            parsed.append((start, end, region, row))
+        parsed.sort(key=lambda p: (p[0] is None, p[0] or 0, p[3].get("축제명", "")))
+
+        self.regions: List[str] = sorted({p[2] for p in parsed})
+        self.region_index = {r: i for i, r in enumerate(self.regions)}
+        self.start = np.array([p[0] or 0 for p in parsed], dtype=np.int32)
+        self.end = np.array([p[1] or OPEN_END for p in parsed], dtype=np.int32)
+        self.region = np.array([self.region_index[p[2]] for p in parsed], dtype=np.int16)
+        self.columns: Dict[str, List[str]] = {
+            key: [(p[3].get(col) or "").strip() for p in parsed] for key, col in TEXT_COLUMNS.items()
+        }
+        # 색인 대상: 시작일이 있는 앞쪽 행들 (정렬 키상 시작일 없는 행은 맨 뒤)
+        self.dated = int(sum(1 for p in parsed if p[0] is not None))
+        self._end_prefix_max = np.maximum.accumulate(self.end[:self.dated]) if self.dated else self.end[:0]
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def query(self, date_from: int, date_to: int, region: Optional[str] = None) -> np.ndarray:
+        """[date_from, date_to] 기간에 열리는(겹치는) 행 번호를 시작일 순으로 반환합니다."""
+        lo = int(np.searchsorted(self._end_prefix_max, date_from, side="left"))
+        hi = int(np.searchsorted(self.start[:self.dated], date_to, side="right"))
+        rows = np.arange(lo, max(lo, hi))
+        rows = rows[self.end[lo:max(lo, hi)] >= date_from]
+        undated = np.arange(self.dated, len(self))
+        rows = np.concatenate([rows, undated[self.end[undated] >= date_from]])
+        if region:
+            rows = rows[self.region[rows] == self.region_index.get(region, -1)]
+        return rows
+
+    def record(self, row: int) -> Dict[str, Any]:
+        item = {key: values[row] for key, values in self.columns.items()}
+        item.update(start=_iso(int(self.start[row])), end=_iso(int(self.end[row])),
+                    region=self.regions[int(self.region[row])])
+        return item
+
+
+class FestivalStore:
+    """
+    festival.csv를 한 번만 읽어 FestivalTable로 들고 있는 저장소.
+    - 파일 stat(mtime, size)은 check_interval마다만 확인하고, 바뀌었으면 다시 읽어
+      데이터기준일자(최신 값)와 행 수가 달라졌을 때만 새 테이블로 교체합니다.
+    - 재적재는 스레드에서 하며, 동시에 들어온 요청은 하나의 재적재를 함께 기다립니다.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        self.configure(config)
+        self.table: Optional[FestivalTable] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._reload: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    def configure(self, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.path = config.get("csv_path") or DEFAULT_CSV_PATH
+        self.page_size = int(config.get("page_size", DEFAULT_PAGE_SIZE))
+        self.default_region = config.get("default_region", "")
+        self.check_interval = float(config.get("check_interval_sec", DEFAULT_CHECK_INTERVAL_SEC))
+        self.max_age = int(config.get("max_age_sec", DEFAULT_MAX_AGE_SEC))
+
+    def _load(self, stat: Tuple[int, int]) -> None:
+        with open(self.path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = [r for r in csv.DictReader(f) if (r.get("축제명") or "").strip()]
+        data_date = max((r.get("데이터기준일자") or "").strip() for r in rows) if rows else ""
+        version = f"{data_date}:{len(rows)}"
+        self._stat = stat
+        if self.table is not None and self.table.version == version:
+            logger.info(f"축제 CSV가 갱신되었지만 데이터기준일자({data_date})가 같아 재색인을 생략합니다.")
+            return
+        self.table = FestivalTable(rows, version)
+        self.reloads += 1
+        logger.info(f"축제 데이터 적재: {len(rows)}건, 데이터기준일자 {data_date} ({self.path})")
+
+    def warm_load(self) -> None:
+        """시작 시 CSV를 미리 읽어 두어 첫 요청이 적재를 기다리지 않게 합니다."""
+        try:
+            st = os.stat(self.path)
+            self._load((st.st_mtime_ns, st.st_size))
+            self._checked_at = time.monotonic()
+        except OSError as e:
+            logger.warning(f"축제 데이터 사전 적재 실패 (첫 요청 시 다시 시도): {e}")
+
+    async def get_table(self) -> FestivalTable:
+        now = time.monotonic()
+        if self.table is not None and now - self._checked_at < self.check_interval:
+            return self.table
+        self._checked_at = now
+        st = os.stat(self.path)
+        stat = (st.st_mtime_ns, st.st_size)
+        if self.table is None or stat != self._stat:
+            if self._reload is None or self._reload.done():
+                self._reload = asyncio.create_task(asyncio.to_thread(self._load, stat))
+            await asyncio.shield(self._reload)
+        return self.table
+
+    def stats(self) -> Dict[str, Any]:
+        table = self.table
+        return {
+            "rows": len(table) if table else 0,
+            "version": table.version if table else None,
+            "regions": table.regions if table else [],
+            "reloads": self.reloads,
+        }
+
+
+festival_store = FestivalStore()
+
+
+def _parse_query_date(value: Optional[str], default: int) -> int:
+    if not value:
+        return default
+    parsed = parse_ymd(value)
+    if parsed is None:
+        raise ValueError(f"날짜 형식이 올바르지 않습니다: {value} (YYYY-MM-DD)")
+    return parsed
+
+
+@router.get("/festivals")
+async def list_festivals(request: Request, response: Response,
+                         date_from: Optional[str] = Query(None, alias="from"),
+                         date_to: Optional[str] = Query(None, alias="to"),
+                         region: Optional[str] = None, page: int = 1, size: Optional[int] = None):
+    """
+    기간/지역으로 거른 축제 목록의 한 페이지를 반환합니다.
+    - from/to: YYYY-MM-DD (기본: 오늘부터 종료일 제한 없음), 기간과 하루라도 겹치는 축제
+    - region: '서울' 등 시/도 이름 (기본: config의 default_region, 빈 값이면 전체)
+    - page: 1부터, size: 페이지 크기 (기본 config page_size)
+    같은 데이터/같은 조건이면 ETag가 같으므로 If-None-Match로 304를 받을 수 있습니다.
+    """
+    try:
+        today = int(date.today().strftime("%Y%m%d"))
+        date_from = _parse_query_date(date_from, today)
+        date_to = _parse_query_date(date_to, OPEN_END)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    region = normalize_region(festival_store.default_region if region is None else region)
+    size = max(1, min(size or festival_store.page_size, MAX_PAGE_SIZE))
+    page = max(1, page)
+
+    try:
+        table = await festival_store.get_table()
+    except OSError as e:
+        logger.error(f"축제 데이터를 읽을 수 없습니다: {e}")
+        return JSONResponse({"error": "축제 데이터를 불러올 수 없습니다."}, status_code=503)
+
+    etag = '"' + hashlib.sha1(
+        f"{table.version}|{date_from}|{date_to}|{region}|{page}|{size}".encode("utf-8")).hexdigest()[:20] + '"'
+    headers = {"ETag": etag, "Cache-Control": f"max-age={festival_store.max_age}, must-revalidate"}
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+
+    rows = table.query(date_from, date_to, region or None)
+    total = len(rows)
+    page_rows = rows[(page - 1) * size:page * size]
+    response.headers.update(headers)
+    return {
+        "items": [table.record(int(r)) for r in page_rows],
+        "page": page,
+        "size": size,
+        "total": total,
+        "total_pages": max(1, -(-total // size)),
+        "region": region,
+        "from": _iso(date_from),
+        "to": _iso(date_to),
+        "data_version": table.version,
+    }
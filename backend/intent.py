@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Dict, Optional, Sequence, TypeVar
+
+from fastapi import Request
+from loguru import logger
+from openai import AsyncOpenAI
+
+from metrics import record_llm_usage
+
+T = TypeVar("T")
+
+# ---- Config 기본값 ----
+DEFAULT_MODEL = "gpt-4o"
+DEFAULT_MAX_CONCURRENCY = 8     # 동시에 진행할 수 있는 LLM 호출 수
+DEFAULT_TIMEOUT_SEC = 15.0      # 대기열 대기 + 호출 전체에 대한 상한
+DISCONNECT_POLL_SEC = 0.2       # 클라이언트 연결 끊김 확인 주기
+DEFAULT_MAX_TOKENS = 32         # {"purpose": "<라벨>"} 한 줄이면 충분 (한국어 라벨 기준 20토큰 안팎)
+
+
+class ClientDisconnected(Exception):
+    """LLM 응답을 기다리는 동안 클라이언트 연결이 끊겼을 때 발생합니다."""
+    pass
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T],
+                               poll_interval: float = DISCONNECT_POLL_SEC) -> T:
+    """
+    awaitable을 실행하면서 클라이언트 연결 상태를 주기적으로 확인합니다.
+    연결이 끊기면 진행 중인 작업을 취소하고 ClientDisconnected를 던집니다.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def intent_response_format(labels: Sequence[str]) -> Dict[str, Any]:
+    """응답을 {"purpose": <labels 중 하나>}로 제한하는 JSON schema (structured outputs)."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "kiosk_intent",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"purpose": {"type": "string", "enum": list(labels)}},
+                "required": ["purpose"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def prompt_cache_key(system_prompt: str) -> str:
+    """같은 system prefix를 쓰는 요청이 provider의 같은 프롬프트 캐시로 가도록 prefix 해시를 키로 씁니다."""
+    return "kiosk-" + hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class IntentEngine:
+    """
+    AsyncOpenAI 기반 의도 분석 엔진.
+    - 이벤트 루프를 막지 않도록 비동기 클라이언트만 사용합니다.
+    - Semaphore로 동시 호출 수를 제한하여 upstream 폭주를 막습니다.
+    - 대기열 대기 시간을 포함한 전체 호출에 timeout을 적용합니다.
+    - 지침/예시는 매 요청 같은 system 메시지(prefix)로, 발화만 user 메시지로 보내 provider 프롬프트 캐시를 탑니다.
+    - labels를 주면 출력을 JSON schema enum으로 제한하고, max_tokens로 답 길이를 묶습니다.
+    - 호출마다 prompt/cached/completion 토큰 수를 기록합니다. (/intent/stats, /metrics)
+    """
+    def __init__(self, client: AsyncOpenAI, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.client = client
+        self.model = config.get("model", DEFAULT_MODEL)
+        self.timeout = float(config.get("timeout_sec", DEFAULT_TIMEOUT_SEC))
+        self.max_concurrency = int(config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        self.max_tokens = int(config.get("max_tokens", DEFAULT_MAX_TOKENS))
+        self.structured_output = bool(config.get("structured_output", True))
+        self.prompt_cache = bool(config.get("prompt_cache", True))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._in_flight = 0
+        self._formats: Dict[tuple, Dict[str, Any]] = {}
+        self.calls = 0
+        self.tokens = {"prompt": 0, "cached": 0, "completion": 0}
+        self.truncated = 0
+        self.invalid = 0
+
+    @property
+    def in_flight(self) -> int:
+        """현재 upstream에 나가 있는 호출 수."""
+        return self._in_flight
+
+    def _request_options(self, system_prompt: str, labels: Optional[Sequence[str]]) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"max_completion_tokens": self.max_tokens, "temperature": 0}
+        if labels and self.structured_output:
+            key = tuple(labels)
+            if key not in self._formats:
+                self._formats[key] = intent_response_format(labels)
+            options["response_format"] = self._formats[key]
+        if self.prompt_cache:
+            options["prompt_cache_key"] = prompt_cache_key(system_prompt)
+        return options
+
+    def _parse(self, content: str, labels: Optional[Sequence[str]]) -> str:
+        """structured output이면 purpose를 꺼내 라벨 목록에 있는지 확인합니다. (아니면 빈 문자열)"""
+        if not labels or not self.structured_output:
+            return content
+        try:
+            purpose = json.loads(content).get("purpose", "")
+        except (ValueError, AttributeError):
+            purpose = ""
+        if purpose not in labels:
+            self.invalid += 1
+            logger.warning(f"LLM 의도 응답이 라벨 목록에 없습니다: {content!r}")
+            return ""
+        return purpose
+
+    async def _complete(self, system_prompt: str, user_prompt: str, labels: Optional[Sequence[str]]) -> str:
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    timeout=self.timeout,
+                    **self._request_options(system_prompt, labels),
+                )
+            finally:
+                self._in_flight -= 1
+        self.calls += 1
+        for kind, amount in record_llm_usage("intent", self.model, response.usage).items():
+            self.tokens[kind] += amount
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            self.truncated += 1
+            logger.warning(f"LLM 의도 응답이 max_tokens({self.max_tokens})에서 잘렸습니다.")
+        return self._parse((choice.message.content or "").strip(), labels)
+
+    async def complete(self, system_prompt: str, user_prompt: str, labels: Optional[Sequence[str]] = None) -> str:
+        """
+        LLM에 한 번 질의하고 응답 텍스트를 반환합니다.
+        labels를 주면 그중 하나(또는 형식이 어긋나면 빈 문자열)를 반환합니다.
+        시간 초과 시 asyncio.TimeoutError를 그대로 던집니다.
+        """
+        try:
+            return await asyncio.wait_for(self._complete(system_prompt, user_prompt, labels), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"LLM 의도 분석 시간 초과 ({self.timeout}s, model={self.model})")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """호출 수와 누적/평균 토큰. cached는 provider 프롬프트 캐시에서 재사용된 prompt 토큰입니다."""
+        calls = self.calls
+        return {
+            "model": self.model,
+            "calls": calls,
+            "in_flight": self._in_flight,
+            "tokens": dict(self.tokens),
+            "avg_prompt_tokens": round(self.tokens["prompt"] / calls, 1) if calls else None,
+            "avg_completion_tokens": round(self.tokens["completion"] / calls, 1) if calls else None,
+            "prompt_cache_hit_ratio": round(self.tokens["cached"] / self.tokens["prompt"], 3)
+            if self.tokens["prompt"] else None,
+            "truncated": self.truncated,
+            "invalid": self.invalid,
+        }
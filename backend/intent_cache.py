@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from loguru import logger
+
+from keyword_router import normalize_for_match
+from Utility.STT_TTS.correction import CorrectionEngine
+
+# ---- Config 기본값 ----
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL_SEC = 7 * 24 * 3600   # 의도 라벨은 자주 바뀌지 않으므로 넉넉하게
+DEFAULT_WARM_LOAD = 512           # 시작 시 메모리에 올릴 최대 항목 수
+HIT_FLUSH_EVERY = 32              # 누적 hit 카운트를 SQLite에 반영하는 주기
+
+
+class UtteranceNormalizer:
+    """
+    캐시 키용 발화 정규화기.
+    STT 보정 사전을 먼저 적용(leftmost-longest)한 뒤 공백/문장부호를 제거합니다.
+    STT 엔진의 CorrectionEngine을 넘기면 사전 hot reload가 캐시 키에도 그대로 반영됩니다.
+    """
+    def __init__(self, corrections: Union[CorrectionEngine, Dict[str, str], None] = None) -> None:
+        if isinstance(corrections, CorrectionEngine):
+            self.engine = corrections
+        else:
+            self.engine = CorrectionEngine.from_mapping(corrections or {})
+
+    def __call__(self, text: str) -> str:
+        return normalize_for_match(self.engine.apply((text or "").strip()))
+
+
+class IntentCache:
+    """
+    정규화된 발화 → 의도 분석 결과 캐시.
+    - 메모리: LRU + TTL (OrderedDict)
+    - 디스크: SQLite 파일에 write-through, 재시작 후 warm_load()로 복원
+    - get()/put()은 코루틴이며 SQLite 조회/기록은 asyncio.to_thread로 실행되어 이벤트 루프를 막지 않습니다.
+      (메모리 상태는 _lock, DB 커넥션은 _db_lock으로 분리하여 디스크 I/O 중에도 메모리 조회는 기다리지 않음)
+    """
+    def __init__(self, normalizer: UtteranceNormalizer, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.normalize = normalizer
+        self.path: Optional[str] = config.get("path")
+        self.max_entries = int(config.get("max_entries", DEFAULT_MAX_ENTRIES))
+        self.ttl = float(config.get("ttl_sec", DEFAULT_TTL_SEC))
+        self.warm_limit = int(config.get("warm_load", DEFAULT_WARM_LOAD))
+
+        self._mem: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._pending_hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._background: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+
+        if self.path:
+            self._open_db()
+
+    # ---------------- SQLite ----------------
+    def _open_db(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS intent_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._db = db
+        except sqlite3.Error as e:
+            logger.warning(f"의도 캐시 DB를 열 수 없어 메모리 캐시만 사용합니다: {self.path}, 오류: {e}")
+            self._db = None
+
+    def _write_hits(self, hits: Dict[str, int]) -> None:
+        with self._db_lock:
+            if not self._db or not hits:
+                return
+            try:
+                self._db.executemany(
+                    "UPDATE intent_cache SET hits = hits + ? WHERE key = ?",
+                    [(n, k) for k, n in hits.items()],
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"의도 캐시 hit 카운트 반영 실패: {e}")
+
+    def _select(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._db_lock:
+            if not self._db:
+                return None
+            try:
+                return self._db.execute(
+                    "SELECT value, created_at FROM intent_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+
+    def _upsert(self, key: str, value: Dict[str, Any], created_at: float) -> None:
+        with self._db_lock:
+            if not self._db:
+                return
+            try:
+                self._db.execute(
+                    "INSERT INTO intent_cache (key, value, created_at, hits) VALUES (?, ?, ?, 0) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, created_at = excluded.created_at",
+                    (key, json.dumps(value, ensure_ascii=False), created_at),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"의도 캐시 저장 실패: {e}")
+
+    def warm_load(self) -> int:
+        """만료되지 않은 항목을 hit 수가 많은 순서로 메모리에 적재합니다."""
+        if not self._db:
+            return 0
+        now = time.time()
+        with self._db_lock:
+            try:
+                self._db.execute("DELETE FROM intent_cache WHERE created_at < ?", (now - self.ttl,))
+                rows = self._db.execute(
+                    "SELECT key, value, created_at FROM intent_cache ORDER BY hits DESC, created_at DESC LIMIT ?",
+                    (min(self.warm_limit, self.max_entries),),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"의도 캐시 warm-load 실패: {e}")
+                return 0
+        with self._lock:
+            # hit가 적은 항목부터 넣어 LRU 순서상 hot 항목이 가장 최근이 되도록 함
+            for key, value, created_at in reversed(rows):
+                self._mem[key] = (json.loads(value), created_at + self.ttl)
+        logger.info(f"의도 캐시 warm-load 완료: {len(rows)}건")
+        return len(rows)
+
+    # ---------------- 조회/저장 ----------------
+    def key_for(self, text: str) -> str:
+        return self.normalize(text)
+
+    async def get(self, text: str) -> Optional[Dict[str, Any]]:
+        key = self.key_for(text)
+        if not key:
+            return None
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+        if item is None and self._db:
+            # 메모리에서 밀려난 항목은 디스크에서 한 번 더 확인
+            row = await asyncio.to_thread(self._select, key)
+            if row:
+                item = (json.loads(row[0]), row[1] + self.ttl)
+        flush: Dict[str, int] = {}
+        with self._lock:
+            if item is None or item[1] < now:
+                if item is not None:
+                    self._mem.pop(key, None)
+                self.misses += 1
+                return None
+            self._mem[key] = item
+            self._mem.move_to_end(key)
+            self._evict_locked()
+            self.hits += 1
+            self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+            if sum(self._pending_hits.values()) >= HIT_FLUSH_EVERY:
+                flush, self._pending_hits = self._pending_hits, {}
+        if flush:
+            # hit 카운트는 응답을 기다리게 할 이유가 없으므로 백그라운드에서 반영
+            task = asyncio.create_task(asyncio.to_thread(self._write_hits, flush))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return dict(item[0])
+
+    async def put(self, text: str, value: Dict[str, Any]) -> None:
+        key = self.key_for(text)
+        if not key:
+            return
+        now = time.time()
+        with self._lock:
+            self._mem[key] = (dict(value), now + self.ttl)
+            self._mem.move_to_end(key)
+            self._evict_locked()
+        if self._db:
+            await asyncio.to_thread(self._upsert, key, value, now)
+
+    def labeled_examples(self, limit: int = DEFAULT_MAX_ENTRIES) -> List[Tuple[str, str]]:
+        """
+        만료되지 않은 (정규화 발화, LLM 요약) 쌍을 hit 수가 많은 순서로 반환합니다.
+        로컬 의도 분류기가 실제 트래픽으로 다시 학습할 때 사용합니다. (SQLite 조회: 스레드에서 호출)
+        """
+        now = time.time()
+        if self._db:
+            with self._db_lock:
+                try:
+                    rows = self._db.execute(
+                        "SELECT key, value FROM intent_cache WHERE created_at >= ? ORDER BY hits DESC LIMIT ?",
+                        (now - self.ttl, limit),
+                    ).fetchall()
+                    items = [(key, json.loads(value)) for key, value in rows]
+                except sqlite3.Error as e:
+                    logger.warning(f"의도 캐시 예시 조회 실패: {e}")
+                    items = []
+        else:
+            with self._lock:
+                items = [(key, value) for key, (value, expires) in self._mem.items() if expires >= now][-limit:]
+        return [(key, value["summary"]) for key, value in items if value.get("summary")]
+
+    def _evict_locked(self) -> None:
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._mem), "hits": self.hits, "misses": self.misses,
+                    "persistent": self._db is not None}
+
+    def close(self) -> None:
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, {}
+        self._write_hits(pending)
+        with self._db_lock:
+            if self._db:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+import threading
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from keyword_router import normalize_for_match, parse_few_shot_pairs
+
+# ---- Config 기본값 ----
+DEFAULT_THRESHOLD = 0.6         # 확신도가 이 값 이상이면 LLM 호출 생략
+DEFAULT_MIN_SIMILARITY = 0.45   # 최고 코사인 유사도가 이보다 낮으면 학습 분포 밖의 발화로 보고 LLM에 맡김
+                                # ("운전면허증 재발급"→주민등록증 0.44 등 명사 하나만 겹친 분포 밖 발화가 0.25~0.44)
+DEFAULT_TEMPERATURE = 0.05      # 유사도 → 확신도(softmax) 변환 온도 (작을수록 1, 2위 차이를 크게 봄)
+DEFAULT_NGRAM_RANGE = (1, 3)    # 음절 n-gram
+DEFAULT_JAMO_NGRAM = 3          # 자모 n-gram (0이면 끔): "떼고"/"때고" 같은 STT 철자 흔들림 흡수
+DEFAULT_NUM_FEATURES = 1 << 14  # 해시 특징 차원
+DEFAULT_MIN_MARGIN = 0.1        # 1위와 2위 라벨의 코사인 유사도 차이가 이보다 작으면 LLM에 맡김
+DEFAULT_FILLER_WEIGHT = 0.2     # 아래 상투적 동사/어미 조각의 특징 가중치 (라벨을 구분하는 명사에 비중을 둠)
+# 민원 종류와 무관하게 어느 발화에나 붙는 요청 표현. 이 표현만 겹쳐서 다른 라벨로 확정되는 것을 막습니다.
+FILLER_PHRASES = (
+    "하고 싶어요", "하고 싶어", "하고싶어", "싶어요", "싶어", "싶습니다",
+    "떼고 싶어", "때고 싶어요", "떼 주세요", "떼줘", "뽑아줘", "뽑아 주세요", "뽑을래", "출력",
+    "해주세요", "해 주세요", "주세요", "해줘", "알려줘", "알려 주세요", "필요합니다", "필요해요",
+    "받아야 해", "받고 싶어요", "하려고요", "할래요", "있어요", "인가요", "어디서", "어떻게",
+)
+
+
+@dataclass
+class Prediction:
+    label: Optional[str]
+    confidence: float               # softmax 확률 (0~1)
+    similarity: float               # 선택된 라벨 중심과의 코사인 유사도
+    accepted: bool = False          # LLM 없이 확정해도 되는지
+    candidates: List[Tuple[str, float]] = field(default_factory=list)  # 상위 라벨 (라벨, 확신도)
+
+
+class CharNgramFeaturizer:
+    """
+    한국어 발화를 해시된 문자 n-gram 특징으로 바꿉니다.
+    - 음절 n-gram: 정규화(공백/문장부호 제거)한 문자열의 1~3글자 조각 (양 끝 경계 표시 포함)
+    - 자모 n-gram: NFD로 분해한 초성/중성/종성 조각 (받침/모음 하나 차이의 STT 오인식에 강함)
+    해시는 프로세스마다 값이 바뀌는 hash() 대신 crc32를 사용합니다.
+    """
+    def __init__(self, ngram_range: Sequence[int] = DEFAULT_NGRAM_RANGE, jamo_ngram: int = DEFAULT_JAMO_NGRAM,
+                 num_features: int = DEFAULT_NUM_FEATURES) -> None:
+        self.ngram_min, self.ngram_max = int(ngram_range[0]), int(ngram_range[1])
+        self.jamo_ngram = int(jamo_ngram)
+        self.num_features = int(num_features)
+
+    def _grams(self, text: str, pad: bool = True) -> Iterable[str]:
+        if not text:
+            # 정규화 후 빈 입력("?!" 등)은 경계 표시만 남으므로 특징 없음으로 처리
+            return
+        padded = f"<{text}>" if pad else text
+        for n in range(self.ngram_min, self.ngram_max + 1):
+            for i in range(len(padded) - n + 1):
+                yield padded[i:i + n]
+        if self.jamo_ngram > 0:
+            jamo = unicodedata.normalize("NFD", text)
+            n = self.jamo_ngram
+            for i in range(len(jamo) - n + 1):
+                yield "j" + jamo[i:i + n]
+
+    def _index(self, gram: str) -> int:
+        return zlib.crc32(gram.encode("utf-8")) % self.num_features
+
+    def indices(self, phrases: Iterable[str]) -> np.ndarray:
+        """구문 안쪽에서 나오는 n-gram의 특징 인덱스 (경계 표시 제외)."""
+        found = {self._index(g) for phrase in phrases for g in self._grams(normalize_for_match(phrase), pad=False)}
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def __call__(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(특징 인덱스, 로그 스케일 빈도) 희소 벡터."""
+        counts: Dict[int, int] = {}
+        for gram in self._grams(normalize_for_match(text)):
+            idx = self._index(gram)
+            counts[idx] = counts.get(idx, 0) + 1
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return idx, 1.0 + np.log(tf)
+
+
+class IntentClassifier:
+    """
+    문자 n-gram TF-IDF + nearest-centroid 의도 분류기.
+    - 학습: 라벨별 예시 벡터(L2 정규화) 합을 중심으로 삼습니다. 예시는 LLM_PROMPT few-shot, 키워드 사전,
+      그리고 의도 캐시에 쌓인 LLM 응답(실제 트래픽)에서 가져옵니다.
+    - 예측: 중심 행렬에서 입력 특징 열만 골라 곱하므로 CPU에서 수십 µs 안에 끝납니다.
+    - 확신도가 threshold 미만이거나, 유사도가 min_similarity 미만이거나, 1·2위 유사도 차이가 min_margin 미만이면
+      accepted=False → LLM으로 넘깁니다. (softmax 확신도만으로는 근소한 차이도 "확신"으로 보일 수 있음)
+    - "하고 싶어요", "떼 주세요" 같은 상투 표현의 n-gram은 filler_weight로 낮춰, 요청 표현만 겹친 발화가
+      엉뚱한 라벨로 확정되지 않게 합니다.
+    - LLM이 알려진 라벨로 답하면 learn()으로 해당 라벨 중심에 바로 반영합니다.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.enabled = bool(config.get("enabled", True))
+        self.threshold = float(config.get("threshold", DEFAULT_THRESHOLD))
+        self.min_similarity = float(config.get("min_similarity", DEFAULT_MIN_SIMILARITY))
+        self.min_margin = float(config.get("min_margin", DEFAULT_MIN_MARGIN))
+        self.temperature = float(config.get("temperature", DEFAULT_TEMPERATURE))
+        self.learn_online = bool(config.get("learn_online", True))
+        self.featurize = CharNgramFeaturizer(
+            config.get("ngram_range", DEFAULT_NGRAM_RANGE),
+            config.get("jamo_ngram", DEFAULT_JAMO_NGRAM),
+            config.get("num_features", DEFAULT_NUM_FEATURES),
+        )
+        dim = self.featurize.num_features
+        self._feature_weights = np.ones(dim, dtype=np.float32)
+        filler = self.featurize.indices(config.get("filler_phrases", FILLER_PHRASES))
+        self._feature_weights[filler] = float(config.get("filler_weight", DEFAULT_FILLER_WEIGHT))
+        self.labels: List[str] = []
+        self._label_index: Dict[str, int] = {}
+        self._idf = np.ones(dim, dtype=np.float32)
+        self._sums = np.zeros((0, dim), dtype=np.float32)
+        self._centroids = np.zeros((0, dim), dtype=np.float32)
+        self._base_examples: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self.num_examples = 0
+        self.accepted = 0
+        self.fallbacks = 0
+        self.learned = 0
+
+    @classmethod
+    def from_tables(cls, keywords: Dict[str, str], prompt: str = "",
+                    config: Optional[Dict[str, Any]] = None) -> "IntentClassifier":
+        """키워드 사전과 프롬프트 few-shot 예시('알 수 없음' 포함)로 학습한 분류기를 생성합니다."""
+        classifier = cls(config)
+        classifier._base_examples = list(keywords.items()) + parse_few_shot_pairs(prompt)
+        return classifier.fit(classifier._base_examples)
+
+    # ---------------- 학습 ----------------
+    def _vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        idx, tf = self.featurize(text)
+        values = tf * self._idf[idx]
+        norm = float(np.linalg.norm(values))
+        return idx, (values / norm if norm > 0 else values)
+
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "IntentClassifier":
+        """(발화, 라벨) 예시로 IDF와 라벨 중심을 다시 계산합니다. 정규화 후 같은 예시는 한 번만 씁니다."""
+        seen, unique = set(), []
+        for text, label in examples:
+            key = (normalize_for_match(text), label)
+            if key[0] and label and key not in seen:
+                seen.add(key)
+                unique.append((text, label))
+
+        dim = self.featurize.num_features
+        features = [self.featurize(text) for text, _ in unique]
+        df = np.zeros(dim, dtype=np.float32)
+        for idx, _ in features:
+            df[idx] += 1
+        idf = (np.log((1 + len(unique)) / (1 + df)) + 1).astype(np.float32) * self._feature_weights
+
+        labels = list(dict.fromkeys(label for _, label in unique))
+        label_index = {label: i for i, label in enumerate(labels)}
+        sums = np.zeros((len(labels), dim), dtype=np.float32)
+        for (idx, tf), (_, label) in zip(features, unique):
+            values = tf * idf[idx]
+            norm = float(np.linalg.norm(values))
+            if norm > 0:
+                sums[label_index[label], idx] += values / norm
+
+        with self._lock:
+            self.labels, self._label_index, self._idf, self._sums = labels, label_index, idf, sums
+            self._centroids = self._normalized(sums)
+            self.num_examples = len(unique)
+        logger.info(f"의도 분류기 학습 완료: 예시 {len(unique)}개, 라벨 {len(labels)}개")
+        return self
+
+    def refit(self, extra: Iterable[Tuple[str, str]]) -> "IntentClassifier":
+        """기본 예시(키워드/few-shot)에 추가 예시(로그된 트래픽)를 더해 다시 학습합니다. 모르는 라벨은 버립니다."""
+        known = {label for _, label in self._base_examples}
+        return self.fit(self._base_examples + [(t, label) for t, label in extra if label in known])
+
+    @staticmethod
+    def _normalized(sums: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        return sums / np.maximum(norms, 1e-12)
+
+    def learn(self, text: str, label: str) -> bool:
+        """LLM이 확정한 (발화, 라벨)을 해당 라벨 중심에 더합니다. 학습된 라벨이 아니면 무시합니다."""
+        if not self.learn_online:
+            return False
+        with self._lock:
+            row = self._label_index.get(label)
+            if row is None:
+                return False
+            idx, values = self._vector(text)
+            if not len(idx):
+                return False
+            self._sums[row, idx] += values
+            self._centroids[row] = self._normalized(self._sums[row:row + 1])[0]
+            self.learned += 1
+        return True
+
+    # ---------------- 예측 ----------------
+    def predict(self, text: str) -> Prediction:
+        idx, values = self._vector(text)
+        with self._lock:
+            if not self.labels or not len(idx):
+                self.fallbacks += 1
+                return Prediction(label=None, confidence=0.0, similarity=0.0)
+            # 중심 행렬에서 입력에 나타난 특징 열만 골라 곱함 (라벨 수 × 특징 수)
+            sims = self._centroids[:, idx] @ values
+            logits = (sims - sims.max()) / self.temperature
+            probs = np.exp(logits)
+            probs /= probs.sum()
+            order = np.argsort(-probs)[:3]
+            top = int(order[0])
+            confidence, similarity = float(probs[top]), float(sims[top])
+            margin = similarity - float(sims[order[1]]) if len(order) > 1 else similarity
+            accepted = (confidence >= self.threshold and similarity >= self.min_similarity
+                        and margin >= self.min_margin)
+            if accepted:
+                self.accepted += 1
+            else:
+                self.fallbacks += 1
+            return Prediction(
+                label=self.labels[top], confidence=confidence, similarity=similarity, accepted=accepted,
+                candidates=[(self.labels[int(i)], round(float(probs[i]), 3)) for i in order],
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """분류기 카운터. accepted는 LLM 호출 없이 응답한 건수입니다."""
+        with self._lock:
+            total = self.accepted + self.fallbacks
+            return {
+                "enabled": self.enabled,
+                "labels": len(self.labels),
+                "examples": self.num_examples,
+                "learned": self.learned,
+                "threshold": self.threshold,
+                "min_similarity": self.min_similarity,
+                "min_margin": self.min_margin,
+                "accepted": self.accepted,
+                "fallbacks": self.fallbacks,
+                "accept_rate": round(self.accepted / total, 3) if total else None,
+            }
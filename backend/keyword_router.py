@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ---- 정규화 ----
+# 공백/문장부호 차이("오늘 날씨" vs "오늘날씨", "비 오나?" vs "비오나")를 흡수하기 위해
+# 패턴과 입력 모두 같은 규칙으로 압축한 뒤 매칭합니다.
+_STRIP_RE = re.compile(r"[\s\.,!?~'\"“”‘’·…\-_/()\[\]]+")
+
+# LLM_PROMPT의 few-shot 예시 줄: - "등본 뽑아줘" → "주민등록등본 발급 요청"
+_FEW_SHOT_RE = re.compile(r'^\s*-\s*"(?P<utterance>[^"]+)"\s*→\s*"(?P<label>[^"]+)"\s*$', re.MULTILINE)
+
+UNKNOWN_LABEL = "민원 목적을 알 수 없음"
+
+# 같은 길이로 겹칠 때 어느 쪽을 믿을지 정하는 우선순위 (클수록 우선)
+PRIORITY_KEYWORD = 1
+PRIORITY_EXAMPLE = 2
+
+
+def normalize_for_match(text: str) -> str:
+    """공백과 문장부호를 제거하고 소문자로 맞춥니다."""
+    return _STRIP_RE.sub("", text or "").lower()
+
+
+def parse_few_shot_pairs(prompt: str) -> List[Tuple[str, str]]:
+    """프롬프트 본문에서 (예시 발화, 목적 라벨) 쌍을 추출합니다."""
+    return [(m.group("utterance"), m.group("label")) for m in _FEW_SHOT_RE.finditer(prompt or "")]
+
+
+@dataclass(frozen=True)
+class Pattern:
+    text: str        # 원본 패턴 (로그/응답용)
+    key: str         # 정규화된 패턴
+    label: str
+    priority: int
+
+
+@dataclass
+class RouteResult:
+    label: Optional[str]            # 최종 선택된 목적 (없으면 None)
+    confident: bool                 # 단일 라벨로만 매칭되었는지 여부
+    keyword: Optional[str] = None   # 선택 근거가 된 패턴 원문
+    candidates: List[str] = field(default_factory=list)  # 매칭된 서로 다른 라벨들
+
+
+class AhoCorasick:
+    """
+    다중 패턴 문자열 매칭 오토마톤.
+    한 번 빌드해두면 입력 길이에 비례하는 시간으로 모든 패턴 출현 위치를 찾습니다.
+    """
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._lengths: List[int] = []
+
+        for idx, pat in enumerate(patterns):
+            self._lengths.append(len(pat))
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(idx)
+
+        # BFS로 failure link 구성 + 출력 병합
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """(시작, 끝(exclusive), 패턴 인덱스) 목록을 반환합니다."""
+        hits: List[Tuple[int, int, int]] = []
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for idx in self._out[node]:
+                hits.append((pos + 1 - self._lengths[idx], pos + 1, idx))
+        return hits
+
+
+class KeywordRouter:
+    """
+    민원 키워드 사전 + few-shot 예시를 하나의 오토마톤으로 컴파일한 라우터.
+    - 겹치는 매칭은 가장 긴 패턴을 우선하고, 길이가 같으면 priority로 결정합니다.
+    - 살아남은 매칭이 모두 같은 라벨이면 confident=True → LLM 호출을 생략합니다.
+    - hit/ambiguous/miss 카운터로 절약된 upstream 호출 수를 확인할 수 있습니다.
+    """
+    def __init__(self, patterns: List[Pattern]) -> None:
+        # 같은 정규화 키가 여러 번 등록되면 우선순위가 높은 쪽만 남깁니다.
+        dedup: Dict[str, Pattern] = {}
+        for p in patterns:
+            if not p.key:
+                continue
+            prev = dedup.get(p.key)
+            if prev is None or p.priority > prev.priority:
+                dedup[p.key] = p
+        self.patterns: List[Pattern] = list(dedup.values())
+        self._automaton = AhoCorasick(p.key for p in self.patterns)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._ambiguous = 0
+        self._misses = 0
+
+    @classmethod
+    def from_tables(cls, keywords: Dict[str, str], prompt: str = "") -> "KeywordRouter":
+        """키워드 사전과 프롬프트 few-shot 예시로 라우터를 생성합니다."""
+        patterns = [Pattern(k, normalize_for_match(k), v, PRIORITY_KEYWORD) for k, v in keywords.items()]
+        for utterance, label in parse_few_shot_pairs(prompt):
+            # '알 수 없음' 예시는 부분 문자열로 확정하기엔 근거가 약하므로 LLM에 맡깁니다.
+            if label == UNKNOWN_LABEL:
+                continue
+            patterns.append(Pattern(utterance, normalize_for_match(utterance), label, PRIORITY_EXAMPLE))
+        return cls(patterns)
+
+    def _select(self, text: str) -> List[Pattern]:
+        hits = self._automaton.find_all(normalize_for_match(text))
+        # 길이 내림차순 → 우선순위 내림차순 → 앞쪽 위치 순으로 겹치지 않게 선택
+        hits.sort(key=lambda h: (-(h[1] - h[0]), -self.patterns[h[2]].priority, h[0]))
+        taken: List[Tuple[int, int]] = []
+        selected: List[Pattern] = []
+        for start, end, idx in hits:
+            if any(start < e and s < end for s, e in taken):
+                continue
+            taken.append((start, end))
+            selected.append(self.patterns[idx])
+        return selected
+
+    def route(self, text: str) -> RouteResult:
+        selected = self._select(text)
+        if not selected:
+            with self._lock:
+                self._misses += 1
+            return RouteResult(label=None, confident=False)
+
+        labels: List[str] = []
+        for p in selected:
+            if p.label not in labels:
+                labels.append(p.label)
+
+        # 라벨별 근거 점수: (최대 priority, 매칭 길이 합)
+        def score(label: str) -> Tuple[int, int]:
+            ps = [p for p in selected if p.label == label]
+            return max(p.priority for p in ps), sum(len(p.key) for p in ps)
+
+        best_label = max(labels, key=score)
+        best = next(p for p in selected if p.label == best_label)
+        confident = len(labels) == 1
+        with self._lock:
+            if confident:
+                self._hits += 1
+            else:
+                self._ambiguous += 1
+        return RouteResult(label=best_label, confident=confident, keyword=best.text, candidates=labels)
+
+    def stats(self) -> Dict[str, int]:
+        """라우팅 카운터. hits는 LLM 호출 없이 응답한 건수입니다."""
+        with self._lock:
+            total = self._hits + self._ambiguous + self._misses
+            return {
+                "patterns": len(self.patterns),
+                "total": total,
+                "hits": self._hits,
+                "ambiguous": self._ambiguous,
+                "misses": self._misses,
+                "llm_calls_saved": self._hits,
+            }
@@ -0,0 +1,272 @@
+# 오프라인 부하 테스트용 가짜 upstream 서버 (OpenAI + OpenWeatherMap)
+# 사용법: python fake_upstream.py [--port 9100] [--latency chat=400:1500] [--errors chat=0.02:429] [--hang speech=0.01]
+#   --latency 경로=중앙값ms[:p99ms]   로그정규 분포 지연 (p99를 생략하면 고정 지연)
+#   --errors  경로=비율[:상태코드]      지정한 비율로 에러 응답 (기본 500, 429면 Retry-After 포함)
+#   --hang    경로=비율                 지정한 비율로 --hang-sec 동안 응답하지 않음 (upstream 정지/타임아웃 재현)
+#   경로: chat, responses, transcriptions, speech, weather (all = 전체)
+# 실행 중 변경: curl -X POST localhost:9100/_fake/config -d '{"chat": {"error_rate": 0.1}}'
+#             GET /_fake/config, GET /_fake/stats, POST /_fake/reset
+# 백엔드를 가짜 upstream으로 향하게 하려면 (OpenAI SDK는 OPENAI_BASE_URL을 그대로 사용):
+#   OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENWEATHER_BASE_URL=http://127.0.0.1:9100 \
+#   OPENAI_API_KEY=fake OPENWEATHER_API_KEY=fake uvicorn main:app --port 8000
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+ROUTES = ("chat", "responses", "transcriptions", "speech", "weather")
+# 실제 API와 비슷한 크기의 기본 지연 (중앙값 ms, p99 ms)
+DEFAULT_LATENCY = {
+    "chat": (450, 1500),
+    "responses": (900, 2500),
+    "transcriptions": (700, 2000),
+    "speech": (350, 1200),   # 첫 바이트까지
+    "weather": (120, 400),
+}
+SPEECH_MS_PER_CHAR = 4.0       # 텍스트 길이에 비례한 스트리밍 시간
+SPEECH_BYTES_PER_CHAR = 600    # 대략 24kbps MP3, 글자당 0.2초 발화 기준
+SPEECH_CHUNK_SIZE = 4096
+# ID3 태그로 시작하는 가짜 MP3 (백엔드의 형식 판별/캐시 조건을 통과하도록)
+MP3_HEADER = b"ID3\x04\x00\x00\x00\x00\x00\x00"
+
+
+def _route_config(median_ms: float, p99_ms: float) -> Dict[str, Any]:
+    return {"median_ms": median_ms, "p99_ms": p99_ms, "error_rate": 0.0, "error_status": 500, "hang_rate": 0.0}
+
+
+class FaultInjector:
+    """경로별 지연/에러/정지 설정과 호출 통계."""
+    def __init__(self, hang_sec: float = 60.0, seed: int | None = None) -> None:
+        self.hang_sec = hang_sec
+        self.rng = random.Random(seed)
+        self.seen_prefixes = set()
+        self.routes: Dict[str, Dict[str, Any]] = {r: _route_config(*DEFAULT_LATENCY[r]) for r in ROUTES}
+        self.reset()
+
+    def reset(self) -> None:
+        self.stats: Dict[str, Dict[str, int]] = {r: {} for r in ROUTES}
+        self.in_flight = 0
+
+    def update(self, patch: Dict[str, Dict[str, Any]]) -> None:
+        for name, values in patch.items():
+            targets = ROUTES if name == "all" else (name,)
+            for route in targets:
+                if route not in self.routes:
+                    raise KeyError(route)
+                self.routes[route].update(values)
+
+    def sample_delay(self, route: str) -> float:
+        cfg = self.routes[route]
+        median = max(0.0, float(cfg["median_ms"]))
+        p99 = max(median, float(cfg.get("p99_ms") or median))
+        if median == 0 or p99 == median:
+            return median / 1000
+        # 로그정규: p99 = median * exp(2.326 * sigma)
+        sigma = math.log(p99 / median) / 2.326
+        return median * math.exp(self.rng.gauss(0.0, sigma)) / 1000
+
+    def _count(self, route: str, outcome: str) -> None:
+        self.stats[route][outcome] = self.stats[route].get(outcome, 0) + 1
+
+    async def inject(self, route: str) -> Response | None:
+        """지연을 적용하고, 에러를 주입해야 하면 에러 응답을 반환합니다."""
+        cfg = self.routes[route]
+        if self.rng.random() < float(cfg["hang_rate"]):
+            self._count(route, "hang")
+            await asyncio.sleep(self.hang_sec)
+        await asyncio.sleep(self.sample_delay(route))
+        if self.rng.random() < float(cfg["error_rate"]):
+            status = int(cfg["error_status"])
+            self._count(route, str(status))
+            headers = {"Retry-After": "1"} if status == 429 else None
+            body = {"error": {"message": f"injected {status}", "type": "fake_upstream", "code": status}}
+            return JSONResponse(body, status_code=status, headers=headers)
+        self._count(route, "200")
+        return None
+
+
+def create_app(faults: FaultInjector) -> FastAPI:
+    app = FastAPI(title="fake upstream")
+
+    @app.middleware("http")
+    async def track_in_flight(request: Request, call_next):
+        faults.in_flight += 1
+        try:
+            return await call_next(request)
+        finally:
+            faults.in_flight -= 1
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if (error := await faults.inject("chat")) is not None:
+            return error
+        messages = body.get("messages", [])
+        user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        system = "".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+        content = "민원 안내 요청"
+        schema = ((body.get("response_format") or {}).get("json_schema") or {}).get("schema") or {}
+        enum = ((schema.get("properties") or {}).get("purpose") or {}).get("enum")
+        if enum:
+            # structured output: 발화와 겹치는 글자가 가장 많은 라벨
+            content = json.dumps({"purpose": max(enum, key=lambda label: len(set(label) & set(str(user))))},
+                                 ensure_ascii=False)
+        prompt_tokens = (len(system) + len(str(user))) // 2 + 8
+        # provider 프롬프트 캐시 흉내: 이미 본 system prefix는 1024토큰 이상일 때 128토큰 단위로 cached 처리
+        prefix_tokens = len(system) // 2
+        cached = prefix_tokens // 128 * 128 if prefix_tokens >= 1024 and system in faults.seen_prefixes else 0
+        faults.seen_prefixes.add(system)
+        completion_tokens = min(len(content) // 2 + 1, int(body.get("max_completion_tokens") or 1 << 30))
+        return {
+            "id": f"chatcmpl-fake{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens,
+                      "prompt_tokens_details": {"cached_tokens": cached}},
+        }
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        if (error := await faults.inject("responses")) is not None:
+            return error
+        text = "현재 기온은 20도로 맑고 바람이 약합니다.\n가벼운 겉옷을 챙기시면 좋겠습니다."
+        return {
+            "id": f"resp_fake{int(time.time() * 1000)}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": body.get("model", "fake"),
+            "output": [{"type": "message", "id": "msg_fake", "status": "completed", "role": "assistant",
+                        "content": [{"type": "output_text", "text": text, "annotations": []}]}],
+            "usage": {"input_tokens": len(str(body.get("instructions", "")) + str(body.get("input", ""))) // 2,
+                      "output_tokens": len(text) // 2, "total_tokens": 0,
+                      "input_tokens_details": {"cached_tokens": 0}, "output_tokens_details": {"reasoning_tokens": 0}},
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+        }
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        # multipart 본문은 해석하지 않음 (업로드 크기만큼 읽기만 함)
+        await request.body()
+        if (error := await faults.inject("transcriptions")) is not None:
+            return error
+        return {"text": "주민등록등본 발급하고 싶어요"}
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        body = await request.json()
+        if (error := await faults.inject("speech")) is not None:
+            return error
+        text = str(body.get("input", ""))
+        total = len(MP3_HEADER) + SPEECH_BYTES_PER_CHAR * max(1, len(text))
+        chunks = max(1, -(-total // SPEECH_CHUNK_SIZE))
+        interval = SPEECH_MS_PER_CHAR * len(text) / 1000 / chunks
+
+        async def stream():
+            # 첫 조각은 바로, 나머지는 텍스트 길이에 비례해 나눠서 (실제 TTS 스트리밍처럼)
+            sent = 0
+            for i in range(chunks):
+                if i:
+                    await asyncio.sleep(interval)
+                size = min(SPEECH_CHUNK_SIZE, total - sent)
+                chunk = (MP3_HEADER + b"\xff" * (size - len(MP3_HEADER))) if i == 0 else b"\xff" * size
+                sent += size
+                yield chunk
+
+        return StreamingResponse(stream(), media_type="audio/mpeg")
+
+    @app.get("/data/2.5/weather")
+    async def weather(q: str = "Seoul", appid: str = "", units: str = "metric", lang: str = "kr"):
+        if (error := await faults.inject("weather")) is not None:
+            return error
+        now = int(time.time())
+        return {
+            "coord": {"lon": 126.9778, "lat": 37.5683},
+            "weather": [{"id": 800, "main": "Clear", "description": "맑음", "icon": "01d"}],
+            "main": {"temp": 20.3, "feels_like": 19.8, "temp_min": 18.0, "temp_max": 22.1,
+                     "pressure": 1015, "humidity": 45},
+            "visibility": 10000,
+            "wind": {"speed": 2.1, "deg": 270},
+            "clouds": {"all": 0},
+            "dt": now,
+            "sys": {"country": "KR", "sunrise": now - 20000, "sunset": now + 20000},
+            "timezone": 32400,
+            "name": q,
+            "cod": 200,
+        }
+
+    @app.head("/")
+    @app.head("/v1/")
+    async def ping():
+        # 백엔드 keep-alive ping 대상
+        return Response()
+
+    @app.get("/_fake/config")
+    async def get_config():
+        return {"hang_sec": faults.hang_sec, "routes": faults.routes}
+
+    @app.post("/_fake/config")
+    async def set_config(request: Request):
+        try:
+            faults.update(await request.json())
+        except KeyError as e:
+            return JSONResponse({"error": f"unknown route: {e}", "routes": list(ROUTES)}, status_code=400)
+        return {"hang_sec": faults.hang_sec, "routes": faults.routes}
+
+    @app.get("/_fake/stats")
+    async def get_stats():
+        return {"in_flight": faults.in_flight, "routes": faults.stats}
+
+    @app.post("/_fake/reset")
+    async def reset_stats():
+        faults.reset()
+        return {"ok": True}
+
+    return app
+
+
+def _parse_specs(specs, parse) -> Dict[str, Dict[str, Any]]:
+    patch: Dict[str, Dict[str, Any]] = {}
+    for spec in specs or []:
+        name, _, value = spec.partition("=")
+        patch.setdefault(name.strip(), {}).update(parse(value.split(":")))
+    return patch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 부하 테스트용 가짜 OpenAI/OpenWeatherMap 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", action="append", help="경로=중앙값ms[:p99ms] (예: chat=400:1500, all=0)")
+    parser.add_argument("--errors", action="append", help="경로=비율[:상태코드] (예: speech=0.05:429)")
+    parser.add_argument("--hang", action="append", help="경로=비율 (예: transcriptions=0.01)")
+    parser.add_argument("--hang-sec", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=None, help="지연/에러 난수 시드 (재현용)")
+    args = parser.parse_args()
+
+    faults = FaultInjector(hang_sec=args.hang_sec, seed=args.seed)
+    faults.update(_parse_specs(args.latency, lambda v: {
+        "median_ms": float(v[0]), "p99_ms": float(v[1]) if len(v) > 1 else float(v[0])}))
+    faults.update(_parse_specs(args.errors, lambda v: {
+        "error_rate": float(v[0]), **({"error_status": int(v[1])} if len(v) > 1 else {})}))
+    faults.update(_parse_specs(args.hang, lambda v: {"hang_rate": float(v[0])}))
+    print(json.dumps(faults.routes, ensure_ascii=False, indent=2))
+    uvicorn.run(create_app(faults), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# 백엔드 비동기 부하 생성기: 목표 RPS로 /receive-text/, /api/stt, /api/tts, /weather/ 를 호출하고
+# 엔드포인트별 처리량과 지연 p50/p95/p99를 보고합니다.
+# 사용법: python loadgen.py [--url http://127.0.0.1:8000] [--rps 10] [--duration 30] [--mix text=4,stt=1,tts=2,weather=1]
+# 과금 없이 돌리려면 먼저 fake_upstream.py를 띄우고 백엔드를 그쪽으로 향하게 하세요. (fake_upstream.py 상단 참고)
+# 측정 방식:
+#   - 개방형(open-loop) 부하: 도착 간격은 포아송 분포, 응답을 기다리지 않고 예정 시각에 요청을 보냅니다.
+#   - 지연은 "예정 시각"부터 측정하므로, 서버나 생성기가 밀리면 대기 시간까지 지연에 포함됩니다. (coordinated omission 방지)
+#   - TTFB는 응답 헤더 도착까지, 지연은 본문 수신 완료까지입니다.
+#   - 응답의 Server-Timing 헤더를 모아 엔드포인트별 단계(stt, intent_llm, tts ...) 평균 시간도 보여줍니다.
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+import wave
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+ENDPOINTS = ("text", "stt", "tts", "weather")
+DEFAULT_MIX = "text=4,stt=1,tts=2,weather=1"
+# 키오스크에서 실제로 들어오는 발화와 비슷한 문장 (키워드 확정/모호한 문장 섞음)
+UTTERANCES = [
+    "주민등록등본 발급하고 싶어요",
+    "등본 뽑아줘",
+    "오늘 날씨 어때?",
+    "가족관계증명서 떼려면 어떻게 해요",
+    "근처에 축제 하는 거 있어?",
+    "서류 좀 떼러 왔는데요",
+    "인감증명서랑 초본 둘 다 필요해요",
+    "음 그냥 좀 물어볼게 있어서요",
+]
+TTS_TEXTS = [
+    "무엇을 도와드릴까요?",
+    "주민등록등본 발급 화면으로 이동합니다.",
+    "신분증을 리더기에 올려 주세요.",
+    "오늘 서울은 맑고 기온은 20도입니다.",
+]
+LAG_WARN_SEC = 0.01  # 예정 시각보다 이만큼 늦게 보낸 요청은 생성기 지연으로 보고
+CITIES = ["Seoul", "Busan", "Incheon", "Daegu", "Gwangju", "Daejeon"]
+
+
+@dataclass
+class Sample:
+    latency: float
+    ttfb: float
+    status: str          # HTTP 상태 코드 또는 예외 이름
+    ok: bool
+    stages: Dict[str, float] = field(default_factory=dict)
+
+
+def make_wav(seconds: float = 1.5, seed: int = 0, sample_rate: int = 16000) -> bytes:
+    """
+    /api/stt 업로드용 16kHz mono WAV: 앞뒤 0.3초 약한 잡음 + 음성 대역 배음 신호.
+    (품질 게이트는 통과하지만 실제 STT 인식 결과는 의미 없음, 실제 녹음은 --wav로 지정)
+    """
+    rng = np.random.default_rng(seed)
+    pad, n = int(0.3 * sample_rate), int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    phase = 2 * np.pi * np.cumsum(rng.uniform(110, 220) * (1 + 0.08 * np.sin(2 * np.pi * 1.5 * t))) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 9)) * (0.55 + 0.45 * np.sin(2 * np.pi * 4 * t))
+    voice *= 3277 / (np.sqrt(np.mean(voice ** 2)) + 1e-9)  # 약 -20 dBFS
+    samples = np.concatenate([np.zeros(pad), voice, np.zeros(pad)]) + 33 * rng.standard_normal(n + 2 * pad)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.clip(samples, -32768, 32767).astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """"stt;dur=812.0, total;dur=905.3" → {"stt": 812.0, "total": 905.3} (ms, 같은 단계는 합산)"""
+    stages: Dict[str, float] = {}
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if name and key == "dur":
+                try:
+                    stages[name] = stages.get(name, 0.0) + float(value)
+                except ValueError:
+                    pass
+    return stages
+
+
+class LoadGenerator:
+    def __init__(self, args) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.mix = self._parse_mix(args.mix)
+        if args.wav:
+            with open(args.wav, "rb") as f:
+                self.wav_pool = [f.read()]
+        else:
+            self.wav_pool = [make_wav(seconds=1.0 + 0.5 * i, seed=i) for i in range(3)]
+        self.samples: Dict[str, List[Sample]] = defaultdict(list)
+        self.lag: List[float] = []
+        self.seq = 0
+
+    @staticmethod
+    def _parse_mix(spec: str) -> Dict[str, float]:
+        mix = {}
+        for part in spec.split(","):
+            name, _, weight = part.partition("=")
+            name = name.strip()
+            if name not in ENDPOINTS:
+                raise SystemExit(f"알 수 없는 엔드포인트: {name} (사용 가능: {', '.join(ENDPOINTS)})")
+            mix[name] = float(weight or 1)
+        return {k: v for k, v in mix.items() if v > 0}
+
+    def _text(self, pool: List[str]) -> str:
+        """unique 비율만큼은 캐시에 걸리지 않도록 매번 다른 문장을 만듭니다."""
+        text = self.rng.choice(pool)
+        if self.rng.random() < self.args.unique:
+            self.seq += 1
+            text = f"{text} {self.seq}번"
+        return text
+
+    def _request(self, endpoint: str) -> Dict:
+        if endpoint == "text":
+            return {"method": "POST", "url": "/receive-text/", "json": {"text": self._text(UTTERANCES)}}
+        if endpoint == "stt":
+            wav = self.rng.choice(self.wav_pool)
+            return {"method": "POST", "url": "/api/stt", "files": {"file": ("utterance.wav", wav, "audio/wav")}}
+        if endpoint == "tts":
+            return {"method": "POST", "url": "/api/tts",
+                    "data": {"text": self._text(TTS_TEXTS), "stream": str(self.args.tts_stream).lower()}}
+        return {"method": "POST", "url": "/weather/",
+                "json": {"city": self.rng.choice(CITIES), "defer_summary": self.args.defer_summary}}
+
+    @staticmethod
+    def _is_ok(endpoint: str, response: httpx.Response, body: bytes) -> bool:
+        """HTTP 200이어도 본문에 오류를 담아 보내는 엔드포인트가 있어 내용까지 확인합니다."""
+        if response.status_code != 200:
+            return False
+        if endpoint == "tts":
+            return response.headers.get("content-type", "").startswith("audio/") and len(body) > 0
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return False
+        if endpoint == "text":
+            return isinstance(data, dict) and data.get("source") != "error"
+        # /weather/의 (본문, 상태코드) 튜플 오류 응답은 JSON 배열로 직렬화됨
+        return isinstance(data, dict) and "error" not in data
+
+    async def _fire(self, client: httpx.AsyncClient, endpoint: str, scheduled: float, record: bool) -> None:
+        request = self._request(endpoint)
+        ttfb = latency = 0.0
+        try:
+            async with client.stream(**request) as response:
+                ttfb = time.perf_counter() - scheduled
+                body = await response.aread()
+            latency = time.perf_counter() - scheduled
+            status = str(response.status_code)
+            ok = self._is_ok(endpoint, response, body)
+            stages = parse_server_timing(response.headers.get("server-timing"))
+        except httpx.HTTPError as e:
+            latency = time.perf_counter() - scheduled
+            status, ok, stages = type(e).__name__, False, {}
+        if record:
+            self.samples[endpoint].append(Sample(latency, ttfb or latency, status, ok, stages))
+
+    async def run(self) -> float:
+        args = self.args
+        limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+        names, weights = list(self.mix), list(self.mix.values())
+        tasks = set()
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            start = time.perf_counter()
+            warmup_end = start + args.warmup
+            end = warmup_end + args.duration
+            next_at = start
+            while next_at < end:
+                now = time.perf_counter()
+                if next_at > now:
+                    await asyncio.sleep(next_at - now)
+                elif now - next_at > LAG_WARN_SEC:
+                    self.lag.append(now - next_at)
+                record = next_at >= warmup_end
+                endpoint = self.rng.choices(names, weights)[0]
+                task = asyncio.create_task(self._fire(client, endpoint, next_at, record))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                next_at += self.rng.expovariate(args.rps) if args.poisson else 1.0 / args.rps
+            if tasks:
+                print(f"남은 요청 {len(tasks)}개를 기다립니다...")
+                await asyncio.gather(*tasks)
+            return time.perf_counter() - warmup_end
+
+    def report(self, elapsed: float) -> Dict:
+        def ms(values, q):
+            return float(1000 * np.percentile(values, q)) if values else float("nan")
+
+        rows = {}
+        print(f"\n측정 구간 {self.args.duration:.0f}초 (완료까지 {elapsed:.1f}초), 목표 {self.args.rps} RPS\n")
+        print(f"{'endpoint':<9} {'sent':>6} {'ok':>6} {'err%':>6} {'ok/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} "
+              f"{'max':>8} {'ttfb50':>8}  errors")
+        for endpoint in ENDPOINTS:
+            samples = self.samples.get(endpoint)
+            if not samples:
+                continue
+            ok = [s.latency for s in samples if s.ok]
+            ttfb = [s.ttfb for s in samples if s.ok]
+            errors = Counter(s.status if s.status != "200" else "200(body)" for s in samples if not s.ok)
+            row = {
+                "sent": len(samples), "ok": len(ok),
+                "error_rate": 1 - len(ok) / len(samples),
+                "throughput": len(ok) / self.args.duration,
+                "p50_ms": ms(ok, 50), "p95_ms": ms(ok, 95), "p99_ms": ms(ok, 99),
+                "max_ms": 1000 * max(ok) if ok else float("nan"),
+                "ttfb_p50_ms": ms(ttfb, 50),
+                "errors": dict(errors),
+            }
+            rows[endpoint] = row
+            print(f"{endpoint:<9} {row['sent']:>6} {row['ok']:>6} {100 * row['error_rate']:>6.1f} "
+                  f"{row['throughput']:>7.2f} {row['p50_ms']:>8.0f} {row['p95_ms']:>8.0f} {row['p99_ms']:>8.0f} "
+                  f"{row['max_ms']:>8.0f} {row['ttfb_p50_ms']:>8.0f}  "
+                  f"{', '.join(f'{k}x{v}' for k, v in errors.most_common(3))}")
+
+        print("\n단계별 평균 (Server-Timing, 성공 요청 기준, ms)")
+        for endpoint, row in rows.items():
+            stages: Dict[str, List[float]] = defaultdict(list)
+            for s in self.samples[endpoint]:
+                if s.ok:
+                    for name, dur in s.stages.items():
+                        stages[name].append(dur)
+            row["stages_mean_ms"] = {k: float(np.mean(v)) for k, v in stages.items()}
+            if stages:
+                print(f"  {endpoint:<8} " + ", ".join(f"{k} {np.mean(v):.0f}" for k, v in stages.items()))
+
+        if self.lag:
+            print(f"\n⚠️ 생성기가 예정 시각보다 늦게 보낸 요청 {len(self.lag)}개 (최대 {1000 * max(self.lag):.0f}ms) "
+                  f"- 지연은 예정 시각 기준이라 결과에 포함되어 있습니다.")
+        print("지연은 ms, ok/s는 측정 구간 동안의 성공 처리량입니다.")
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키오스크 백엔드 부하 생성기")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="백엔드 주소")
+    parser.add_argument("--rps", type=float, default=10.0, help="전체 목표 요청률 (mix 비율로 나눔)")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 구간 (초)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="통계에서 제외할 시작 구간 (초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"엔드포인트 비율 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--unique", type=float, default=0.2, help="캐시를 피하도록 새 문장을 쓰는 비율 (0~1)")
+    parser.add_argument("--wav", help="/api/stt에 올릴 WAV 파일 (없으면 합성 신호)")
+    parser.add_argument("--tts-stream", action="store_true", help="/api/tts를 stream=true로 호출")
+    parser.add_argument("--defer-summary", action="store_true", help="/weather/를 defer_summary=true로 호출")
+    parser.add_argument("--fixed-interval", dest="poisson", action="store_false", help="포아송 대신 고정 간격 도착")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="동시 커넥션 한도")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    generator = LoadGenerator(args)
+    print(f"{args.url} → {args.rps} RPS, {args.duration:.0f}초 (+워밍업 {args.warmup:.0f}초), mix={generator.mix}")
+    elapsed = asyncio.run(generator.run())
+    rows = generator.report(elapsed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "endpoints": rows}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,67 @@
 # -*- coding: utf-8 -*-
-from fastapi import FastAPI, Request, UploadFile, File, Form, Response
+from fastapi import FastAPI, Request, UploadFile, File, Form, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from openai import OpenAI
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from dotenv import load_dotenv
 from loguru import logger
 from recognition import router as recognition_router
-from weather import router as weather_router
+from weather import router as weather_router, weather_store, weather_summarizer, load_weather, SUMMARY_WAIT_MAX
+from festival import router as festival_router, festival_store
+from intent import IntentEngine, ClientDisconnected, cancel_on_disconnect
+from keyword_router import KeywordRouter, parse_few_shot_pairs, UNKNOWN_LABEL
+from intent_classifier import IntentClassifier
+from intent_tables import MINWON_KEYWORDS, LLM_PROMPT
+from intent_cache import IntentCache, UtteranceNormalizer
+from transcoder import AudioTranscoder
+from audio_gate import AudioQualityGate
+from tts_cache import TTSAudioCache, tts_cache_key
+from stt_stream import run_stream_session
+from stt_batcher import STTBatcher
+from clients import get_clients
+from metrics import (registry, span, request_context, new_request_id, server_timing, install_log_context,
+                     HTTP_SECONDS, REQUEST_ID_HEADER)
 
 import os
 import json
 import httpx
-import tempfile
-import subprocess
+import asyncio
+import itertools
+import time
+from typing import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, aclosing
+from urllib.parse import urlencode
 
 BACKEND_DIR = os.path.abspath(os.path.dirname(__file__))
 ROOT_DIR = os.path.abspath(os.path.join(BACKEND_DIR, ".."))
 
 # --- STT/TTS 통합: 모듈 import ---
 # factory_backup -> factory로 경로를 수정하고, 필요한 예외 클래스를 import합니다.
-from Utility.STT_TTS.factory import load_config, create_stt, create_tts, setup_logging
-from Utility.STT_TTS.def_exceptions import TranscriptionError, TTSError
+from Utility.STT_TTS.factory import load_config, create_stt, create_tts, create_vad, setup_logging
+from Utility.STT_TTS.def_exceptions import (TranscriptionError, TTSError, AudioConversionError, TranscoderBusyError,
+                                            AudioQualityError)
+from Utility.STT_TTS.imp_stt_openai import DEFAULT_CORRECTIONS
 
 # 환경변수 불러오기
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """upstream 커넥션 풀과 엔진들의 수명을 앱 수명에 맞춥니다."""
+    await get_clients().start()
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
+        await get_clients().aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(recognition_router)
 app.include_router(weather_router)
+app.include_router(festival_router)
 
 # ✅ CORS 설정
 app.add_middleware(
@@ -38,8 +70,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 프론트엔드가 자신의 측정값과 서버 단계별 시간을 대조할 수 있도록 노출
+    expose_headers=[REQUEST_ID_HEADER, "Server-Timing"],
 )
 
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """
+    요청마다 요청 ID(X-Request-ID, 없으면 생성)를 컨텍스트에 설정해 모든 로그와 upstream 호출에 전달하고,
+    단계별 소요 시간을 Server-Timing 헤더로, 전체 지연을 kiosk_http_request_seconds로 기록합니다.
+    """
+    request_id = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+    with request_context(request_id) as timings:
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+    route = request.scope.get("route")
+    HTTP_SECONDS.observe(elapsed, request.method, getattr(route, "path", "unmatched"), str(response.status_code))
+    response.headers[REQUEST_ID_HEADER] = request_id
+    response.headers["Server-Timing"] = server_timing(timings, elapsed)
+    response.headers["Timing-Allow-Origin"] = "http://localhost:3000"
+    return response
+
 # --- STT/TTS 통합: 엔진 초기화 ---
 # 프로젝트의 루트 디렉토리 경로를 계산하여 설정 파일을 올바르게 찾도록 합니다.
 _stt = None
@@ -50,99 +103,134 @@ try:
     # load_dotenv(os.path.join(ROOT_DIR, ".env"))
     config = load_config(os.path.join(ROOT_DIR, "config.yaml"))
     setup_logging()
+    install_log_context()
+    # upstream 커넥션 풀 설정은 클라이언트가 만들어지기 전에 반영
+    get_clients().configure(config.get("upstream"))
 
-    # 설정 파일을 기반으로 STT, TTS 엔진 인스턴스 생성
-    _stt = create_stt(config)
-    _tts = create_tts(config)
+    # 설정 파일을 기반으로 STT, TTS 엔진 인스턴스 생성 (동기 OpenAI 클라이언트 풀 공유)
+    _stt = create_stt(config, get_clients().openai())
+    _tts = create_tts(config, get_clients().openai())
     logger.info("STT/TTS 엔진 인스턴스 생성 완료.")
 
 except Exception as e:
     logger.error(f"설정 파일 로드 또는 엔진 생성 실패: {e}")
     config = None
 
-# ✅ 주요 키워드 사전
-MINWON_KEYWORDS = {
-    "등본": "주민등록등본 발급 요청",
-    "주민등록등본": "주민등록등본 발급 요청",
-    "주민등본": "주민등록등본 발급 요청",
-    "초본": "주민등록초본 발급 요청",
-    "주민등록초본": "주민등록초본 발급 요청",
-    "주민초본": "주민등록초본 발급 요청",
-    "가족관계증명서": "가족관계증명서 발급 요청",
-    "가족관계증명": "가족관계증명서 발급 요청",
-    "가족관계": "가족관계증명서 발급 요청",
-    "가족증명": "가족관계증명서 발급 요청",
-    "건강보험득실확인서": "건강보험득실확인서 발급 요청",
-    "건강보험": "건강보험득실확인서 발급 요청",
-    "건보": "건강보험득실확인서 발급 요청",
-    "보험득실": "건강보험득실확인서 발급 요청",
-    "보험득실확인": "건강보험득실확인서 발급 요청",
-    "날씨": "날씨 정보 조회 요청",
-    "오늘날씨": "날씨 정보 조회 요청",
-    "내일날씨": "날씨 정보 조회 요청",
-    "강수확률": "날씨 정보 조회 요청",
-    "행사": "행사 정보 조회 요청",
-    "축제": "행사 정보 조회 요청",
-    "이벤트": "행사 정보 조회 요청",
-    "페스티벌": "행사 정보 조회 요청",
-}
+# --- 의도 분석: 비동기 LLM 엔진 (동시성 제한 + 타임아웃) ---
+client = get_clients().async_openai()
+if client is None:
+    # 키가 없으면 LLM 단계를 건너뛰고 키워드/캐시/분류기 결과만으로 응답
+    logger.error("OPENAI_API_KEY가 설정되지 않아 LLM 의도 분석을 사용할 수 없습니다. (키워드/캐시/분류기만 사용)")
+intent_engine = IntentEngine(client, (config or {}).get("intent")) if client is not None else None
+
+# --- 의도 분석: 정규화 발화 캐시 (메모리 LRU+TTL, SQLite 영속화) ---
+_intent_cache_cfg = dict((config or {}).get("intent_cache") or {})
+_intent_cache_cfg["path"] = os.path.join(
+    ROOT_DIR, _intent_cache_cfg.get("path") or os.path.join("backend", "data", "intent_cache.sqlite3")
+)
+intent_cache = IntentCache(
+    UtteranceNormalizer(getattr(_stt, "correction_engine", None) or DEFAULT_CORRECTIONS),
+    _intent_cache_cfg,
+)
+
+# --- STT: 동적 마이크로 배칭 (여러 키오스크가 로컬 모델을 공유할 때 처리량 향상) ---
+_stt_batch_cfg = (config or {}).get("stt_batch") or {}
+stt_batcher = STTBatcher(_stt, _stt_batch_cfg) if _stt and _stt_batch_cfg.get("enabled") else None
+
+
+async def _transcribe(wav_bytes: bytes) -> str:
+    """배칭이 켜져 있으면 스케줄러를 거치고, 아니면 스레드에서 바로 STT를 실행합니다."""
+    if stt_batcher is not None:
+        return await stt_batcher.transcribe(wav_bytes)
+    return await asyncio.to_thread(_stt.transcribe, wav_bytes)
+
+# --- 오디오 변환: ffmpeg 파이프 워커 풀 ---
+transcoder = AudioTranscoder((config or {}).get("transcoder"))
 
+# --- STT 전처리: 앞뒤 무음 제거 + 품질 검사 (쓸 수 없는 오디오는 upstream 호출 전에 거절) ---
+audio_gate = AudioQualityGate((config or {}).get("audio_gate"))
 
-# ✅ 키워드 기반 분석 함수
+# --- TTS: 디스크 오디오 캐시 (text, model, voice, format 기준) ---
+TTS_AUDIO_FORMAT = getattr(_tts, "audio_format", "mp3")
+TTS_MEDIA_TYPE = getattr(_tts, "media_type", "audio/mpeg")
+_tts_cache_cfg = dict((config or {}).get("tts_cache") or {})
+_tts_cache_cfg["dir"] = os.path.join(ROOT_DIR, _tts_cache_cfg.get("dir") or os.path.join("backend", "data", "tts_cache"))
+try:
+    tts_cache = TTSAudioCache(_tts_cache_cfg)
+except OSError as e:
+    logger.warning(f"TTS 캐시 디렉토리를 사용할 수 없어 캐시 없이 동작합니다: {e}")
+    tts_cache = None
+
+# --- 축제 목록: festival.csv를 한 번 파싱해 날짜 색인과 함께 메모리에 보관 (/festivals) ---
+_festival_cfg = dict((config or {}).get("festival") or {})
+_festival_cfg["csv_path"] = os.path.join(
+    ROOT_DIR, _festival_cfg.get("csv_path") or os.path.join("frontend", "public", "festival.csv")
+)
+festival_store.configure(_festival_cfg)
+
+# ✅ 키워드 기반 분석 함수 (가장 긴 매칭 우선, 컴파일된 keyword_router 사용)
 def get_purpose_by_keyword(user_input: str) -> str | None:
-    for keyword, purpose in MINWON_KEYWORDS.items():
-        if keyword in user_input:
-            return purpose
-    return None
+    return keyword_router.route(user_input).label
+
+
+# ✅ LLM 요청의 고정 system prefix (지침 + 예시): 매 요청 같은 바이트열이어야 provider 프롬프트 캐시가 적중
+INTENT_SYSTEM_PROMPT = ("너는 공공기관 키오스크 AI야. 사용자 목적만 예시처럼 "
+                        "한 줄로 써줘. 예시 없는 건 '민원 목적을 알 수 없음'만 쓰면 된다.\n"
+                        + LLM_PROMPT.strip()
+                        + "\n- 답은 JSON의 purpose 필드에 위 예시의 목적 중 하나만 넣으세요.")
+# 출력 enum: few-shot 예시와 키워드 사전의 목적 라벨 (순서 고정)
+INTENT_LABELS = list(dict.fromkeys(
+    [label for _, label in parse_few_shot_pairs(LLM_PROMPT)] + list(MINWON_KEYWORDS.values()) + [UNKNOWN_LABEL]
+))
+
+# ✅ 키워드 사전 + few-shot 예시를 Aho-Corasick 오토마톤으로 한 번만 컴파일
+keyword_router = KeywordRouter.from_tables(MINWON_KEYWORDS, LLM_PROMPT)
+
+# ✅ 로컬 문자 n-gram 분류기 (같은 예시로 학습, 시작 시 의도 캐시의 LLM 응답으로 재학습)
+intent_classifier = IntentClassifier.from_tables(MINWON_KEYWORDS, LLM_PROMPT, (config or {}).get("intent_classifier"))
 
 
-# ✅ LLM 프롬프트
-LLM_PROMPT = """
-당신은 민원 키오스크 안내 도우미입니다.
-아래는 사용자의 다양한 민원 요청 예시입니다.
-반드시 **예시와 똑같은 한글 한 줄 요약**만 출력하세요.
-
-[민원 목적 요약 예시]
-- "등본 뽑아줘" → "주민등록등본 발급 요청"
-- "등본 때고 싶어요" → "주민등록등본 발급 요청"
-- "주민등록등본 필요합니다" → "주민등록등본 발급 요청"
-- "초본 출력" → "주민등록초본 발급 요청"
-- "가족관계증명서 뽑아줘" → "가족관계증명서 발급 요청"
-- "가족관계증명 뽑을래" → "가족관계증명서 발급 요청"
-- "토지대장 떼고싶어" → "토지(임야)대장 발급 요청"
-- "여권 신청하고 싶어요" → "여권 발급 신청"
-- "주민등록증 재발급 받아야 해" → "주민등록증 재발급 요청"
-- "출입국 사실 증명 해주세요" → "출입국 사실증명 발급 요청"
-- "오늘 날씨 알려줘" → "날씨 정보 조회 요청"
-- "내일 비 오나?" → "날씨 정보 조회 요청"
-- "근처 축제 뭐 있어?" → "행사 정보 조회 요청"
-- "지역 행사 일정 알려줘" → "행사 정보 조회 요청"
-- "공무원 시험 접수 안내해줘" → "민원 목적을 알 수 없음"
-- "키오스크 고장났어요" → "민원 목적을 알 수 없음"
-- "잡담" → "민원 목적을 알 수 없음"
-
-[지침]
-- 예시와 같이 반드시 한글 한 줄 요약으로만 답하세요.
-- 예시에 없는 민원/잡담/질문 등은 반드시 '민원 목적을 알 수 없음'만 답하세요.
-- 설명, 부가 텍스트, 인삿말 절대 금지.
-"""
-
-
-@app.on_event("startup")
 async def startup_event():
     """FastAPI 앱 시작 시 STT/TTS 엔진을 초기화합니다."""
+    global _prewarm_task
     if _stt:
         _stt.initialize()
         logger.info("STT 엔진 초기화 완료.")
     if _tts:
         _tts.initialize()
         logger.info("TTS 엔진 초기화 완료.")
+    await asyncio.to_thread(intent_cache.warm_load)
+    festival_store.warm_load()
+    if intent_classifier.enabled:
+        # 지난 트래픽에서 LLM이 확정한 발화를 학습 데이터에 추가
+        intent_classifier.refit(await asyncio.to_thread(intent_cache.labeled_examples))
+    await transcoder.start()
+    if stt_batcher is not None:
+        await stt_batcher.start()
+    # prewarm은 시작을 지연시키지 않도록 백그라운드에서 진행
+    _prewarm_task = asyncio.create_task(prewarm_tts_cache())
+
+
+async def shutdown_event():
+    """FastAPI 앱 종료 시 의도 캐시를 닫고 오디오 변환/STT 배칭 워커, 날씨 HTTP 클라이언트, 로컬 TTS 워커를 정리합니다."""
+    if _prewarm_task is not None and not _prewarm_task.done():
+        _prewarm_task.cancel()
+    intent_cache.close()
+    await transcoder.close()
+    if stt_batcher is not None:
+        await stt_batcher.close()
+    await weather_store.aclose()
+    if _tts:
+        # 로컬 TTS 워커 프로세스 정리 (API 방식은 해제할 리소스 없음)
+        _tts.close()
 
 
-def _ensure_wav(input_bytes: bytes, input_mime: str | None) -> bytes:
+async def _ensure_wav(input_bytes: bytes, input_mime: str | None) -> bytes:
     """
-    브라우저에서 전달받은 오디오 파일(webm, ogg 등)을 ETRI STT API가 요구하는
+    브라우저에서 전달받은 오디오 파일(webm, ogg 등)을 STT가 요구하는
     WAV (16kHz, 1채널) 형식으로 변환합니다. 시스템에 ffmpeg가 설치되어 있어야 합니다.
+    변환은 미리 띄워둔 ffmpeg 워커의 파이프로 처리되어 이벤트 루프를 막지 않습니다.
+    (파이프로 demux할 수 없는 mp4/m4a는 워커가 임시 파일로 변환)
     """
     mime = (input_mime or "").lower()
 
@@ -155,66 +243,82 @@ def _ensure_wav(input_bytes: bytes, input_mime: str | None) -> bytes:
     if "wav" in mime:
         return input_bytes
 
-    # 임시 파일 생성하여 변환 작업 수행
-    # delete=False: with 블록이 끝나도 파일이 지워지지 않도록 설정
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as src:
-        src.write(input_bytes)
-        src_path = src.name
-
-    dst_path = src_path + ".wav"
+    with span("transcode"):
+        return await transcoder.to_wav(input_bytes, mime)
 
-    try:
-        # --- STT 문제 해결: ffmpeg 명령어 실행 전 파일 존재 확인 ---
-        if not os.path.exists(src_path):
-            raise FileNotFoundError(f"임시 파일 생성 실패: {src_path}")
-        # --- 수정 완료 ---
 
-        # ffmpeg 명령어 실행: -y(덮어쓰기), -i(입력), -ac 1(모노), -ar 16000(16kHz 샘플링)
-        command = ["ffmpeg", "-y", "-i", src_path, "-ac", "1", "-ar", "16000", dst_path]
-        result = subprocess.run(
-            command,
-            stdout=subprocess.DEVNULL,  # 성공 로그는 출력 안 함
-            stderr=subprocess.PIPE,  # 에러 로그는 캡처
-            check=True,  # 오류 발생 시 CalledProcessError 예외 발생
-            timeout=30  # 30초 타임아웃 설정
-        )
-
-        # --- STT 문제 해결: 변환 결과 파일 존재 확인 ---
-        if not os.path.exists(dst_path):
-            raise FileNotFoundError(f"오디오 변환 결과 파일이 생성되지 않았습니다: {dst_path}")
-
-        if os.path.getsize(dst_path) == 0:
-            raise ValueError("변환된 오디오 파일이 비어있습니다.")
-        # --- 수정 완료 ---
+async def _resolve_intent(request: Request, user_input: str, route=None) -> dict:
+    """
+    키워드 라우터 → 정규화 캐시 → 로컬 분류기 → LLM 순서로 발화 의도를 결정합니다.
+    route: 이미 계산한 keyword_router.route() 결과 (없으면 여기서 계산)
+    클라이언트가 끊기면 ClientDisconnected를 던집니다.
+    """
+    # 1차 키워드 의도 파악 (단일 라벨로 확정되면 LLM 호출 생략)
+    if route is None:
+        route = keyword_router.route(user_input)
+    keyword_purpose = route.label
+    print("🔍 키워드 매칭:", keyword_purpose, "(확정)" if route.confident else "")
 
-        with open(dst_path, "rb") as f:
-            converted_bytes = f.read()
+    if route.confident:
+        return {
+            "source": "keyword",
+            "summary": keyword_purpose,
+            "purpose": keyword_purpose,
+            "matched_keyword": route.keyword
+        }
 
-        # --- STT 문제 해결: 변환 결과 유효성 검사 ---
-        if not converted_bytes or len(converted_bytes) == 0:
-            raise ValueError("오디오 변환 결과가 비어있습니다.")
-        # --- 수정 완료 ---
+    # 자주 나오는 발화는 정규화 캐시에서 바로 응답
+    cached = await intent_cache.get(user_input)
+    if cached:
+        print("⚡ 캐시 적중:", cached.get("summary"))
+        return {**cached, "source": "cache"}
+
+    # 로컬 n-gram 분류기: 확신도가 충분하면 LLM 호출 생략
+    if intent_classifier.enabled:
+        with span("intent_classifier"):
+            prediction = intent_classifier.predict(user_input)
+        if prediction.accepted:
+            print(f"🧮 분류기 결과: {prediction.label} (확신도 {prediction.confidence:.2f})")
+            return {
+                "source": "classifier",
+                "summary": prediction.label,
+                "purpose": prediction.label,
+                "matched_keyword": route.keyword,
+                "confidence": round(prediction.confidence, 3)
+            }
+
+    if intent_engine is None:
+        return {
+            "source": "local",
+            "summary": keyword_purpose or "",
+            "purpose": keyword_purpose or "",
+            "matched_keyword": route.keyword
+        }
 
-        return converted_bytes
-
-    except FileNotFoundError:
-        logger.error("ffmpeg를 찾을 수 없습니다. 시스템에 ffmpeg가 설치되어 있는지 확인해주세요.")
-        raise
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr.decode() if e.stderr else "알 수 없는 ffmpeg 오류"
-        logger.error(f"ffmpeg 오디오 변환 실패: {error_msg}")
-        raise
-    except subprocess.TimeoutExpired:
-        logger.error("ffmpeg 변환 시간 초과")
-        raise
-    finally:
-        # 임시 파일 삭제
-        for file_path in [src_path, dst_path]:
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except OSError as e:
-                    logger.warning(f"임시 파일 삭제 실패: {file_path}, 오류: {e}")
+    # 2차 LLM 의도 파악 요청 (키워드 없음 또는 여러 목적이 겹친 경우)
+    # 고정 지침/예시는 system prefix로, 요청마다 달라지는 부분(예상 목적, 발화)만 user 메시지로 보냄
+    if keyword_purpose:
+        user_prompt = f"[예상 목적: {keyword_purpose}]\n\"{user_input}\""
+    else:
+        user_prompt = f"\"{user_input}\""
+
+    # 이벤트 루프를 막지 않는 비동기 호출, 클라이언트가 끊기면 upstream 호출도 취소
+    with span("intent_llm"):
+        summary = await cancel_on_disconnect(
+            request, intent_engine.complete(INTENT_SYSTEM_PROMPT, user_prompt, INTENT_LABELS))
+    print("🧐 LLM 결과:", summary)
+
+    result = {
+        "source": "llm",
+        "summary": summary,
+        "purpose": summary,
+        "matched_keyword": route.keyword
+    }
+    if summary:
+        await intent_cache.put(user_input, result)
+        # LLM이 알려진 라벨로 답한 발화는 분류기에 바로 반영 (다음부터는 로컬에서 확정)
+        intent_classifier.learn(user_input, summary)
+    return result
 
 
 # ✅ 텍스트 분석 API
@@ -225,37 +329,11 @@ async def receive_text(request: Request):
         data = json.loads(raw_body.decode("utf-8"))
         user_input = data.get("text", "")
         print("📨 받은 텍스트:", user_input)
+        return await _resolve_intent(request, user_input)
 
-        # 1차 키워드 의포 파악
-        keyword_purpose = get_purpose_by_keyword(user_input)
-        print("🔍 키워드 매칭:", keyword_purpose)
-
-        # 2차 LLM 의도 파악 요청
-        system_prompt = ("너는 공공기관 키오스크 AI야. 사용자 목적만 예시처럼 "
-                         "한 줄로 써줘. 예시 없는 건 '민원 목적을 알 수 없음'만 쓰면 된다.")
-        if keyword_purpose:
-            user_prompt = f"{LLM_PROMPT}\n[예상 목적: {keyword_purpose}]\n\"{user_input}\""
-        else:
-            user_prompt = f"{LLM_PROMPT}\n\"{user_input}\""
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-
-        summary = response.choices[0].message.content.strip()
-        print("🧐 LLM 결과:", summary)
-
-        return {
-            "source": "llm",
-            "summary": keyword_purpose,
-            "purpose": keyword_purpose,
-            "matched_keyword": keyword_purpose
-        }
-
+    except ClientDisconnected:
+        logger.info("클라이언트 연결이 끊겨 LLM 의도 분석을 취소했습니다.")
+        return Response(status_code=499)
     except Exception as e:
         print("❌ OpenAI 오류:", e)
         return {
@@ -266,22 +344,90 @@ async def receive_text(request: Request):
         }
 
 
+# ✅ 키워드 라우터 통계 (LLM 호출을 얼마나 절약했는지 확인용)
+@app.get("/intent/stats")
+async def intent_stats():
+    return {
+        "keyword_router": keyword_router.stats(),
+        "intent_cache": intent_cache.stats(),
+        "intent_classifier": intent_classifier.stats(),
+        "llm_in_flight": intent_engine.in_flight if intent_engine else 0,
+        "llm": intent_engine.stats() if intent_engine else None,
+    }
+
+
+# --- 메트릭: 수집 시점에 읽는 대기열 깊이/동시 호출 수 ---
+registry.gauge("kiosk_transcoder_queue_depth", "ffmpeg transcode jobs waiting for a worker",
+               lambda: transcoder.queue_depth)
+registry.gauge("kiosk_intent_llm_in_flight", "Intent LLM calls in flight", lambda: intent_engine.in_flight if intent_engine else 0)
+if stt_batcher is not None:
+    registry.gauge("kiosk_stt_batch_queue_depth", "STT requests waiting for a batch",
+                   lambda: stt_batcher.queue_depth)
+
+
+# ✅ Prometheus 스크레이프 (단계별 지연 히스토그램, upstream 호출 지연, 대기열 깊이)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+# ✅ STT 배칭 통계 (대기열 깊이, 배치 크기 분포)
+@app.get("/api/stt/stats")
+async def stt_stats():
+    return {
+        "batching": stt_batcher.stats() if stt_batcher is not None else None,
+        "audio_gate": audio_gate.stats(),
+    }
+
+
+def _stt_not_ready() -> JSONResponse | None:
+    # --- STT 문제 해결: 엔진 상태 체크 추가 ---
+    if not _stt or not _stt.is_initialized():
+        logger.error("STT 엔진이 초기화되지 않았습니다.")
+        return JSONResponse({"error": "STT 엔진이 준비되지 않았습니다."}, status_code=503)
+    return None
+
+
+async def _speech_to_text(raw_bytes: bytes, content_type: str | None) -> tuple[str, dict]:
+    """업로드 오디오 → 16kHz WAV 변환 → 무음 제거/품질 검사 → STT. (텍스트, 오디오 측정값)을 반환합니다."""
+    # 오디오를 STT API가 요구하는 16kHz/Mono WAV 형식으로 변환
+    wav_bytes = await _ensure_wav(raw_bytes, content_type)
+    # 앞뒤 무음을 잘라내고 무음/작은 소리/포화 녹음은 STT 호출 없이 거절
+    with span("audio_gate"):
+        wav_bytes, audio_info = audio_gate.process(wav_bytes)
+    # STT 엔진으로 텍스트 변환 수행 (이벤트 루프를 막지 않도록 스레드/배칭 스케줄러 사용)
+    with span("stt"):
+        text = await _transcribe(wav_bytes)
+    logger.info(f"STT 변환 결과: '{text}' ({audio_info})")
+    return text, audio_info
+
+
+def _stt_error_response(e: Exception) -> JSONResponse:
+    """STT 경로에서 발생한 예외를 HTTP 응답으로 바꿉니다. (/api/stt, /api/turn 공용)"""
+    if isinstance(e, AudioQualityError):
+        return JSONResponse({"error": str(e), "reason": e.reason, "audio": e.info}, status_code=422)
+    if isinstance(e, TranscoderBusyError):
+        logger.warning(f"오디오 변환 대기열 포화: {e}")
+        return JSONResponse({"error": str(e)}, status_code=503)
+    if isinstance(e, AudioConversionError):
+        logger.error(f"오디오 변환 오류: {e}")
+        return JSONResponse({"error": str(e)}, status_code=400)
+    if isinstance(e, TranscriptionError):
+        logger.error(f"STT 변환 오류: {e}")
+        return JSONResponse({"error": str(e)}, status_code=502)
+    logger.error(f"STT 처리 중 알 수 없는 오류: {e}")
+    return JSONResponse({"error": "알 수 없는 STT 오류가 발생했습니다."}, status_code=500)
+
+
 @app.post("/api/stt")
 async def stt_once(file: UploadFile = File(...)):
     """
     프론트엔드에서 녹음된 오디오 파일(Blob)을 받아 텍스트로 변환하여 반환합니다.
     """
+    not_ready = _stt_not_ready()
+    if not_ready:
+        return not_ready
     try:
-        # --- STT 문제 해결: 엔진 상태 체크 추가 ---
-        if not _stt:
-            logger.error("STT 엔진이 초기화되지 않았습니다.")
-            return JSONResponse({"error": "STT 엔진이 준비되지 않았습니다."}, status_code=503)
-
-        if not _stt.is_initialized():
-            logger.error("STT 엔진이 초기화되지 않았습니다.")
-            return JSONResponse({"error": "STT 엔진이 준비되지 않았습니다."}, status_code=503)
-        # --- 수정 완료 ---
-
         # 업로드된 파일의 내용을 바이트로 읽음
         raw_bytes = await file.read()
 
@@ -291,26 +437,153 @@ async def stt_once(file: UploadFile = File(...)):
             return JSONResponse({"error": "오디오 파일이 비어있습니다."}, status_code=400)
         # --- 수정 완료 ---
 
-        # 오디오를 STT API가 요구하는 16kHz/Mono WAV 형식으로 변환
-        wav_bytes = _ensure_wav(raw_bytes, file.content_type)
-        # STT 엔진으로 텍스트 변환 수행
-        text = _stt.transcribe(wav_bytes)
-        logger.info(f"STT 변환 결과: '{text}'")
-        return JSONResponse({"text": text})
+        text, audio_info = await _speech_to_text(raw_bytes, file.content_type)
+        return JSONResponse({"text": text, "audio": audio_info})
+    except Exception as e:
+        return _stt_error_response(e)
 
-    except TranscriptionError as e:
-        logger.error(f"STT 변환 오류: {e}")
-        return JSONResponse({"error": str(e)}, status_code=502)
+
+@app.websocket("/api/stt/stream")
+async def stt_stream(websocket: WebSocket):
+    """
+    녹음 중인 opus/webm 조각을 WebSocket으로 받아 바로 디코딩하고,
+    서버 측 VAD로 발화 종료를 감지하는 즉시 STT를 수행합니다.
+    - 클라이언트 → 서버: binary(오디오 조각), text "end"(녹음 종료)
+    - 서버 → 클라이언트: {"type": "speech_start" | "endpoint" | "final" | "error", ...}
+    """
+    await websocket.accept()
+    if not _stt or not _stt.is_initialized():
+        logger.error("STT 엔진이 초기화되지 않았습니다.")
+        await websocket.send_json({"type": "error", "error": "STT 엔진이 준비되지 않았습니다."})
+        await websocket.close(code=1011)
+        return
+
+    vad = None
+    try:
+        # VAD는 프레임 상태를 가지므로 연결마다 새 인스턴스를 사용
+        vad = create_vad(config)
+        await run_stream_session(websocket, _stt, vad, transcoder, (config or {}).get("stt_stream"),
+                                 transcribe=_transcribe)
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("스트리밍 STT: 클라이언트 연결이 끊겼습니다.")
+    except (AudioConversionError, TranscriptionError) as e:
+        logger.error(f"스트리밍 STT 오류: {e}")
+        await websocket.send_json({"type": "error", "error": str(e)})
+        await websocket.close(code=1011)
     except Exception as e:
-        logger.error(f"STT 처리 중 알 수 없는 오류: {e}")
-        return JSONResponse({"error": "알 수 없는 STT 오류가 발생했습니다."}, status_code=500)
+        logger.error(f"스트리밍 STT 처리 중 알 수 없는 오류: {e}")
+        await websocket.send_json({"type": "error", "error": "알 수 없는 STT 오류가 발생했습니다."})
+        await websocket.close(code=1011)
+    finally:
+        if vad:
+            vad.close()
 
 
 # --- STT/TTS 통합: TTS API 엔드포인트 (수정) ---
+def _guard_stream(text: str, chunks: Iterator[bytes], cache_key: str | None = None) -> Iterator[bytes]:
+    """
+    스트리밍 도중 오류는 상태 코드를 바꿀 수 없으므로 로그만 남기고 전송을 끝냅니다.
+    cache_key가 주어지면 끝까지 정상 전송된 오디오만 TTS 캐시에 저장합니다.
+    """
+    parts: list[bytes] = []
+    complete = False
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        complete = True
+    except Exception as e:
+        logger.error(f"TTS 스트리밍 중 오류 발생: {e}")
+    finally:
+        total = sum(len(p) for p in parts)
+        logger.info(f"TTS 스트리밍 완료: '{text}' ({total} bytes)")
+        if complete and cache_key and tts_cache and parts and _cacheable(parts[0]):
+            tts_cache.put(cache_key, b"".join(parts))
+
+
+def _audio_media_type(data: bytes) -> str:
+    """오디오 bytes의 실제 형식. (보조 TTS로 전환되면 기본 provider와 형식이 다를 수 있음)"""
+    return "audio/wav" if data[:4] == b"RIFF" else "audio/mpeg"
+
+
+def _cacheable(data: bytes) -> bool:
+    # 캐시 키는 기본 provider의 형식 기준이므로 보조 TTS 결과는 캐시하지 않음
+    return bool(data) and _audio_media_type(data) == TTS_MEDIA_TYPE
+
+
+def _tts_cache_key(text: str) -> str:
+    return tts_cache_key(text, getattr(_tts, "model", ""), getattr(_tts, "voice", ""), TTS_AUDIO_FORMAT)
+
+
+# 백그라운드에서 합성 중인 문장 (cache_key → Task), 같은 문장은 한 번만 합성
+_tts_inflight: dict[str, asyncio.Task] = {}
+
+
+# 시작 시 prewarm 작업 (참조를 잡아 두어야 실행 중에 GC되지 않고, 종료 시 취소할 수 있음)
+_prewarm_task: asyncio.Task | None = None
+
+
+async def _synthesize_into_cache(text: str, key: str) -> bool:
+    """합성 결과를 캐시에 넣었으면 True."""
+    try:
+        with span("tts_prefetch"):
+            audio_bytes = await asyncio.to_thread(_tts.synthesize, text)
+        if _cacheable(audio_bytes):
+            await asyncio.to_thread(tts_cache.put, key, audio_bytes)
+            return True
+    except Exception as e:
+        logger.warning(f"TTS 미리 합성 실패: '{text}', 오류: {e}")
+    return False
+
+
+def _start_synthesis(text: str, key: str) -> asyncio.Task | None:
+    """
+    문장을 백그라운드 합성 작업으로 등록합니다. 이미 합성 중이면 그 작업을, 캐시에 있으면 None을 반환합니다.
+    _tts_inflight에 등록되므로 같은 문장의 /api/tts 요청은 중복 합성 없이 이 작업을 기다립니다.
+    """
+    task = _tts_inflight.get(key)
+    if task is None and not tts_cache.contains(key):
+        task = asyncio.create_task(_synthesize_into_cache(text, key))
+        _tts_inflight[key] = task
+        task.add_done_callback(lambda t, k=key: _tts_inflight.pop(k, None))
+    return task
+
+
+def _prefetch_tts(text: str) -> dict:
+    """
+    안내 음성을 백그라운드에서 미리 합성해 캐시에 넣고 오디오 핸들을 반환합니다.
+    핸들의 url(GET /api/tts)은 캐시에서 바로 응답하며, 합성이 아직 진행 중이면 그 결과를 기다립니다.
+    """
+    if _tts and tts_cache and _tts.is_initialized():
+        _start_synthesis(text, _tts_cache_key(text))
+    return {"text": text, "url": "/api/tts?" + urlencode({"text": text})}
+
+
+def _cached_audio_headers(key: str) -> dict:
+    return {"ETag": tts_cache.etag(key), "Cache-Control": tts_cache.cache_control()}
+
+
+async def prewarm_tts_cache() -> None:
+    """설정의 prewarm 문장들을 미리 합성해 캐시에 넣습니다. (이미 있으면 건너뜀)"""
+    if not (_tts and tts_cache and tts_cache.prewarm_texts):
+        return
+    warmed = 0
+    for text in tts_cache.prewarm_texts:
+        # 한 문장씩 순서대로 합성 (shield: prewarm이 취소되어도 이 작업을 기다리는 /api/tts 요청은 계속 진행)
+        task = _start_synthesis(text, _tts_cache_key(text))
+        if task is not None and await asyncio.shield(task):
+            warmed += 1
+    logger.info(f"TTS 캐시 prewarm 완료: 신규 {warmed}건 / 대상 {len(tts_cache.prewarm_texts)}건")
+
+
 @app.post("/api/tts")
-async def tts_once(text: str = Form(...)):
+async def tts_once(request: Request, text: str = Form(...), stream: bool = Form(False)):
     """
-    프론트엔드에서 텍스트를 받아 음성 데이터(MP3)로 변환하여 반환합니다.
+    프론트엔드에서 텍스트를 받아 음성 데이터(MP3, 로컬 TTS는 WAV)로 변환하여 반환합니다.
+    stream=true이면 provider가 만드는 조각을 그대로 chunked 응답으로 흘려보내
+    전체 클립이 아니라 첫 조각 시점에 재생을 시작할 수 있습니다.
+    같은 문장/모델/목소리는 서버 TTS 캐시에서 바로 응답하며 ETag로 재검증할 수 있습니다.
     """
     try:
         # 텍스트 유효성 검사
@@ -327,8 +600,37 @@ async def tts_once(text: str = Form(...)):
             return JSONResponse({"error": "TTS 엔진이 준비되지 않았습니다."}, status_code=503)
         # --- 수정 완료 ---
 
-        # synthesize 메서드를 호출하여 음성 데이터를 바이트로 직접 받음
-        audio_bytes = _tts.synthesize(text)
+        # 서버 TTS 캐시: 반복 문장은 API 호출 없이 바로 응답
+        cache_key = _tts_cache_key(text) if tts_cache else None
+        if cache_key:
+            headers = _cached_audio_headers(cache_key)
+            if request.headers.get("if-none-match") == headers["ETag"] and tts_cache.contains(cache_key):
+                return Response(status_code=304, headers=headers)
+            pending = _tts_inflight.get(cache_key)
+            if pending is not None:
+                # /api/turn이 미리 합성 중인 문장이면 중복 호출 없이 그 결과를 기다림
+                await asyncio.shield(pending)
+            cached = await asyncio.to_thread(tts_cache.get, cache_key)
+            if cached:
+                logger.info(f"TTS 캐시 적중: '{text}' ({len(cached)} bytes)")
+                return Response(content=cached, media_type=_audio_media_type(cached), headers=headers)
+
+        if stream:
+            # 첫 조각까지는 미리 받아 두어야 provider 오류를 502로 돌려줄 수 있음
+            chunks = _tts.synthesize_stream(text)
+            with span("tts_first_chunk"):
+                first = await asyncio.to_thread(next, chunks, b"")
+            if not first:
+                logger.error("TTS 스트리밍 결과가 비어있습니다.")
+                return JSONResponse({"error": "TTS 변환에 실패했습니다."}, status_code=502)
+            return StreamingResponse(
+                _guard_stream(text, itertools.chain([first], chunks), cache_key),
+                media_type=_audio_media_type(first),
+            )
+
+        # synthesize 메서드를 호출하여 음성 데이터를 바이트로 직접 받음 (이벤트 루프를 막지 않도록 스레드에서)
+        with span("tts"):
+            audio_bytes = await asyncio.to_thread(_tts.synthesize, text)
 
         # --- TTS 문제 해결: 오디오 바이트 유효성 검사 ---
         if not audio_bytes or len(audio_bytes) == 0:
@@ -336,10 +638,14 @@ async def tts_once(text: str = Form(...)):
             return JSONResponse({"error": "TTS 변환에 실패했습니다."}, status_code=502)
         # --- 수정 완료 ---
 
-        # gTTS는 mp3를 생성하므로 media_type을 'audio/mpeg'로 설정
+        # OpenAI TTS는 mp3, 로컬 MeloTTS는 wav를 생성하므로 실제 형식으로 media_type 설정
         # FastAPI의 Response 객체를 사용하여 바이트 데이터를 직접 전송
         logger.info(f"TTS 변환 완료: '{text}' ({len(audio_bytes)} bytes)")
-        return Response(content=audio_bytes, media_type="audio/mpeg")
+        media_type = _audio_media_type(audio_bytes)
+        if cache_key and _cacheable(audio_bytes):
+            await asyncio.to_thread(tts_cache.put, cache_key, audio_bytes)
+            return Response(content=audio_bytes, media_type=media_type, headers=_cached_audio_headers(cache_key))
+        return Response(content=audio_bytes, media_type=media_type)
 
     except TTSError as e:
         logger.error(f"TTS 변환 오류: {e}")
@@ -347,3 +653,182 @@ async def tts_once(text: str = Form(...)):
     except Exception as e:
         logger.error(f"TTS 처리 중 알 수 없는 오류: {e}")
         return JSONResponse({"error": "알 수 없는 TTS 오류가 발생했습니다."}, status_code=500)
+
+
+@app.get("/api/tts")
+async def tts_stream(request: Request, text: str):
+    """
+    <audio src="/api/tts?text=..."> 처럼 브라우저가 직접 재생할 수 있는 스트리밍 TTS.
+    응답이 도착하는 대로 재생이 시작됩니다.
+    """
+    return await tts_once(request=request, text=text, stream=True)
+
+
+# --- 한 번의 왕복으로 처리하는 음성 턴 (/api/turn) ---
+# 화면별 안내 멘트 (프론트엔드 App.js의 상태 진입 멘트와 동일해야 캐시를 함께 씀)
+SCREEN_SPEECH = {
+    "FESTIVAL": "서울시 행사 정보를 알려드립니다.",
+    "WEATHER_VIEW": "현재 날씨와 주간 예보를 알려드립니다.",
+    "PIN_INPUT": "주민등록번호 열 세자리를 입력해주세요.",
+    "UNRECOGNIZED": "죄송해요. 잘 이해하지 못했어요. 다시 한번 말씀해 주세요.",
+}
+DOCUMENT_NAMES = [
+    ("등본", "주민등록등본"),
+    ("초본", "주민등록초본"),
+    ("가족관계", "가족관계증명서"),
+    ("건강보험", "건강보험자격득실확인서"),
+]
+_turn_cfg = (config or {}).get("turn") or {}
+TURN_SPECULATE = bool(_turn_cfg.get("speculate", True))
+TURN_SUMMARY_WAIT_SEC = float(_turn_cfg.get("summary_wait_sec", 2.0))
+
+
+def _screen_for(summary: str) -> tuple[str, str]:
+    """의도 요약 → (화면, 목적). 프론트엔드 routeKioskRequest()와 같은 규칙입니다."""
+    if "축제" in summary or "행사" in summary:
+        return "FESTIVAL", summary
+    if "날씨" in summary:
+        return "WEATHER_VIEW", summary
+    for key, doc_name in DOCUMENT_NAMES:
+        if key in summary:
+            return "PIN_INPUT", doc_name
+    return "UNRECOGNIZED", ""
+
+
+def _elapsed_ms(start: float) -> int:
+    return round((time.perf_counter() - start) * 1000)
+
+
+async def _turn_events(request: Request, text: str, city: str, summary_wait: float) -> AsyncIterator[tuple[str, dict]]:
+    """
+    STT 이후의 턴 처리 단계를 (이벤트, 데이터)로 내보냅니다.
+    키워드 라우터의 후보 라벨로 다음 화면을 미리 짐작해, 의도 확정(LLM)을 기다리는 동안
+    날씨 조회(+AI 요약 예약)와 안내 음성 합성을 병렬로 시작합니다. 짐작이 틀리면 날씨 조회는 취소합니다.
+    """
+    start = time.perf_counter()
+    api_key = os.getenv("OPENWEATHER_API_KEY")
+    route = keyword_router.route(text)
+    # 후보 라벨이 여러 개면(예: "날씨랑 축제") 후보 화면 모두를 미리 준비
+    hints = {_screen_for(label)[0] for label in route.candidates} - {"UNRECOGNIZED"}
+
+    weather_task: asyncio.Task | None = None
+    if TURN_SPECULATE:
+        for hint in hints:
+            _prefetch_tts(SCREEN_SPEECH[hint])
+        if "WEATHER_VIEW" in hints and api_key:
+            weather_task = asyncio.create_task(load_weather(city, api_key, defer_summary=True))
+
+    try:
+        intent = await _resolve_intent(request, text, route)
+        yield "intent", {**intent, "ms": _elapsed_ms(start)}
+
+        screen, purpose = _screen_for(intent.get("summary") or text)
+        payload: dict = {"keyword": text}
+        speech = [_prefetch_tts(SCREEN_SPEECH[screen])] if screen in SCREEN_SPEECH else []
+        summary_key = None
+        if screen == "WEATHER_VIEW":
+            if not api_key:
+                raise RuntimeError("Weather API key is not configured")
+            if weather_task is None:
+                weather_task = asyncio.create_task(load_weather(city, api_key, defer_summary=True))
+            weather_data = await weather_task
+            meta = weather_data.get("_meta") or {}
+            summary_key = meta.get("ai_summary_key")
+            if summary_key and summary_wait > 0:
+                # 짧게 기다려 요약이 나오면 한 번에 응답 (안 나오면 키만 주고 후속 요청/이벤트로)
+                ai_summary = await weather_summarizer.wait(summary_key, timeout=summary_wait)
+                if ai_summary:
+                    meta.update(ai_summary_ko=ai_summary, ai_summary_status="ready")
+                    meta.pop("ai_summary_key", None)
+                    summary_key = None
+            payload.update(weatherData=weather_data, weatherAiSummary=meta.get("ai_summary_ko", ""),
+                           weatherSummaryKey=summary_key)
+            if meta.get("ai_summary_ko"):
+                speech.append(_prefetch_tts(meta["ai_summary_ko"]))
+
+        yield "screen", {
+            "screen": screen,
+            "purpose": purpose,
+            "payload": payload,
+            "speech": speech,
+            "speculation": {"hints": sorted(hints), "hit": screen in hints},
+            "ms": _elapsed_ms(start),
+        }
+
+        if summary_key:
+            ai_summary = await weather_summarizer.wait(summary_key, timeout=SUMMARY_WAIT_MAX)
+            yield "weather_summary", {
+                "ai_summary_ko": ai_summary or "",
+                "speech": [_prefetch_tts(ai_summary)] if ai_summary else [],
+                "ms": _elapsed_ms(start),
+            }
+    finally:
+        if weather_task is not None and not weather_task.done():
+            weather_task.cancel()
+
+
+@app.post("/api/turn")
+async def voice_turn(request: Request, file: UploadFile | None = File(None), text: str | None = Form(None),
+                     city: str = Form("Seoul"), stream: bool = Form(False)):
+    """
+    음성 한 턴을 한 번의 요청으로 처리합니다: STT → 의도 → 화면 결정 → (날씨 조회, 안내 음성 합성).
+    - file: 녹음 오디오 (또는 text: 화면에서 입력한 텍스트, STT 생략)
+    - 응답: transcript, intent, screen/purpose/payload, speech(오디오 핸들 = GET /api/tts URL 목록), timings
+    - stream=true: 단계가 끝나는 대로 NDJSON 이벤트(transcript → intent → screen → weather_summary → done)를 보냅니다.
+    """
+    start = time.perf_counter()
+    audio_info: dict = {}
+    if file is not None:
+        not_ready = _stt_not_ready()
+        if not_ready:
+            return not_ready
+        try:
+            raw_bytes = await file.read()
+            if len(raw_bytes) == 0:
+                return JSONResponse({"error": "오디오 파일이 비어있습니다."}, status_code=400)
+            text, audio_info = await _speech_to_text(raw_bytes, file.content_type)
+        except Exception as e:
+            return _stt_error_response(e)
+    if not text or not text.strip():
+        return JSONResponse({"error": "오디오 또는 텍스트가 필요합니다."}, status_code=400)
+    stt_ms = _elapsed_ms(start)
+    print("📨 턴 입력:", text)
+
+    if stream:
+        async def ndjson():
+            yield json.dumps({"event": "transcript", "text": text, "audio": audio_info, "ms": stt_ms},
+                             ensure_ascii=False) + "\n"
+            try:
+                async for event, data in _turn_events(request, text, city, summary_wait=0):
+                    yield json.dumps({"event": event, **data}, ensure_ascii=False) + "\n"
+            except ClientDisconnected:
+                logger.info("클라이언트 연결이 끊겨 턴 처리를 취소했습니다.")
+                return
+            except Exception as e:
+                logger.error(f"턴 처리 오류: {e}")
+                yield json.dumps({"event": "error", "error": str(e)}, ensure_ascii=False) + "\n"
+            yield json.dumps({"event": "done", "ms": _elapsed_ms(start)}) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    result: dict = {"text": text, "audio": audio_info}
+    timings = {"stt_ms": stt_ms}
+    try:
+        async with aclosing(_turn_events(request, text, city, summary_wait=TURN_SUMMARY_WAIT_SEC)) as events:
+            async for event, data in events:
+                timings[f"{event}_ms"] = data.pop("ms")
+                if event == "intent":
+                    result["intent"] = data
+                elif event == "screen":
+                    result.update(data)
+                    # 단일 응답에서는 요약을 더 기다리지 않고 키만 넘김 (프론트엔드가 /weather/summary로 롱폴링)
+                    break
+    except ClientDisconnected:
+        logger.info("클라이언트 연결이 끊겨 턴 처리를 취소했습니다.")
+        return Response(status_code=499)
+    except Exception as e:
+        logger.error(f"턴 처리 오류: {e}")
+        return JSONResponse({"error": "요청을 처리하는 중 문제가 발생했습니다.", "text": text}, status_code=502)
+    timings["total_ms"] = _elapsed_ms(start)
+    result["timings"] = timings
+    return result
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+from loguru import logger
+
+# ---- 기본값 ----
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+REQUEST_ID_HEADER = "X-Request-ID"
+MAX_REQUEST_ID_LEN = 64
+
+# 요청 단위 컨텍스트: asyncio 태스크/asyncio.to_thread로 자동 전파됩니다.
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+_timings_var: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("stage_timings", default=None)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (라벨 조합별 누적 버킷 카운트 + 합계)."""
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # [버킷별 카운트..., +Inf, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0.0] * (len(self.buckets) + 2)
+            series[idx] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative:g}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {series[-1]:.6f}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative:g}")
+        return lines
+
+
+class Gauge:
+    """수집 시점에 콜백으로 값을 읽는 게이지 (대기열 깊이 등)."""
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        self.name, self.help, self.read = name, help_text, read
+
+    def render(self) -> List[str]:
+        try:
+            value = float(self.read())
+        except Exception:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {value:g}"]
+
+
+class MetricsRegistry:
+    """
+    prometheus_client 없이 쓰는 최소 메트릭 레지스트리.
+    render()는 Prometheus 텍스트 형식(0.0.4)을 만듭니다.
+    """
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], float]) -> Gauge:
+        # 같은 이름이면 최신 콜백으로 교체 (모듈 재로딩 대비)
+        self._metrics[name] = Gauge(name, help_text, read)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+STAGE_SECONDS = registry.histogram(
+    "kiosk_stage_seconds", "Voice pipeline stage latency (seconds)", ["stage"])
+STAGE_ERRORS = registry.counter(
+    "kiosk_stage_errors_total", "Voice pipeline stage failures", ["stage"])
+UPSTREAM_SECONDS = registry.histogram(
+    "kiosk_upstream_seconds", "Upstream HTTP call latency until response headers (seconds)",
+    ["upstream", "method", "endpoint", "status"])
+LLM_TOKENS = registry.counter(
+    "kiosk_llm_tokens_total", "LLM tokens by task and kind (prompt, cached, completion)", ["task", "model", "kind"])
+LLM_CALLS = registry.counter("kiosk_llm_calls_total", "LLM calls with usage reported", ["task", "model"])
+HTTP_SECONDS = registry.histogram(
+    "kiosk_http_request_seconds", "HTTP request latency until response headers (seconds)",
+    ["method", "route", "status"])
+
+
+# ---------------- 요청 컨텍스트 / 스팬 ----------------
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """클라이언트가 보낸 X-Request-ID를 그대로 쓰고, 없으면 새로 만듭니다."""
+    if incoming:
+        incoming = incoming.strip()[:MAX_REQUEST_ID_LEN]
+        if incoming.isprintable():
+            return incoming
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def request_context(request_id: str) -> Iterator[List[Tuple[str, float]]]:
+    """요청 ID와 단계별 소요 시간 목록을 현재 컨텍스트에 설정합니다. (목록은 Server-Timing 헤더용)"""
+    timings: List[Tuple[str, float]] = []
+    rid_token = request_id_var.set(request_id)
+    timings_token = _timings_var.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings_var.reset(timings_token)
+        request_id_var.reset(rid_token)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = _timings_var.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    with span("stt"): ... 구간의 소요 시간을 히스토그램과 현재 요청의 Server-Timing에 기록합니다.
+    async 함수 안에서도 await를 감싸 그대로 사용할 수 있습니다.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        record_stage(stage, elapsed)
+        logger.debug(f"span {stage}: {elapsed * 1000:.1f}ms")
+
+
+def server_timing(timings: Sequence[Tuple[str, float]], total: Optional[float] = None) -> str:
+    """Server-Timing 헤더 값 (예: "transcode;dur=41.2, stt;dur=812.0, total;dur=905.3")."""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def install_log_context() -> None:
+    """모든 loguru 로그 레코드의 extra["request_id"]에 현재 요청 ID를 넣습니다."""
+    logger.configure(patcher=lambda record: record["extra"].update(request_id=request_id_var.get()))
+
+
+def record_llm_usage(task: str, model: str, usage) -> Dict[str, int]:
+    """
+    OpenAI 응답의 usage를 토큰 카운터에 기록하고 {"prompt", "cached", "completion"}을 반환합니다.
+    chat.completions(prompt_tokens/completion_tokens)와 responses(input_tokens/output_tokens) 형식을 모두 받습니다.
+    cached는 provider 프롬프트 캐시에서 재사용된 prompt 토큰 수입니다.
+    """
+    if usage is None:
+        return {}
+    prompt = getattr(usage, "prompt_tokens", None)
+    if prompt is None:
+        prompt = getattr(usage, "input_tokens", 0)
+    completion = getattr(usage, "completion_tokens", None)
+    if completion is None:
+        completion = getattr(usage, "output_tokens", 0)
+    details = getattr(usage, "prompt_tokens_details", None) or getattr(usage, "input_tokens_details", None)
+    counts = {"prompt": int(prompt or 0), "cached": int(getattr(details, "cached_tokens", 0) or 0),
+              "completion": int(completion or 0)}
+    LLM_CALLS.inc(task, model)
+    for kind, amount in counts.items():
+        LLM_TOKENS.inc(task, model, kind, amount=amount)
+    logger.debug(f"LLM {task} 토큰: {counts}")
+    return counts
+
+
+# ---------------- upstream(httpx) 계측 ----------------
+_START_KEY = "kiosk_start"
+
+
+def _on_request(request: httpx.Request) -> None:
+    rid = request_id_var.get()
+    if rid != "-":
+        # upstream 로그/지원 요청과 대조할 수 있도록 요청 ID를 전달
+        request.headers[REQUEST_ID_HEADER] = rid
+    request.extensions[_START_KEY] = time.perf_counter()
+
+
+def _on_response(upstream: str, response: httpx.Response) -> None:
+    request = response.request
+    start = request.extensions.get(_START_KEY)
+    if start is None or request.method == "HEAD":  # keep-alive ping은 제외
+        return
+    elapsed = time.perf_counter() - start
+    UPSTREAM_SECONDS.observe(elapsed, upstream, request.method, request.url.path, str(response.status_code))
+    record_stage(f"upstream_{upstream}", elapsed)
+
+
+def upstream_hooks(upstream: str) -> Dict[str, list]:
+    """동기 httpx.Client용 event_hooks."""
+    return {"request": [_on_request], "response": [lambda response: _on_response(upstream, response)]}
+
+
+def async_upstream_hooks(upstream: str) -> Dict[str, list]:
+    """httpx.AsyncClient용 event_hooks (훅도 코루틴이어야 함)."""
+    async def on_request(request: httpx.Request) -> None:
+        _on_request(request)
+
+    async def on_response(response: httpx.Response) -> None:
+        _on_response(upstream, response)
+
+    return {"request": [on_request], "response": [on_response]}
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from Utility.STT_TTS.def_interface import ISTT
+
+# ---- Config 기본값 ----
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_WAIT_MS = 30       # 첫 요청 도착 후 배치를 더 모으는 최대 시간
+DEFAULT_QUEUE_SIZE = 64
+
+
+class STTBatcher:
+    """
+    ISTT 앞단의 동적 마이크로 배칭 스케줄러.
+    - 요청을 대기열에 모았다가 max_batch_size개가 차거나 max_wait_ms가 지나면 한 번에 transcribe_batch()로 실행합니다.
+    - 결과는 각 요청자의 Future로 돌려줍니다.
+    - 추론은 스레드 하나에서 배치 단위로 순차 실행되므로, 몇 ms의 대기로 같은 CPU에서 처리량을 늘립니다.
+    """
+    def __init__(self, stt: ISTT, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.stt = stt
+        self.max_batch_size = max(1, int(config.get("max_batch_size", DEFAULT_MAX_BATCH_SIZE)))
+        self.max_wait = float(config.get("max_wait_ms", DEFAULT_MAX_WAIT_MS)) / 1000
+        self.queue_size = int(config.get("queue_size", DEFAULT_QUEUE_SIZE))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # 메트릭
+        self.batches = 0
+        self.items = 0
+        self.batch_sizes: Counter = Counter()
+        self._wait_total = 0.0
+        self._infer_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"STT 배칭 시작 (max_batch={self.max_batch_size}, max_wait={self.max_wait * 1000:.0f}ms)")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._queue:
+            while not self._queue.empty():
+                _, fut, _ = self._queue.get_nowait()
+                if not fut.done():
+                    fut.cancel()
+
+    async def transcribe(self, audio_bytes: bytes) -> str:
+        if self._task is None or self._queue is None:
+            raise RuntimeError("STT 배칭 스케줄러가 시작되지 않았습니다.")
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        # 대기열이 가득 차면 자리가 날 때까지 기다림 (요청 취소 시 함께 취소)
+        await self._queue.put((audio_bytes, fut, time.perf_counter()))
+        return await fut
+
+    async def _collect(self) -> List[Tuple[bytes, asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        # 이미 취소된 요청(연결 끊김 등)은 추론에서 제외
+        return [item for item in batch if not item[1].done()]
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+            started = time.perf_counter()
+            try:
+                texts = await asyncio.to_thread(self.stt.transcribe_batch, [audio for audio, _, _ in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(e)
+                else:
+                    # 한 요청의 오류가 배치 전체를 실패시키지 않도록 단건으로 다시 처리
+                    logger.warning(f"STT 배치 실패, 단건으로 재시도합니다: {e}")
+                    await self._run_each(batch)
+                continue
+            finally:
+                self._record(batch, started)
+            for (_, fut, _), text in zip(batch, texts):
+                if not fut.done():
+                    fut.set_result(text)
+
+    async def _run_each(self, batch: List[Tuple[bytes, asyncio.Future, float]]) -> None:
+        for audio, fut, _ in batch:
+            if fut.done():
+                continue
+            try:
+                text = await asyncio.to_thread(self.stt.transcribe, audio)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+                continue
+            if not fut.done():
+                fut.set_result(text)
+
+    def _record(self, batch: List[Tuple[bytes, asyncio.Future, float]], started: float) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        self.batch_sizes[len(batch)] += 1
+        self._wait_total += sum(started - enqueued for _, _, enqueued in batch)
+        self._infer_total += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_size_hist": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+            "avg_queue_wait_ms": round(self._wait_total / self.items * 1000, 2) if self.items else 0.0,
+            "avg_batch_infer_ms": round(self._infer_total / self.batches * 1000, 2) if self.batches else 0.0,
+        }
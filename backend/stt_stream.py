@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import numpy as np
+from fastapi import WebSocket, WebSocketDisconnect
+from loguru import logger
+
+from Utility.STT_TTS.def_interface import ISTT, IVAD
+from transcoder import AudioTranscoder, pcm16_to_wav, TARGET_RATE
+
+# ---- Config 기본값 ----
+DEFAULT_PRE_ROLL_MS = 300          # 트리거 이전에 함께 보낼 오디오 (첫 음절 잘림 방지)
+DEFAULT_MIN_SILENCE_MS = 800       # 이 시간 이상 무음이면 발화 종료로 판단
+DEFAULT_MAX_UTTERANCE_MS = 15000   # 안전장치: 최대 발화 길이
+DEFAULT_NO_SPEECH_TIMEOUT_MS = 8000  # 말이 시작되지 않으면 빈 결과로 종료
+READ_CHUNK = 4096
+
+
+class Endpointer:
+    """
+    16kHz mono PCM을 프레임 단위로 IVAD에 넣어 발화 시작/종료(endpoint)를 판정합니다.
+    VAD 구현의 process_frame()만 사용하므로 마이크 스트림과 무관하게 동작합니다.
+    """
+    def __init__(self, vad: IVAD, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        if vad.frame_sample_rate != TARGET_RATE:
+            raise ValueError(f"VAD 샘플링 레이트({vad.frame_sample_rate})가 스트림({TARGET_RATE})과 다릅니다.")
+        self.vad = vad
+        self.frame_len = vad.frame_length
+        self.threshold = float(config.get("threshold", getattr(vad, "threshold", 0.5)))
+        frame_ms = 1000 * self.frame_len / TARGET_RATE
+        self.pre_roll_frames = int(config.get("pre_roll_ms", DEFAULT_PRE_ROLL_MS) // frame_ms)
+        self.min_silence_frames = int(config.get("min_silence_duration_ms", DEFAULT_MIN_SILENCE_MS) // frame_ms)
+        self.max_frames = int(config.get("max_utterance_ms", DEFAULT_MAX_UTTERANCE_MS) // frame_ms)
+        self.no_speech_frames = int(config.get("no_speech_timeout_ms", DEFAULT_NO_SPEECH_TIMEOUT_MS) // frame_ms)
+
+        self._pending = bytearray()
+        self._pre_roll: deque = deque(maxlen=max(self.pre_roll_frames, 1))
+        self._speech: list = []
+        self._silence = 0
+        self._frames_seen = 0
+        self.triggered = False
+        self.ended = False
+
+    def feed(self, pcm: bytes) -> bool:
+        """PCM 조각을 추가합니다. endpoint가 감지되면 True를 반환합니다."""
+        if self.ended:
+            return True
+        self._pending.extend(pcm)
+        frame_bytes = self.frame_len * 2
+        while len(self._pending) >= frame_bytes and not self.ended:
+            raw = bytes(self._pending[:frame_bytes])
+            del self._pending[:frame_bytes]
+            self._process(raw)
+        return self.ended
+
+    def _process(self, raw: bytes) -> None:
+        self._frames_seen += 1
+        prob = self.vad.process_frame(np.frombuffer(raw, dtype=np.int16))
+        if not self.triggered:
+            self._pre_roll.append(raw)
+            if prob > self.threshold:
+                self.triggered = True
+                self._speech.extend(self._pre_roll)
+                self._pre_roll.clear()
+            elif self._frames_seen >= self.no_speech_frames:
+                self.ended = True
+            return
+        self._speech.append(raw)
+        self._silence = 0 if prob > self.threshold else self._silence + 1
+        if self._silence > self.min_silence_frames or len(self._speech) >= self.max_frames:
+            self.ended = True
+
+    def finish(self) -> None:
+        """입력이 끝났을 때(클라이언트 'end') 남은 데이터로 발화를 마감합니다."""
+        if self.triggered and self._pending:
+            self._speech.append(bytes(self._pending))
+        self._pending.clear()
+        self.ended = True
+
+    def utterance(self) -> bytes:
+        return b"".join(self._speech) if self.triggered else b""
+
+
+def _is_end_message(text: Optional[str]) -> bool:
+    """'end' 또는 {"type": "end"} 제어 메시지인지 확인합니다."""
+    if not text:
+        return False
+    if text.strip() == "end":
+        return True
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get("type") == "end"
+
+
+async def _pump_decoder(proc: asyncio.subprocess.Process, endpointer: Endpointer,
+                        websocket: WebSocket) -> None:
+    """ffmpeg stdout(PCM)을 읽어 endpointer에 공급합니다."""
+    while True:
+        chunk = await proc.stdout.read(READ_CHUNK)
+        if not chunk:
+            endpointer.finish()
+            return
+        was_triggered = endpointer.triggered
+        done = endpointer.feed(chunk)
+        if endpointer.triggered and not was_triggered:
+            await websocket.send_json({"type": "speech_start"})
+        if done:
+            return
+
+
+async def _pump_client(proc: asyncio.subprocess.Process, websocket: WebSocket) -> None:
+    """클라이언트가 보낸 opus/webm 조각을 ffmpeg stdin으로 흘려보냅니다."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        data = message.get("bytes")
+        if data:
+            proc.stdin.write(data)
+            await proc.stdin.drain()
+            continue
+        if _is_end_message(message.get("text")):
+            # 녹음 종료: stdin을 닫으면 ffmpeg가 남은 데이터를 모두 내보낸 뒤 EOF
+            proc.stdin.close()
+            return
+
+
+async def run_stream_session(websocket: WebSocket, stt: ISTT, vad: IVAD,
+                             transcoder: AudioTranscoder, config: Optional[Dict[str, Any]] = None,
+                             transcribe: Optional[Callable[[bytes], Awaitable[str]]] = None) -> None:
+    """
+    WebSocket 한 연결 = 발화 한 번.
+    조각이 도착하는 즉시 디코딩/VAD를 진행하고, endpoint 순간 STT를 시작해 결과를 돌려줍니다.
+    transcribe를 넘기면(예: 배칭 스케줄러) stt.transcribe 대신 사용합니다.
+    """
+    endpointer = Endpointer(vad, config)
+    proc = await transcoder.open_stream()
+    decoder = asyncio.create_task(_pump_decoder(proc, endpointer, websocket))
+    client = asyncio.create_task(_pump_client(proc, websocket))
+    try:
+        # 클라이언트 입력이 끝나도(end) 디코더가 남은 PCM을 다 처리할 때까지 기다림
+        done, _ = await asyncio.wait({decoder, client}, return_when=asyncio.FIRST_COMPLETED)
+        if client in done:
+            client.result()  # 연결 끊김이면 여기서 예외 전파
+            await decoder
+        else:
+            decoder.result()
+        await websocket.send_json({"type": "endpoint"})
+    finally:
+        for task in (decoder, client):
+            if not task.done():
+                task.cancel()
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+    pcm = endpointer.utterance()
+    if not pcm:
+        logger.info("스트리밍 STT: 음성이 감지되지 않았습니다.")
+        await websocket.send_json({"type": "final", "text": ""})
+        return
+
+    logger.info(f"스트리밍 STT: endpoint 감지 ({len(pcm) / (2 * TARGET_RATE):.2f}s), STT 시작")
+    wav = pcm16_to_wav(pcm)
+    text = await transcribe(wav) if transcribe is not None else await asyncio.to_thread(stt.transcribe, wav)
+    await websocket.send_json({"type": "final", "text": text})
+
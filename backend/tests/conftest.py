@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# backend/ 모듈을 `python -m pytest backend/tests`로 바로 import할 수 있도록 경로 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
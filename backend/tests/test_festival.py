@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import random
+
+import pytest
+
+from festival import OPEN_END, FestivalTable, normalize_region, parse_ymd
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        start = 20250101 + rng.randrange(0, 12) * 100 + rng.randrange(0, 28)
+        end = start + rng.choice([0, 1, 5, 20, 100])  # +100 = 다음 달 (연말이면 다음 해)
+        if rng.random() < 0.1:
+            start_text, end_text = "", ""           # 날짜 미정
+        elif rng.random() < 0.1:
+            start_text, end_text = f"{start}.0", ""  # 종료일 미정
+        else:
+            start_text, end_text = f"{start}.0", str(end)
+        rows.append({
+            "축제명": f"축제{i:03d}",
+            "시작일_정리": start_text,
+            "종료일_정리": end_text,
+            "위치": rng.choice(["서울", "부산", ""]),
+            "소재지도로명주소": rng.choice(["서울특별시 중구 세종대로 110", "부산광역시 해운대구 우동"]),
+        })
+    return rows
+
+
+def brute_force(table, date_from, date_to, region=None):
+    """색인 없이 모든 행을 검사한 기준 결과."""
+    return [
+        i for i in range(len(table))
+        if table.end[i] >= date_from
+        and (table.start[i] == 0 or table.start[i] <= date_to)
+        and (not region or table.regions[table.region[i]] == region)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_query_matches_brute_force(seed):
+    table = FestivalTable(make_rows(200, seed), version="test")
+    rng = random.Random(seed)
+    for _ in range(200):
+        a = 20241201 + rng.randrange(0, 15) * 100 + rng.randrange(0, 28)
+        b = a + rng.choice([0, 3, 30, 300])
+        date_to = rng.choice([b, OPEN_END])
+        region = rng.choice([None, "서울", "부산", "제주"])
+        assert table.query(a, date_to, region).tolist() == brute_force(table, a, date_to, region)
+
+
+def test_rows_sorted_by_start_with_undated_last():
+    table = FestivalTable(make_rows(100), version="test")
+    dated = table.start[:table.dated].tolist()
+    assert dated == sorted(dated) and 0 not in dated
+    assert (table.start[table.dated:] == 0).all()
+
+
+def test_empty_table():
+    table = FestivalTable([], version="empty")
+    assert table.query(20250101, OPEN_END).tolist() == []
+
+
+def test_region_falls_back_to_address():
+    rows = [{"축제명": "a", "위치": "", "소재지도로명주소": "부산광역시 해운대구 우동", "시작일_정리": "20250101"}]
+    table = FestivalTable(rows, version="test")
+    assert table.record(0)["region"] == "부산"
+    assert table.record(0)["end"] is None
+
+
+@pytest.mark.parametrize("values, expected", [
+    (("20250301.0",), 20250301),
+    (("2025-03-01",), 20250301),
+    (("", "20250301"), 20250301),
+    (("20250231",), None),
+    (("",), None),
+])
+def test_parse_ymd(values, expected):
+    assert parse_ymd(*values) == expected
+
+
+def test_normalize_region():
+    assert normalize_region("서울특별시 성동구 왕십리로") == "서울"
+    assert normalize_region("부산광역시") == "부산"
+    assert normalize_region("") == ""
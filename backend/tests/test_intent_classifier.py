@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from intent_classifier import IntentClassifier
+from keyword_router import UNKNOWN_LABEL
+
+KEYWORDS = {
+    "주민등록등본": "주민등록등본 발급 요청",
+    "등본": "주민등록등본 발급 요청",
+    "가족관계증명서": "가족관계증명서 발급 요청",
+    "날씨": "날씨 정보 요청",
+    "축제": "축제 정보 요청",
+}
+PROMPT = '''
+- "등본 뽑아줘" → "주민등록등본 발급 요청"
+- "등본 한 통 떼 주세요" → "주민등록등본 발급 요청"
+- "가족관계증명서 필요해요" → "가족관계증명서 발급 요청"
+- "오늘 날씨 어때" → "날씨 정보 요청"
+- "비 와요?" → "날씨 정보 요청"
+- "이번 주 축제 뭐 있어" → "축제 정보 요청"
+- "근처 행사 알려줘" → "축제 정보 요청"
+- "배고파" → "민원 목적을 알 수 없음"
+'''
+
+
+@pytest.fixture
+def classifier():
+    return IntentClassifier.from_tables(KEYWORDS, PROMPT)
+
+
+@pytest.mark.parametrize("text, label", [
+    ("등본 뽑아 주세요", "주민등록등본 발급 요청"),
+    ("오늘 날씨 어때요", "날씨 정보 요청"),
+    ("이번 주에 축제 뭐 있어요", "축제 정보 요청"),
+])
+def test_accepts_known_utterances(classifier, text, label):
+    prediction = classifier.predict(text)
+    assert prediction.accepted
+    assert prediction.label == label
+    assert prediction.confidence >= classifier.threshold
+
+
+@pytest.mark.parametrize("text", ["블록체인 스마트 컨트랙트 배포", "qwerty zxcv"])
+def test_out_of_domain_falls_back_to_llm(classifier, text):
+    prediction = classifier.predict(text)
+    assert not prediction.accepted
+
+
+def test_empty_input_falls_back(classifier):
+    prediction = classifier.predict("?!")
+    assert prediction.label is None and not prediction.accepted
+    assert classifier.stats()["fallbacks"] == 1
+
+
+def test_learn_updates_only_known_labels(classifier):
+    before = classifier._centroids.copy()
+    assert not classifier.learn("여권 재발급 받으려면", "여권 발급 요청")
+    assert (classifier._centroids == before).all()
+
+    assert classifier.learn("등본 출력해 주세요", "주민등록등본 발급 요청")
+    changed = (classifier._centroids != before).any(axis=1)
+    assert changed.tolist() == [label == "주민등록등본 발급 요청" for label in classifier.labels]
+    assert classifier.stats()["learned"] == 1
+
+
+def test_learn_can_be_disabled():
+    classifier = IntentClassifier.from_tables(KEYWORDS, PROMPT, {"learn_online": False})
+    assert not classifier.learn("등본 출력해 주세요", "주민등록등본 발급 요청")
+
+
+def test_refit_drops_unknown_labels(classifier):
+    labels = set(classifier.labels)
+    examples = classifier.num_examples
+    classifier.refit([("등본 출력", "주민등록등본 발급 요청"), ("여권 재발급", "여권 발급 요청")])
+    assert set(classifier.labels) == labels
+    assert "여권 발급 요청" not in classifier.labels
+    assert classifier.num_examples == examples + 1
+
+
+def test_unknown_label_is_a_class(classifier):
+    assert UNKNOWN_LABEL in classifier.labels
+
+
+# ---- 운영 사전(intent_tables) 기준 보정 확인 ----
+# 기본 임계값(min_similarity/min_margin/filler_weight)은 아래 보류(held-out) 발화로 골랐습니다.
+# 분포 밖 발화나 다른 라벨과 표현만 겹치는 발화는 확정되면 안 되고(→ LLM), 확정한 것은 맞아야 합니다.
+IN_DOMAIN = [
+    ("토지대장 발급해 주세요", "토지(임야)대장 발급 요청"),
+    ("토지 대장 필요해요", "토지(임야)대장 발급 요청"),
+    ("여권 만들고 싶어요", "여권 발급 신청"),
+    ("여권 신청하려고요", "여권 발급 신청"),
+    ("주민등록증 재발급 해주세요", "주민등록증 재발급 요청"),
+    ("주민증 재발급", "주민등록증 재발급 요청"),
+    ("출입국 사실 증명서 주세요", "출입국 사실증명 발급 요청"),
+    ("출입국사실증명 발급", "출입국 사실증명 발급 요청"),
+    ("등본 때 주세요", "주민등록등본 발급 요청"),
+    ("초본 뽑아 주세요", "주민등록초본 발급 요청"),
+    ("가족 관계 증명 떼줘", "가족관계증명서 발급 요청"),
+    ("건강 보험 득실 확인", "건강보험득실확인서 발급 요청"),
+    ("임야대장 한 부 주세요", "토지(임야)대장 발급 요청"),
+    ("주민등록증 잃어버렸어요", "주민등록증 재발급 요청"),
+    ("내일 비 와요?", "날씨 정보 조회 요청"),
+    ("근처 축제 있어요?", "행사 정보 조회 요청"),
+]
+OUT_OF_DOMAIN = [
+    "운전면허 갱신하고 싶어요", "운전면허증 재발급 받고 싶어요", "여권 사진 어디서 찍어요",
+    "여권 사진 규격이 어떻게 돼요", "사업자등록증 발급해 주세요", "인감증명서 떼고 싶어요",
+    "토지 가격 알려줘", "전입신고 하려고요", "혼인신고 하고 싶어요", "자동차 등록 하고 싶어요",
+    "주차 과태료 내고 싶어요", "화장실 어디예요", "와이파이 비밀번호 알려줘",
+]
+CROSS_LABEL = [
+    ("출입국 기록 떼고 싶어", "출입국 사실증명 발급 요청"),
+]
+
+
+@pytest.fixture(scope="module")
+def production():
+    from intent_tables import LLM_PROMPT, MINWON_KEYWORDS
+    return IntentClassifier.from_tables(MINWON_KEYWORDS, LLM_PROMPT)
+
+
+def test_production_accepts_only_correct_labels(production):
+    accepted = 0
+    for text, label in IN_DOMAIN:
+        prediction = production.predict(text)
+        if prediction.accepted:
+            accepted += 1
+            assert prediction.label == label, text
+    # 확정하지 못한 발화는 LLM이 처리하므로 재현율보다 정확도를 우선하되, 절반 이상은 LLM 없이 끝나야 함
+    assert accepted >= len(IN_DOMAIN) // 2
+
+
+@pytest.mark.parametrize("text", OUT_OF_DOMAIN)
+def test_production_rejects_out_of_domain(production, text):
+    prediction = production.predict(text)
+    assert not prediction.accepted or prediction.label == UNKNOWN_LABEL
+
+
+@pytest.mark.parametrize("text, label", CROSS_LABEL)
+def test_production_does_not_confirm_other_labels(production, text, label):
+    prediction = production.predict(text)
+    assert not prediction.accepted or prediction.label == label
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+from keyword_router import KeywordRouter, UNKNOWN_LABEL, normalize_for_match, parse_few_shot_pairs
+
+KEYWORDS = {
+    "등본": "주민등록등본 발급 요청",
+    "초본": "주민등록초본 발급 요청",
+    "날씨": "날씨 정보 요청",
+}
+PROMPT = '''
+- "등본 뽑아줘" → "주민등록등본 발급 요청"
+- "오늘 점심 뭐 먹지" → "민원 목적을 알 수 없음"
+'''
+
+
+def make_router():
+    return KeywordRouter.from_tables(KEYWORDS, PROMPT)
+
+
+def test_normalize_strips_spaces_and_punctuation():
+    assert normalize_for_match(" 오늘 날씨, 어때?! ") == "오늘날씨어때"
+
+
+def test_parse_few_shot_pairs():
+    assert parse_few_shot_pairs(PROMPT) == [
+        ("등본 뽑아줘", "주민등록등본 발급 요청"),
+        ("오늘 점심 뭐 먹지", UNKNOWN_LABEL),
+    ]
+
+
+def test_single_label_is_confident():
+    result = make_router().route("등본 좀 떼고 싶어요")
+    assert result.confident
+    assert result.label == "주민등록등본 발급 요청"
+    assert result.keyword == "등본"
+
+
+def test_few_shot_example_matches_across_spacing():
+    result = make_router().route("등본뽑아 줘요")
+    assert result.confident
+    assert result.keyword == "등본 뽑아줘"
+
+
+def test_multiple_labels_are_not_confident():
+    result = make_router().route("등본이랑 초본 둘 다")
+    assert not result.confident
+    assert set(result.candidates) == {"주민등록등본 발급 요청", "주민등록초본 발급 요청"}
+
+
+def test_unknown_examples_are_not_routed():
+    router = make_router()
+    result = router.route("오늘 점심 뭐 먹지")
+    assert result.label is None and not result.confident
+    assert router.stats()["misses"] == 1
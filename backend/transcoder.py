@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import io
+import os
+import tempfile
+import wave
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from Utility.STT_TTS.def_exceptions import AudioConversionError, TranscoderBusyError
+
+# ---- Config 기본값 ----
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_TIMEOUT_SEC = 30.0
+DEFAULT_WAIT_MARGIN_SEC = 10.0  # 대기열 대기 + 프로세스 기동 여유 (to_wav 전체 대기 한도 = timeout + margin)
+TARGET_RATE = 16000
+TARGET_CHANNELS = 1
+# moov box가 파일 끝에 올 수 있어 파이프(비탐색) 입력으로는 demux할 수 없는 컨테이너 → 임시 파일로 변환
+SEEKABLE_MIME_TYPES = ("mp4", "m4a", "quicktime")
+
+
+def needs_seekable_input(input_bytes: bytes, mime: Optional[str] = None) -> bool:
+    """MIME 타입 또는 ISO BMFF 시그니처(ftyp)로 mp4/m4a/mov 입력인지 판별합니다."""
+    mime = (mime or "").lower()
+    return any(t in mime for t in SEEKABLE_MIME_TYPES) or input_bytes[4:8] == b"ftyp"
+
+
+def pcm16_to_wav(pcm: bytes, sample_rate: int = TARGET_RATE, channels: int = TARGET_CHANNELS) -> bytes:
+    """raw PCM(s16le)에 WAV 헤더를 붙입니다. (파이프 출력은 ffmpeg가 헤더 크기를 되돌아가 쓸 수 없음)"""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+
+class AudioTranscoder:
+    """
+    ffmpeg stdin/stdout 파이프 기반 오디오 변환 서비스.
+    - 임시 파일 없이 메모리에서 webm/ogg 등 → 16kHz mono WAV로 변환합니다.
+    - 워커마다 ffmpeg 프로세스를 미리 띄워두고(warm), 작업이 끝나면 즉시 다음 프로세스를 준비하여
+      fork/exec 비용이 요청 경로에 나타나지 않도록 합니다.
+    - 대기열은 크기가 제한되며, 가득 차면 TranscoderBusyError를 던집니다.
+    - mp4/m4a/mov는 파이프로 demux할 수 없어(moov box가 끝에 있을 수 있음) 같은 워커에서 임시 파일로 변환합니다.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.ffmpeg = config.get("ffmpeg_path", "ffmpeg")
+        self.num_workers = int(config.get("workers", DEFAULT_WORKERS))
+        self.timeout = float(config.get("timeout_sec", DEFAULT_TIMEOUT_SEC))
+        self.queue_size = int(config.get("queue_size", DEFAULT_QUEUE_SIZE))
+        self.wait_timeout = float(config.get("wait_timeout_sec", self.timeout + DEFAULT_WAIT_MARGIN_SEC))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def _command(self, streaming: bool = False, source: str = "pipe:0") -> List[str]:
+        cmd = [self.ffmpeg, "-hide_banner", "-loglevel", "error"]
+        if streaming:
+            # 조각 단위로 들어오는 입력을 바로 디코딩하도록 probe/버퍼링을 최소화
+            cmd += ["-fflags", "nobuffer", "-probesize", "4096", "-analyzeduration", "0"]
+        cmd += [
+            "-i", source,
+            "-ac", str(TARGET_CHANNELS), "-ar", str(TARGET_RATE),
+            "-f", "s16le",
+        ]
+        if streaming:
+            cmd += ["-flush_packets", "1"]
+        cmd.append("pipe:1")
+        return cmd
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self) -> None:
+        """워커 태스크를 시작합니다. (각 워커가 ffmpeg 프로세스를 하나씩 미리 띄움)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker_loop(i)) for i in range(self.num_workers)]
+        logger.info(f"오디오 변환 워커 {self.num_workers}개 시작 (queue={self.queue_size}, timeout={self.timeout}s)")
+
+    async def close(self) -> None:
+        """워커와 대기 중인 ffmpeg 프로세스를 정리합니다."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._queue:
+            while not self._queue.empty():
+                *_, fut = self._queue.get_nowait()
+                if not fut.done():
+                    fut.set_exception(AudioConversionError("오디오 변환 서비스가 종료되었습니다."))
+        logger.info("오디오 변환 워커가 정리되었습니다.")
+
+    async def to_wav(self, input_bytes: bytes, mime: Optional[str] = None) -> bytes:
+        """입력 오디오를 16kHz/mono WAV bytes로 변환합니다. (mime: 업로드 Content-Type, mp4 계열 판별용)"""
+        if not self._workers or self._queue is None:
+            raise AudioConversionError("오디오 변환 서비스가 시작되지 않았습니다.")
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((input_bytes, needs_seekable_input(input_bytes, mime), fut))
+        except asyncio.QueueFull:
+            logger.warning(f"오디오 변환 대기열이 가득 찼습니다. (size={self.queue_size})")
+            raise TranscoderBusyError("오디오 변환 대기열이 가득 찼습니다.")
+        try:
+            # 워커가 어떤 이유로든 응답하지 못해도 요청이 무한정 걸려 있지 않도록 상한을 둠 (취소된 작업은 워커가 건너뜀)
+            pcm = await asyncio.wait_for(fut, timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"오디오 변환 대기 시간 초과 ({self.wait_timeout}s)")
+            raise AudioConversionError("오디오 변환 시간이 초과되었습니다.")
+        if not pcm:
+            raise AudioConversionError("변환된 오디오가 비어있습니다.")
+        return pcm16_to_wav(pcm)
+
+    async def open_stream(self) -> asyncio.subprocess.Process:
+        """
+        증분 디코딩용 ffmpeg 프로세스를 새로 띄웁니다. (WebSocket 스트리밍 STT용)
+        stdin에 컨테이너 조각을 쓰면 stdout으로 16kHz mono s16le PCM이 나옵니다.
+        """
+        proc = await self._spawn(streaming=True)
+        if proc is None:
+            raise AudioConversionError("ffmpeg를 실행할 수 없습니다.")
+        return proc
+
+    # ---------------- 워커 ----------------
+    async def _spawn(self, streaming: bool = False) -> Optional[asyncio.subprocess.Process]:
+        try:
+            return await asyncio.create_subprocess_exec(
+                *self._command(streaming),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            logger.error("ffmpeg를 찾을 수 없습니다. 시스템에 ffmpeg가 설치되어 있는지 확인해주세요.")
+            return None
+        except OSError as e:
+            # EMFILE/EAGAIN 등 일시적 자원 부족: 다음 작업에서 다시 띄움
+            logger.error(f"ffmpeg 프로세스를 시작할 수 없습니다: {e}")
+            return None
+
+    @staticmethod
+    async def _kill(proc: asyncio.subprocess.Process) -> None:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+    async def _run(self, proc: asyncio.subprocess.Process, input_bytes: Optional[bytes]) -> Tuple[bytes, bytes]:
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(input_bytes), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            await self._kill(proc)
+            logger.error(f"ffmpeg 변환 시간 초과 ({self.timeout}s)")
+            raise AudioConversionError("오디오 변환 시간이 초과되었습니다.")
+        if proc.returncode != 0:
+            error_msg = stderr.decode(errors="replace").strip() or "알 수 없는 ffmpeg 오류"
+            logger.error(f"ffmpeg 오디오 변환 실패: {error_msg}")
+            raise AudioConversionError("오디오 변환에 실패했습니다.")
+        return stdout, stderr
+
+    async def _convert_file(self, input_bytes: bytes) -> bytes:
+        """탐색이 필요한 컨테이너(mp4/m4a/mov)를 임시 파일에 써서 변환합니다."""
+        def write_temp() -> str:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".m4a") as src:
+                src.write(input_bytes)
+                return src.name
+
+        path = await asyncio.to_thread(write_temp)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self._command(source=path),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, _ = await self._run(proc, None)
+            finally:
+                await self._kill(proc)
+            return stdout
+        finally:
+            os.remove(path)
+
+    async def _prespawn(self, index: int) -> Optional[asyncio.subprocess.Process]:
+        """다음 작업용 ffmpeg를 미리 띄웁니다. 실패해도 워커는 살아 있고 다음 작업에서 다시 띄웁니다."""
+        try:
+            return await self._spawn()
+        except Exception as e:
+            logger.error(f"오디오 변환 워커 {index}: ffmpeg 사전 실행 실패 ({e})")
+            return None
+
+    async def _worker_loop(self, index: int) -> None:
+        proc = await self._prespawn(index)
+        try:
+            while True:
+                input_bytes, seekable, fut = await self._queue.get()
+                try:
+                    # 요청자가 이미 취소(연결 끊김/대기 시간 초과)했다면 프로세스를 아끼고 건너뜀
+                    if fut.done():
+                        continue
+                    if seekable:
+                        stdout = await self._convert_file(input_bytes)
+                    else:
+                        if proc is None or proc.returncode is not None:
+                            proc = await self._spawn()
+                        if proc is None:
+                            raise AudioConversionError("ffmpeg를 실행할 수 없습니다.")
+                        # 한 번 쓴 프로세스는 재사용할 수 없음
+                        used, proc = proc, None
+                        try:
+                            stdout, _ = await self._run(used, input_bytes)
+                        finally:
+                            await self._kill(used)
+                    if not fut.done():
+                        fut.set_result(stdout)
+                except AudioConversionError as e:
+                    if not fut.done():
+                        fut.set_exception(e)
+                except Exception as e:
+                    # 예상 못한 오류(OSError 등)도 요청에 전달하고 워커는 계속 동작
+                    logger.exception(f"오디오 변환 워커 {index} 작업 실패: {e}")
+                    if not fut.done():
+                        fut.set_exception(AudioConversionError("오디오 변환 중 오류가 발생했습니다."))
+                finally:
+                    self._queue.task_done()
+                # 다음 작업을 위해 ffmpeg를 미리 띄워둠 (실패하면 다음 작업에서 다시 시도)
+                if proc is None:
+                    proc = await self._prespawn(index)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if proc is not None:
+                await self._kill(proc)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+# ---- Config 기본값 ----
+DEFAULT_MAX_MB = 256
+DEFAULT_MAX_AGE_SEC = 24 * 3600   # 브라우저 Cache-Control max-age
+
+
+def tts_cache_key(text: str, model: str, voice: str, fmt: str) -> str:
+    """(text, model, voice, format)으로 결정되는 content-address 키."""
+    payload = json.dumps([text.strip(), model, voice, fmt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSAudioCache:
+    """
+    디스크 기반 TTS 오디오 캐시.
+    - 파일명 = tts_cache_key(...) 이므로 같은 문장/모델/목소리는 항상 같은 파일을 가리킵니다.
+    - 전체 크기 상한을 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다. (LRU)
+    - 재시작 시 디렉토리를 스캔해 mtime 순서로 LRU 순서를 복원합니다.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.dir: str = config["dir"]
+        self.max_bytes = int(float(config.get("max_mb", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_age = int(config.get("max_age_sec", DEFAULT_MAX_AGE_SEC))
+        self.prewarm_texts = [t for t in (config.get("prewarm") or []) if t and t.strip()]
+
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.dir, exist_ok=True)
+        self._scan()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir, key[:2], f"{key}.audio")
+
+    def _scan(self) -> None:
+        entries = []
+        for root, _, files in os.walk(self.dir):
+            for name in files:
+                if not name.endswith(".audio"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, name[:-len(".audio")], st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+        with self._lock:
+            self._evict_locked()
+        logger.info(f"TTS 캐시 로드: {len(self._index)}개, {self._total / 1024 / 1024:.1f}MB ({self.dir})")
+
+    def etag(self, key: str) -> str:
+        return f'"{key[:32]}"'
+
+    def cache_control(self) -> str:
+        return f"public, max-age={self.max_age}"
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # 재시작 후에도 LRU 순서가 유지되도록 mtime 갱신
+        except OSError:
+            with self._lock:
+                size = self._index.pop(key, 0)
+                self._total -= size
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not data:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"TTS 캐시 저장 실패: {path}, 오류: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._total -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._total += len(data)
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._total > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._index), "bytes": self._total, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
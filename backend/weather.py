@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 import os
 import json
+import time
+import copy
+import asyncio
 import httpx
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 
 from fastapi import APIRouter, Request
@@ -12,9 +16,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # ✅ OpenAI SDK (>=1.x)
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from openai import APIConnectionError, APIStatusError, AuthenticationError, RateLimitError
 
+from clients import get_clients
+from metrics import span, record_llm_usage
+
 router = APIRouter()
 
 class WeatherRequest(BaseModel):
@@ -22,19 +29,100 @@ class WeatherRequest(BaseModel):
 
 # ---- Config ----
 OWM_TIMEOUT = 10  # seconds
+OWM_PATH = "/data/2.5/weather"  # 기준 URL은 clients.OWM_BASE_URL
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))    # 신선한 것으로 간주하는 시간 (초)
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "3600"))   # 만료 후에도 갱신 중 임시로 내줄 수 있는 시간 (초, 0이면 끔)
+SUMMARY_CACHE_TTL = float(os.getenv("WEATHER_SUMMARY_TTL", "10800"))  # AI 요약 캐시 유지 시간 (초)
+SUMMARY_CACHE_MAX = 256
+SUMMARY_RETRY_AFTER = 60.0  # AI 요약 생성 실패 후 같은 키로 다시 시도하기까지 대기 (초)
+SUMMARY_WAIT_MAX = 20.0  # /weather/summary 롱폴링 최대 대기 (초)
+SUMMARY_MAX_TOKENS = 200  # 60자 내외 두 줄 (한국어 기준 넉넉히)
+SUMMARY_INSTRUCTIONS = """
+다음 날씨 정보를 참고해 한국어로 '정확히 2줄' 요약을 작성해줘.
+1줄: 현재 기온, 강수/바람 등 핵심 상황 (60자 내외)
+2줄: 외출 준비물/주의사항 (60자 내외)
+불필요한 서두/결론/이모지/문장번호/따옴표 없이, 두 줄만 출력.
+
+사람에게 말해주듯이 존댓말 써줘야함
+""".strip()
+
+# ---- Weather data layer (pooled client + TTL cache + single-flight) ----
+@dataclass
+class _WeatherEntry:
+    data: Dict[str, Any]
+    fetched_at: float
+
+class WeatherStore:
+    """
+    OpenWeather 조회 계층.
+    - upstream 레지스트리의 공유 httpx.AsyncClient로 커넥션(TCP+TLS)을 재사용합니다.
+    - 도시별 TTL 캐시: 신선한 값은 upstream 호출 없이 바로 반환합니다.
+    - single-flight: 같은 도시에 대한 동시 요청은 upstream 호출 하나를 함께 기다립니다.
+    - stale-while-revalidate: 만료됐지만 stale 허용 구간이면 마지막 값을 즉시 주고 백그라운드에서 갱신합니다.
+    """
+    def __init__(self, ttl: float = WEATHER_CACHE_TTL, stale_ttl: float = WEATHER_STALE_TTL,
+                 timeout: float = OWM_TIMEOUT) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = timeout
+        self._entries: Dict[str, _WeatherEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.upstream_calls = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # 커넥션 풀은 upstream 레지스트리(clients.py)가 소유하고 lifespan에서 정리합니다.
+        return get_clients().weather_http()
+
+    async def _refresh(self, key: str, city: str, api_key: str) -> Dict[str, Any]:
+        self.upstream_calls += 1
+        params = {"q": city, "appid": api_key, "units": "metric", "lang": "kr"}
+        response = await self._get_client().get(OWM_PATH, params=params, timeout=self.timeout)
+        response.raise_for_status()  # 200 OK가 아니면 에러 발생
+        data = response.json()
+        self._entries[key] = _WeatherEntry(data=data, fetched_at=time.monotonic())
+        return data
+
+    def _single_flight(self, key: str, city: str, api_key: str) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, city, api_key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_refresh_done(k, t))
+        return task
+
+    def _on_refresh_done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ 날씨 갱신 실패({key}): {type(task.exception()).__name__}: {task.exception()}")
 
-# ---- Lazy OpenAI Client ----
-_openai_client: Optional[OpenAI] = None
+    async def get(self, city: str, api_key: str) -> Dict[str, Any]:
+        """도시의 날씨 JSON을 반환합니다. (반환값은 호출자가 수정해도 되는 복사본)"""
+        key = city.strip().lower()
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age < self.ttl:
+                return copy.deepcopy(entry.data)
+            if age < self.ttl + self.stale_ttl:
+                self._single_flight(key, city, api_key)  # 백그라운드 갱신
+                return copy.deepcopy(entry.data)
+        # shield: 한 요청이 취소되어도 함께 기다리는 다른 요청의 upstream 호출은 유지
+        data = await asyncio.shield(self._single_flight(key, city, api_key))
+        return copy.deepcopy(data)
+
+    async def aclose(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+
+weather_store = WeatherStore()
+
+# ---- OpenAI Client (upstream 레지스트리의 공유 커넥션 풀 사용) ----
 def get_openai_client() -> Optional[OpenAI]:
-    global _openai_client
-    if _openai_client is not None:
-        return _openai_client
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-    _openai_client = OpenAI(api_key=api_key)
-    return _openai_client
+    return get_clients().openai()
+
+def get_async_openai_client() -> Optional[AsyncOpenAI]:
+    return get_clients().async_openai()
 
 def _extract_openai_text(resp) -> str:
     """
@@ -64,29 +152,59 @@ def _extract_openai_text(resp) -> str:
     except Exception:
         return ""
 
-def summarize_weather_2lines(city: str, weather_json: Dict[str, Any]) -> Optional[str]:
+def _bucket(value: float, edges, labels) -> str:
+    for edge, label in zip(edges, labels):
+        if value < edge:
+            return label
+    return labels[-1]
+
+def weather_signature(weather_json: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    요약 캐시용 양자화된 날씨 시그니처.
+    날씨 코드, 반올림한 기온, 강수/바람 구간이 같으면 같은 요약을 재사용합니다.
+    """
+    w0 = (weather_json.get("weather") or [{}])[0]
+    main = weather_json.get("main") or {}
+    wind = weather_json.get("wind") or {}
+    precip = float((weather_json.get("rain") or {}).get("1h", 0) or 0) \
+        + float((weather_json.get("snow") or {}).get("1h", 0) or 0)
+    temp = main.get("temp")
+    return {
+        "condition": w0.get("id"),
+        "description": w0.get("description"),
+        "temp_c": round(temp) if isinstance(temp, (int, float)) else None,
+        "precipitation": _bucket(precip, (0.01, 1.0, 5.0), ("없음", "약함", "보통", "강함")),
+        "wind": _bucket(float(wind.get("speed", 0) or 0), (2.0, 5.0, 9.0), ("고요", "약함", "보통", "강함")),
+    }
+
+def summary_cache_key(city: str, weather_json: Dict[str, Any]) -> str:
+    return city.strip().lower() + "|" + json.dumps(weather_signature(weather_json), ensure_ascii=False, sort_keys=True)
+
+async def summarize_weather_2lines(city: str, weather_json: Dict[str, Any]) -> Optional[str]:
     """
     OpenAI로 한국어 '정확히 2줄' 요약 생성 (실패/키없음 시 None)
+    캐시 키와 같은 양자화된 시그니처만 넘겨, 같은 키에는 항상 맞는 요약이 되도록 합니다.
     """
-    client = get_openai_client()
+    client = get_async_openai_client()
     if not client:
         return None
 
+    # 고정 지침은 instructions(prefix)로, 도시/날씨 값만 input으로 보내 프롬프트 캐시를 탐
     prompt = f"""
-다음 OpenWeather 날씨 JSON을 참고해 한국어로 '정확히 2줄' 요약을 작성해줘.
-1줄: 현재/체감, 강수/바람 등 핵심 상황 (60자 내외)
-2줄: 외출 준비물/주의사항 (60자 내외)
-불필요한 서두/결론/이모지/문장번호/따옴표 없이, 두 줄만 출력.
-
-사람에게 말해주듯이 존댓말 써줘야함
-
 도시: {city}
-JSON:
-{json.dumps(weather_json, ensure_ascii=False)}
+날씨:
+{json.dumps(weather_signature(weather_json), ensure_ascii=False)}
 """.strip()
 
     try:
-        resp = client.responses.create(model=OPENAI_MODEL, input=prompt)
+        resp = await client.responses.create(
+            model=OPENAI_MODEL,
+            instructions=SUMMARY_INSTRUCTIONS,
+            input=prompt,
+            max_output_tokens=SUMMARY_MAX_TOKENS,
+            prompt_cache_key="kiosk-weather-summary",
+        )
+        record_llm_usage("weather_summary", OPENAI_MODEL, getattr(resp, "usage", None))
         text = _extract_openai_text(resp).strip()
 
         lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
@@ -102,38 +220,140 @@ JSON:
         print(f"⚠️ OpenAI 요약 처리 예외: {e}")
         return None
 
+class WeatherSummarizer:
+    """
+    날씨 AI 요약 캐시 + 백그라운드 생성기.
+    - 양자화된 시그니처(summary_cache_key) 기준으로 요약을 캐시합니다.
+    - 같은 키의 동시 생성은 하나의 LLM 호출로 합칩니다.
+    - schedule()로 요약을 나중에 만들고, wait()/peek()로 후속 요청에서 꺼내 갈 수 있습니다.
+    - 생성에 실패한 키는 retry_after초 동안 다시 호출하지 않고 unavailable로 답합니다. (최대 max_entries개 기록)
+    """
+    def __init__(self, ttl: float = SUMMARY_CACHE_TTL, max_entries: int = SUMMARY_CACHE_MAX,
+                 retry_after: float = SUMMARY_RETRY_AFTER) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.retry_after = retry_after
+        self._cache: Dict[str, _WeatherEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._failed: Dict[str, float] = {}  # 키 → 실패 시각 (삽입 순서 = 오래된 순)
+        self.llm_calls = 0
+
+    def peek(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.fetched_at >= self.ttl:
+            self._cache.pop(key, None)
+            return None
+        return entry.data["text"]
+
+    def status(self, key: str) -> str:
+        if self.peek(key):
+            return "ready"
+        if key in self._inflight:
+            return "pending"
+        return "unavailable" if self._failed_recently(key) else "unknown"
+
+    def _failed_recently(self, key: str) -> bool:
+        failed_at = self._failed.get(key)
+        if failed_at is None:
+            return False
+        if time.monotonic() - failed_at >= self.retry_after:
+            self._failed.pop(key, None)
+            return False
+        return True
+
+    async def _generate(self, key: str, city: str, weather_json: Dict[str, Any]) -> Optional[str]:
+        self.llm_calls += 1
+        with span("weather_summary"):
+            text = await summarize_weather_2lines(city, weather_json)
+        if text:
+            if len(self._cache) >= self.max_entries:
+                # 가장 오래된 항목부터 정리
+                oldest = min(self._cache, key=lambda k: self._cache[k].fetched_at)
+                self._cache.pop(oldest, None)
+            self._cache[key] = _WeatherEntry(data={"text": text}, fetched_at=time.monotonic())
+            self._failed.pop(key, None)
+        else:
+            self._failed.pop(key, None)
+            if len(self._failed) >= self.max_entries:
+                # 가장 오래된 실패 기록부터 정리
+                self._failed.pop(next(iter(self._failed)), None)
+            self._failed[key] = time.monotonic()
+        return text
+
+    def schedule(self, city: str, weather_json: Dict[str, Any]) -> str:
+        """요약 생성을 백그라운드로 시작하고 키를 반환합니다. (이미 있거나 진행 중이거나 최근 실패했으면 그대로)"""
+        key = summary_cache_key(city, weather_json)
+        if self.peek(key) is None and key not in self._inflight and not self._failed_recently(key):
+            task = asyncio.create_task(self._generate(key, city, weather_json))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._inflight.pop(k, None))
+        return key
+
+    async def summarize(self, city: str, weather_json: Dict[str, Any]) -> Optional[str]:
+        """요약을 기다려서 반환합니다. (캐시 적중 시 즉시)"""
+        key = self.schedule(city, weather_json)
+        return await self.wait(key, timeout=None)
+
+    async def wait(self, key: str, timeout: Optional[float]) -> Optional[str]:
+        cached = self.peek(key)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(key)
+        if task is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+weather_summarizer = WeatherSummarizer()
+
+async def load_weather(city: str, api_key: str, defer_summary: bool) -> Dict[str, Any]:
+    """
+    날씨 관측값을 조회하고 AI 요약(또는 미뤄진 요약의 키)을 weather_data['_meta']에 합칩니다.
+    /weather/ 와 /api/turn 이 함께 사용합니다.
+    """
+    # OpenWeatherMap 조회 (units=metric: 섭씨, lang=kr: 한국어), 캐시/동시 요청 병합 포함
+    with span("weather_fetch"):
+        weather_data = await weather_store.get(city, api_key)
+    print(f"✅ 날씨 정보 조회 성공: {city}")
+
+    # ✅ OpenAI 2줄 요약 (양자화 시그니처 캐시) 생성 후 weather_data에 합치기
+    meta = weather_data.get("_meta") or {}
+    if defer_summary:
+        key = weather_summarizer.schedule(city, weather_data)
+        ai_summary = weather_summarizer.peek(key)
+        if not ai_summary:
+            meta["ai_summary_status"] = "pending"
+            meta["ai_summary_key"] = key
+    else:
+        ai_summary = await weather_summarizer.summarize(city, weather_data)
+    if ai_summary:
+        meta["ai_summary_ko"] = ai_summary
+    if meta:
+        weather_data["_meta"] = meta
+    return weather_data
+
 @router.post("/weather/")
 async def get_weather(request: Request):
     """
     프론트엔드에서 도시 이름을 받아 OpenWeatherMap API로 날씨 정보를 조회하고,
     OpenAI로 '정확히 2줄' 요약을 생성해 weather_data['_meta']['ai_summary_ko']에 넣어 반환합니다.
+    defer_summary=true이면 요약을 기다리지 않고 관측값을 바로 반환하며,
+    _meta.ai_summary_key로 /weather/summary에서 요약을 나중에 받아갈 수 있습니다.
     """
     try:
         data = await request.json()
         city = data.get("city", "Seoul")  # 기본값은 서울
+        defer_summary = bool(data.get("defer_summary", False))
         api_key = os.getenv("OPENWEATHER_API_KEY")
 
         if not api_key:
             return {"error": "Weather API key is not configured"}, 500
 
-        # OpenWeatherMap API URL (units=metric: 섭씨, lang=kr: 한국어)
-        url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric&lang=kr"
-
-        async with httpx.AsyncClient(timeout=OWM_TIMEOUT) as client:
-            response = await client.get(url)
-            response.raise_for_status()  # 200 OK가 아니면 에러 발생
-
-        weather_data = response.json()
-        print(f"✅ 날씨 정보 조회 성공: {city}")
-
-        # ✅ OpenAI 2줄 요약 생성 후 weather_data에 합치기
-        ai_summary = summarize_weather_2lines(city, weather_data)
-        if ai_summary:
-            meta = weather_data.get("_meta") or {}
-            meta["ai_summary_ko"] = ai_summary
-            weather_data["_meta"] = meta
-
-        return weather_data
+        return await load_weather(city, api_key, defer_summary)
 
 
     except httpx.HTTPStatusError as e:
@@ -146,3 +366,15 @@ async def get_weather(request: Request):
     except Exception as e:
         print(f"❌ 서버 내부 오류: {e}")
         return {"error": "An internal server error occurred", "details": str(e)}, 500
+
+
+@router.get("/weather/summary")
+async def get_weather_summary(key: str, wait: float = 10.0):
+    """
+    defer_summary로 미뤄둔 AI 요약을 가져옵니다.
+    아직 생성 중이면 최대 wait초까지 기다렸다가(롱폴링) 결과 또는 pending 상태를 반환합니다.
+    """
+    ai_summary = await weather_summarizer.wait(key, timeout=max(0.0, min(wait, SUMMARY_WAIT_MAX)))
+    if ai_summary:
+        return {"status": "ready", "ai_summary_ko": ai_summary}
+    return {"status": weather_summarizer.status(key), "ai_summary_ko": None}
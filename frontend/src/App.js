@@ -24,7 +24,6 @@ import WeatherScreen from "./components/WeatherScreen";
 // ============================================================================
 // 2) 외부 라이브러리/유틸
 // ============================================================================
-import Papa from "papaparse";
 
 // ============================================================================
 // [서비스 플로우 개요]
@@ -56,7 +55,6 @@ function App() {
     const [userName, setUserName] = useState("");
 
     // 축제 데이터
-    const [festivalData, setFestivalData] = useState([]);
     const [festivalKeyword, setFestivalKeyword] = useState("");
 
     // 날씨 데이터
@@ -263,11 +261,6 @@ function App() {
                     // 🔹 FESTIVAL 개선: 화면 먼저 전환 → 멘트 즉시 실행
                     setFestivalKeyword(result.payload.keyword);
                     setFlowState("FESTIVAL");
-                    Papa.parse("/festival.csv", {
-                        download: true,
-                        header: true,
-                        complete: (r) => setFestivalData(r.data),
-                    });
                     return;
                 }
 
@@ -276,6 +269,12 @@ function App() {
                     setWeatherData(result.payload.weatherData);
                     setWeatherAiSummary(result.payload.weatherAiSummary);
                     setFlowState("WEATHER_VIEW");
+                    // 요약이 나중에 도착하면 화면/음성 안내에 반영
+                    if (result.payload.weatherSummaryPromise) {
+                        result.payload.weatherSummaryPromise.then((s) => {
+                            if (s && flowStateRef.current === "WEATHER_VIEW") setWeatherAiSummary(s);
+                        });
+                    }
                     return;
                 }
 
@@ -414,7 +413,7 @@ function App() {
                 );
             case "FESTIVAL":
                 return (
-                    <FestivalScreen festivals={festivalData} keyword={festivalKeyword}/>
+                    <FestivalScreen keyword={festivalKeyword}/>
                 );
             case "WEATHER_VIEW":
                 return (
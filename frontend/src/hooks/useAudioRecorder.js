@@ -15,6 +15,8 @@ import {useState, useRef} from 'react';
  * @typedef {Object} StartOptions
  * @property {boolean} [vad=true]             // 무음 감지 활성화
  * @property {VadOptions} [vadOptions]        // 무음 감지 파라미터
+ * @property {number} [timeslice]             // ms, 지정 시 녹음 중에도 조각 단위로 onChunk 호출
+ * @property {function(Blob):void} [onChunk]  // 스트리밍 STT(/api/stt/stream)로 조각 전송용 콜백
  */
 
 export const useAudioRecorder = () => {
@@ -82,6 +84,8 @@ export const useAudioRecorder = () => {
         var energyThreshold = typeof vod.energyThreshold === 'number' ? vod.energyThreshold : 0.015;
         var endSilenceMs = typeof vod.endSilenceMs === 'number' ? vod.endSilenceMs : 800;
         var maxRecordingMs = typeof vod.maxRecordingMs === 'number' ? vod.maxRecordingMs : 15000;
+        var onChunk = typeof opts.onChunk === 'function' ? opts.onChunk : null;
+        var timeslice = typeof opts.timeslice === 'number' ? opts.timeslice : undefined;
 
         setPermissionStatus('pending');
 
@@ -106,7 +110,15 @@ export const useAudioRecorder = () => {
             setIsRecording(true);
 
             mediaRecorder.ondataavailable = function (e) {
-                if (e && e.data && e.data.size > 0) audioChunksRef.current.push(e.data);
+                if (e && e.data && e.data.size > 0) {
+                    audioChunksRef.current.push(e.data);
+                    if (onChunk) {
+                        try {
+                            onChunk(e.data);
+                        } catch (err) {
+                        }
+                    }
+                }
             };
 
             mediaRecorder.onstop = function () {
@@ -126,7 +138,7 @@ export const useAudioRecorder = () => {
                 setIsRecording(false);
             };
 
-            mediaRecorder.start();
+            mediaRecorder.start(timeslice);
 
             // ---- (옵션) VAD 시작: 말이 끊기면 ~endSilenceMs 후 자동 stop ----
             if (vad) {
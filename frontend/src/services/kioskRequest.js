@@ -22,13 +22,15 @@ export async function routeKioskRequest(text) {
         const weatherRes = await fetch("http://localhost:8000/weather/", {
             method: "POST",
             headers: {"Content-Type": "application/json"},
-            body: JSON.stringify({city: "Seoul"}),
+            // AI 요약은 기다리지 않고 관측값만 먼저 받아 화면을 바로 그림
+            body: JSON.stringify({city: "Seoul", defer_summary: true}),
         });
         if (!weatherRes.ok) {
             const t = await weatherRes.text();
             throw new Error(`날씨 API 오류: ${weatherRes.status} ${t}`);
         }
         const weatherResult = await weatherRes.json();
+        const summaryKey = weatherResult?._meta?.ai_summary_key;
         return {
             screen: "WEATHER_VIEW",
             purpose,
@@ -36,6 +38,8 @@ export async function routeKioskRequest(text) {
                 keyword: text,
                 weatherData: JSON.stringify(weatherResult, null, 2),
                 weatherAiSummary: weatherResult?._meta?.ai_summary_ko ?? "",
+                // 요약이 아직 생성 중이면 후속 요청으로 받아오는 Promise
+                weatherSummaryPromise: summaryKey ? fetchWeatherSummary(summaryKey) : null,
             },
         };
     }
@@ -50,4 +54,17 @@ export async function routeKioskRequest(text) {
 
     if (docName) return {screen: "PIN_INPUT", purpose: docName, payload: {}};
     return {screen: "UNRECOGNIZED", purpose: "", payload: {}};
-}
\ No newline at end of file
+}
+
+// /weather/ 응답에서 미뤄진 AI 요약을 롱폴링으로 받아옴 (실패 시 빈 문자열)
+export async function fetchWeatherSummary(key, wait = 10) {
+    try {
+        const q = new URLSearchParams({key, wait: String(wait)}).toString();
+        const res = await fetch(`http://localhost:8000/weather/summary?${q}`);
+        if (!res.ok) return "";
+        const data = await res.json();
+        return data.ai_summary_ko || "";
+    } catch (e) {
+        return "";
+    }
+}
@@ -37,6 +37,52 @@ export const transcribeAudio = async (audioBlob) => {
     }
 };
 
+/**
+ * 스트리밍 STT(/api/stt/stream) WebSocket을 엽니다.
+ * 녹음 중인 오디오 조각을 send()로 바로 보내면, 서버가 발화 종료를 감지하는 즉시 STT를 수행합니다.
+ * @returns {{send: function(Blob):void, end: function():void, close: function():void, result: Promise<string>}}
+ */
+export const openSttStream = () => {
+    const ws = new WebSocket('ws://localhost:8000/api/stt/stream');
+    ws.binaryType = 'arraybuffer';
+    const pending = [];
+    let ended = false;
+
+    const result = new Promise((resolve, reject) => {
+        ws.onmessage = (event) => {
+            let msg = null;
+            try {
+                msg = JSON.parse(event.data);
+            } catch (e) {
+                return;
+            }
+            if (msg.type === 'final') resolve(msg.text || '');
+            else if (msg.type === 'error') reject(new Error(msg.error || 'STT 스트리밍 오류'));
+        };
+        ws.onerror = () => reject(new Error('STT 스트리밍 연결 실패'));
+        ws.onclose = () => reject(new Error('STT 스트리밍 연결이 종료되었습니다.'));
+    });
+
+    ws.onopen = () => {
+        pending.forEach((blob) => ws.send(blob));
+        pending.length = 0;
+        if (ended) ws.send('end');
+    };
+
+    return {
+        send: (blob) => {
+            if (ws.readyState === WebSocket.OPEN) ws.send(blob);
+            else pending.push(blob);
+        },
+        end: () => {
+            ended = true;
+            if (ws.readyState === WebSocket.OPEN) ws.send('end');
+        },
+        close: () => ws.close(),
+        result,
+    };
+};
+
 /**
  * 백엔드 TTS API(/api/tts)를 호출하여 텍스트를 음성으로 변환하고 재생합니다.
  * @param {string} text - 음성으로 변환할 텍스트.